@@ -0,0 +1,17 @@
+# backend/app/ai/__init__.py
+#
+# Recomendaciones de /public/ai/recommend: instantánea del catálogo en memoria con un
+# índice léxico (BM25) que preselecciona los candidatos que se envían al modelo, cache
+# de las respuestas del modelo, cliente asíncrono del proveedor e índice vectorial para
+# recomendar sin el modelo.
+
+from app.ai.bm25 import BM25Index
+from app.ai.catalog import CatalogEntry, CatalogIndex, catalog_index
+from app.ai.llm_client import CircuitBreaker, GeminiClient, LLMError, LLMUnavailable, gemini_client
+from app.ai.recommendation_cache import RecommendationCache, recommendation_cache
+from app.ai.text import tokenize
+from app.ai.vectors import VectorIndex
+
+__all__ = ["BM25Index", "CatalogEntry", "CatalogIndex", "catalog_index", "CircuitBreaker", "GeminiClient",
+           "gemini_client", "LLMError", "LLMUnavailable", "RecommendationCache", "recommendation_cache", "tokenize",
+           "VectorIndex"]
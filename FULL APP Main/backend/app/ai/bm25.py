@@ -0,0 +1,73 @@
+# backend/app/ai/bm25.py
+#
+# Índice invertido BM25 en memoria con altas, bajas y modificaciones incrementales
+# (O(términos del documento) cada una). Las estadísticas globales (cantidad de documentos,
+# largo promedio, frecuencia de cada término) se mantienen al día en cada cambio, así que
+# no hace falta reconstruir el índice cuando cambia un producto.
+# No es thread-safe: quien lo comparta entre hilos debe serializar el acceso.
+
+import heapq
+import math
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        self._doc_terms: Dict[Hashable, Counter] = {}
+        self._doc_lengths: Dict[Hashable, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_lengths
+
+    def terms(self, doc_id: Hashable) -> Optional[Counter]:
+        """Frecuencias de términos indexadas para el documento (None si no está)."""
+        return self._doc_terms.get(doc_id)
+
+    def add(self, doc_id: Hashable, tokens: Iterable[str]) -> None:
+        """Agrega el documento, o lo reemplaza si ya estaba."""
+        self.remove(doc_id)
+        terms = Counter(tokens)
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id: Hashable) -> bool:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        return True
+
+    def search(self, query_tokens: Iterable[str], k: int = 10) -> List[Tuple[Hashable, float]]:
+        """Los `k` documentos con mayor puntaje para la consulta, de mayor a menor."""
+        count = len(self._doc_lengths)
+        if not count:
+            return []
+        avgdl = self._total_length / count or 1.0
+        scores: Dict[Hashable, float] = {}
+        for term in set(query_tokens):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
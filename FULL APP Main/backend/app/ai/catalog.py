@@ -0,0 +1,268 @@
+# backend/app/ai/catalog.py
+#
+# Instantánea del catálogo en memoria para /public/ai/recommend: los datos de cada
+# producto que van al prompt + un índice BM25 (nombre, categoría, descripción,
+# ingredientes) que preselecciona los candidatos antes de llamar al modelo. El prompt
+# lleva solo los top-K, no el catálogo entero. Un mapa nombre normalizado -> ids permite
+# resolver sin consultar la base las recomendaciones que el modelo devuelve sin un id válido.
+# Además, un índice vectorial (app/ai/vectors.py) con los mismos textos permite recomendar
+# sin el modelo (sin API key o con el proveedor caído).
+#
+# Actualización incremental (sin reconstruir):
+#   - Escrituras en este proceso: crud/* llaman a invalidate_catalog, que avisa a este
+#     módulo (add_catalog_listener); los productos afectados se releen en la próxima
+#     búsqueda con una sola consulta.
+#   - Escrituras en otros workers: cada AI_INDEX_SYNC_SECONDS se compara la versión del
+#     catálogo (max(fecha_actualizacion) y count de productos, max(fecha_actualizacion) de
+#     negocios) y se releen solo las filas modificadas desde la última sincronización. Si
+#     el conteo no coincide (bajas), se reconcilian los ids.
+
+import heapq
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.ai.bm25 import BM25Index
+from app.ai.text import tokenize, tokenize_fields
+from app.ai.vectors import VectorIndex
+from app.core.config import settings
+from app.core.response_cache import add_catalog_listener
+from app.geo.gazetteer import normalize
+from app.models import Negocio, Producto
+
+# Las filas modificadas se buscan desde la última versión vista menos este margen, para no
+# perder las de transacciones largas que confirmaron con un fecha_actualizacion anterior.
+_SYNC_MARGIN = timedelta(minutes=1)
+
+
+class CatalogEntry(NamedTuple):
+    id: UUID
+    nombre: str
+    tipo: str
+    precio: float
+    negocio_id: UUID
+    rating: float
+
+
+_ROW_COLUMNS = (
+    Producto.id, Producto.nombre, Producto.descripcion, Producto.categoria, Producto.ingredientes,
+    Producto.tipo_producto, Producto.precio, Producto.negocio_id, Producto.rating_promedio,
+    Negocio.nombre.label("negocio_nombre"),
+)
+
+
+def _document_tokens(row) -> List[str]:
+    # El nombre cuenta doble: una coincidencia en el nombre pesa más que en la descripción
+    return tokenize_fields(row.nombre, row.nombre, row.categoria, row.descripcion, row.ingredientes)
+
+
+class CatalogIndex:
+    def __init__(self, sync_seconds: float, vector_dim: int = 256):
+        self.sync_seconds = sync_seconds
+        self.vector_dim = vector_dim
+        self._lock = threading.RLock()
+        self._bm25 = BM25Index()
+        self._vectors = VectorIndex(vector_dim)
+        self._entries: Dict[UUID, CatalogEntry] = {}
+        self._negocio_nombres: Dict[UUID, str] = {}
+        self._ids_by_name: Dict[str, Set[UUID]] = {}
+        self._pending_productos: Set[UUID] = set()
+        self._pending_negocios: Set[UUID] = set()
+        self._stamp: Optional[Tuple] = None
+        self._checked_at = 0.0
+        # Versión del catálogo para el cache de recomendaciones: cambia solo cuando cambia algo
+        # que llega al prompt (nombre, tipo, precio, negocio) o al texto indexado
+        self.version = 0
+        self._changed = False
+        self.built = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, producto_id: UUID) -> bool:
+        return producto_id in self._entries
+
+    # --- Escritura ---
+
+    def mark_changed(self, negocio_id: Optional[UUID] = None, producto_ids: Iterable[UUID] = (), business_changed: bool = False) -> None:
+        """Listener de invalidate_catalog: los cambios se aplican en el próximo refresh."""
+        with self._lock:
+            self._pending_productos.update(producto_ids)
+            if business_changed and negocio_id:
+                self._pending_negocios.add(negocio_id)
+
+    def _read_stamp(self, db: Session) -> Tuple:
+        return db.query(
+            select(func.max(Producto.fecha_actualizacion)).scalar_subquery(),
+            select(func.count()).select_from(Producto).scalar_subquery(),
+            select(func.max(Negocio.fecha_actualizacion)).scalar_subquery(),
+        ).one()
+
+    def _index_name(self, nombre: str, producto_id: UUID) -> None:
+        self._ids_by_name.setdefault(normalize(nombre), set()).add(producto_id)
+
+    def _unindex_name(self, nombre: str, producto_id: UUID) -> None:
+        key = normalize(nombre)
+        ids = self._ids_by_name.get(key)
+        if ids is not None:
+            ids.discard(producto_id)
+            if not ids:
+                del self._ids_by_name[key]
+
+    def _set_negocio_nombre(self, negocio_id: UUID, nombre: str) -> None:
+        if self._negocio_nombres.get(negocio_id) != nombre:
+            self._negocio_nombres[negocio_id] = nombre
+            self._changed = True
+
+    def _upsert(self, row) -> None:
+        self._set_negocio_nombre(row.negocio_id, row.negocio_nombre)
+        entry = CatalogEntry(
+            id=row.id,
+            nombre=row.nombre,
+            tipo=row.tipo_producto.value if row.tipo_producto else "",
+            precio=row.precio,
+            negocio_id=row.negocio_id,
+            rating=row.rating_promedio or 0.0,
+        )
+        tokens = _document_tokens(row)
+        previous = self._entries.get(row.id)
+        self._entries[row.id] = entry
+        # Ventas y ajustes de stock no cambian nada de lo que va al prompt ni al índice: no
+        # se reindexa ni cambia la versión (las respuestas cacheadas del modelo siguen frescas)
+        if previous is not None and previous._replace(rating=entry.rating) == entry and self._bm25.terms(row.id) == Counter(tokens):
+            return
+        if previous is None or previous.nombre != row.nombre:
+            if previous is not None:
+                self._unindex_name(previous.nombre, row.id)
+            self._index_name(row.nombre, row.id)
+        self._bm25.add(row.id, tokens)
+        self._vectors.add(row.id, tokens)
+        self._changed = True
+
+    def _remove(self, producto_id: UUID) -> None:
+        entry = self._entries.pop(producto_id, None)
+        if entry is not None:
+            self._unindex_name(entry.nombre, producto_id)
+            self._changed = True
+        self._bm25.remove(producto_id)
+        self._vectors.remove(producto_id)
+
+    def _build(self, db: Session) -> None:
+        self._bm25 = BM25Index()
+        self._vectors = VectorIndex(self.vector_dim)
+        self._entries = {}
+        self._negocio_nombres = {}
+        self._ids_by_name = {}
+        for row in db.query(*_ROW_COLUMNS).join(Negocio, Producto.negocio_id == Negocio.id).yield_per(1000):
+            self._upsert(row)
+        self.built = True
+
+    def _apply_changes(self, db: Session, stamp: Tuple) -> None:
+        productos_max, _, negocios_max = self._stamp
+        pending_productos, self._pending_productos = self._pending_productos, set()
+        pending_negocios, self._pending_negocios = self._pending_negocios, set()
+
+        conditions = []
+        if pending_productos:
+            conditions.append(Producto.id.in_(pending_productos))
+        if pending_negocios:
+            conditions.append(Producto.negocio_id.in_(pending_negocios))
+        if productos_max is not None:
+            conditions.append(Producto.fecha_actualizacion >= productos_max - _SYNC_MARGIN)
+        seen: Set[UUID] = set()
+        if conditions:
+            rows = db.query(*_ROW_COLUMNS).join(Negocio, Producto.negocio_id == Negocio.id).filter(or_(*conditions))
+            for row in rows:
+                self._upsert(row)
+                seen.add(row.id)
+        for producto_id in pending_productos - seen:
+            self._remove(producto_id)
+        if pending_negocios:
+            for entry in [e for e in self._entries.values() if e.negocio_id in pending_negocios and e.id not in seen]:
+                self._remove(entry.id)
+
+        # Negocios renombrados en otros workers (sus productos no cambiaron)
+        if negocios_max is not None:
+            renamed = db.query(Negocio.id, Negocio.nombre).filter(Negocio.fecha_actualizacion >= negocios_max - _SYNC_MARGIN)
+            for negocio_id, nombre in renamed:
+                self._set_negocio_nombre(negocio_id, nombre)
+
+        # Bajas hechas en otros workers: el conteo no cierra
+        if len(self._entries) != stamp[1]:
+            existing = {producto_id for (producto_id,) in db.query(Producto.id)}
+            for producto_id in set(self._entries) - existing:
+                self._remove(producto_id)
+
+    def refresh(self, db: Session) -> None:
+        """Aplica los cambios pendientes; construye la instantánea en el primer uso."""
+        with self._lock:
+            pending = bool(self._pending_productos or self._pending_negocios)
+            now = time.monotonic()
+            if self.built and not pending and now - self._checked_at < self.sync_seconds:
+                return
+            stamp = self._read_stamp(db)
+            self._checked_at = now
+            self._changed = not self.built
+            if not self.built:
+                self._build(db)
+            elif pending or stamp != self._stamp:
+                self._apply_changes(db, stamp)
+            self._stamp = stamp
+            if self._changed:
+                self.version += 1
+
+    # --- Lectura ---
+
+    def negocio_nombre(self, negocio_id: UUID) -> str:
+        return self._negocio_nombres.get(negocio_id, "")
+
+    def resolve_name(self, nombre: str, prefer: Iterable[UUID] = ()) -> Optional[UUID]:
+        """
+        Id del producto con ese nombre (sin distinguir mayúsculas ni acentos). Si hay
+        varios, gana uno de `prefer` (los candidatos enviados al modelo) y, si no, el
+        mejor calificado.
+        """
+        with self._lock:
+            ids = self._ids_by_name.get(normalize(nombre or ""))
+            if not ids:
+                return None
+            preferred = ids.intersection(prefer)
+            return max(preferred or ids, key=lambda producto_id: self._entries[producto_id].rating)
+
+    def search(self, query: str, k: int) -> List[CatalogEntry]:
+        """
+        Los `k` productos más relevantes para la consulta (BM25). Si ninguno coincide con
+        la consulta, los `k` mejor calificados, para que el modelo igual tenga candidatos.
+        """
+        with self._lock:
+            hits = self._bm25.search(tokenize(query), k)
+            if hits:
+                return [self._entries[producto_id] for producto_id, _ in hits]
+            return heapq.nlargest(k, self._entries.values(), key=lambda entry: entry.rating)
+
+    def similar(self, query: str, k: int) -> List[CatalogEntry]:
+        """Los `k` productos más parecidos a la consulta (coseno en el índice vectorial)."""
+        with self._lock:
+            return [self._entries[producto_id] for producto_id, _ in self._vectors.search(tokenize(query), k)]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "name": "ai_catalog",
+                "built": self.built,
+                "version": self.version,
+                "productos": len(self._entries),
+                "pending": len(self._pending_productos) + len(self._pending_negocios),
+                "vector_dim": self.vector_dim,
+                "vector_bytes": self._vectors.nbytes,
+            }
+
+
+catalog_index = CatalogIndex(sync_seconds=settings.AI_INDEX_SYNC_SECONDS, vector_dim=settings.AI_VECTOR_DIM)
+add_catalog_listener(catalog_index.mark_changed)
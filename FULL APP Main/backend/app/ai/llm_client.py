@@ -0,0 +1,210 @@
+# backend/app/ai/llm_client.py
+#
+# Cliente asíncrono del proveedor del modelo (Gemini, API generateContent).
+#   - Un único httpx.AsyncClient por proceso: las conexiones (y el handshake TLS) se
+#     reutilizan entre requests. Se crea en el primer uso y se cierra en el shutdown.
+#   - Concurrencia acotada (GEMINI_MAX_CONCURRENCY): el resto espera turno en vez de
+#     abrir más conexiones contra un proveedor que ya está lento.
+#   - Reintentos ante 429 / 5xx / errores de red con backoff exponencial y jitter
+#     completo (respeta Retry-After, acotado).
+#   - Circuit breaker: tras GEMINI_BREAKER_FAILURES fallos seguidos se deja de llamar al
+#     proveedor durante GEMINI_BREAKER_RESET_SECONDS; luego pasa un solo request de
+#     prueba. Mientras tanto generate() falla de inmediato con LLMUnavailable y quien
+#     llama usa su alternativa local.
+# GEMINI_BASE_URL permite apuntar a un servidor de prueba local.
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+# Un Retry-After más largo que esto no se espera: se reintenta antes o se da por caído
+_MAX_RETRY_AFTER_SECONDS = 5.0
+
+
+class LLMError(Exception):
+    """El proveedor respondió, pero no con algo utilizable."""
+
+
+class LLMUnavailable(LLMError):
+    """Sin API key, circuito abierto o reintentos agotados."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        # Inicio del request de prueba en curso (half_open); None si no hay ninguno
+        self._probe_started: Optional[float] = None
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == "open" and now - self._opened_at >= self.reset_seconds:
+            self.state = "half_open"
+        if self.state == "closed":
+            return True
+        # Si la prueba anterior nunca terminó (request cancelado), se permite otra
+        if self.state == "half_open" and (self._probe_started is None or now - self._probe_started >= self.reset_seconds):
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_started = None
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+
+def _response_text(data: Dict[str, Any]) -> str:
+    try:
+        return data["candidates"][0]["content"]["parts"][0]["text"]
+    except (KeyError, IndexError, TypeError):
+        raise LLMError("Respuesta inesperada de Gemini")
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str],
+        model: str,
+        timeout_seconds: float,
+        max_connections: int,
+        max_concurrency: int,
+        max_retries: int,
+        backoff_seconds: float,
+        breaker: CircuitBreaker,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.breaker = breaker
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.reset_stats()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def reset_stats(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuits = 0
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        delay = random.uniform(0, self.backoff_seconds * 2 ** attempt)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), _MAX_RETRY_AFTER_SECONDS))
+            except ValueError:
+                pass
+        return delay
+
+    async def generate(self, prompt: str) -> str:
+        """Texto generado por el modelo para `prompt`."""
+        if not self.configured:
+            raise LLMUnavailable("GEMINI_API_KEY no configurada")
+        if not self.breaker.allow():
+            self.short_circuits += 1
+            raise LLMUnavailable("Proveedor no disponible (circuito abierto)")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        async with self._semaphore:
+            response: Optional[httpx.Response] = None
+            error = ""
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.retries += 1
+                    await asyncio.sleep(self._backoff(attempt - 1, response))
+                self.requests += 1
+                try:
+                    response = await self._http().post(
+                        f"/models/{self.model}:generateContent", params={"key": self.api_key}, json=payload
+                    )
+                except httpx.TransportError as e:  # Timeout, conexión rechazada o cortada
+                    response, error = None, repr(e)
+                    continue
+                if response.status_code in _RETRY_STATUS:
+                    error = f"HTTP {response.status_code}"
+                    continue
+                # El proveedor contestó: cualquier otro error es del pedido, no de disponibilidad
+                self.breaker.record_success()
+                if response.is_error:
+                    raise LLMError(f"Gemini respondió HTTP {response.status_code}")
+                try:
+                    return _response_text(response.json())
+                except ValueError:
+                    raise LLMError("Gemini no devolvió JSON")
+
+        self.failures += 1
+        self.breaker.record_failure()
+        raise LLMUnavailable(f"Error al consultar Gemini: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": "gemini",
+            "configured": self.configured,
+            "base_url": self.base_url,
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.opened,
+            "consecutive_failures": self.breaker.failures,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+        }
+
+
+gemini_client = GeminiClient(
+    base_url=settings.GEMINI_BASE_URL,
+    api_key=settings.GEMINI_API_KEY,
+    model=settings.GEMINI_MODEL,
+    timeout_seconds=settings.GEMINI_TIMEOUT_SECONDS,
+    max_connections=settings.GEMINI_MAX_CONNECTIONS,
+    max_concurrency=settings.GEMINI_MAX_CONCURRENCY,
+    max_retries=settings.GEMINI_MAX_RETRIES,
+    backoff_seconds=settings.GEMINI_RETRY_BACKOFF_SECONDS,
+    breaker=CircuitBreaker(settings.GEMINI_BREAKER_FAILURES, settings.GEMINI_BREAKER_RESET_SECONDS),
+)
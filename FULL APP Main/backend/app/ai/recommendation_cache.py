@@ -0,0 +1,128 @@
+# backend/app/ai/recommendation_cache.py
+#
+# Cache de las respuestas del modelo para /public/ai/recommend. La clave es la consulta
+# normalizada (los mismos tokens que usa la búsqueda BM25, sin orden ni repetidos: "algo
+# dulce para el desayuno" y "Dulces desayuno" comparten entrada) y cada entrada guarda la
+# versión del catálogo (catalog_index.version) con la que se calculó.
+#
+#   fresca   (misma versión y edad < ttl)        -> se devuelve sin llamar al modelo
+#   vieja    (otra versión o edad < ttl + stale)  -> se devuelve igual y se recalcula en
+#                                                   segundo plano (stale-while-revalidate)
+#   vencida / ausente                              -> se llama al modelo en el request
+#
+# Hay a lo sumo un cálculo en curso por clave: los requests simultáneos con la misma
+# consulta esperan esa misma llamada al modelo en lugar de hacer una cada uno.
+#
+# Se guarda la respuesta del modelo (ids sugeridos), no los productos: cada request los
+# resuelve contra la base, así que precios y stock siempre están al día.
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple
+
+from app.ai.text import tokenize
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.geo.gazetteer import normalize
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    version: int
+    created_at: float
+
+
+def normalize_query(query: str) -> str:
+    tokens = sorted(set(tokenize(query)))
+    return " ".join(tokens) if tokens else normalize(query or "")
+
+
+class RecommendationCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, stale_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        # El TTL del almacenamiento es la edad máxima servible (fresca + vieja)
+        self._entries = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds + stale_seconds, name="ai_recommendations")
+        self._inflight: Dict[str, "asyncio.Task"] = {}
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.enabled and self.ttl_seconds > 0
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.revalidation_errors = 0
+        self._entries.reset_stats()
+
+    async def _compute(self, key: str, version: int, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await compute()
+            self._entries.set(key, _Entry(value, version, time.monotonic()))
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _start(self, key: str, version: int, compute: Callable[[], Awaitable[Any]]) -> "asyncio.Task":
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._compute(key, version, compute))
+            self._inflight[key] = task
+        return task
+
+    def _revalidated(self, task: "asyncio.Task") -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:  # Se sigue sirviendo la entrada vieja hasta que venza
+            logger.warning("No se pudo revalidar una recomendación: %s", error)
+            self.revalidation_errors += 1
+
+    async def get_or_compute(self, query: str, version: int, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Respuesta cacheada para `query` con el catálogo en `version`, o await compute()."""
+        if not self.enabled:
+            return await compute()
+        key = normalize_query(query)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.version == version and time.monotonic() - entry.created_at < self.ttl_seconds:
+                self.hits += 1
+                return entry.value
+            self.stale_hits += 1
+            if key not in self._inflight:
+                self.revalidations += 1
+                self._start(key, version, compute).add_done_callback(self._revalidated)
+            return entry.value
+        self.misses += 1
+        # shield: si este request se cancela, el cálculo sigue para los demás que lo esperan
+        return await asyncio.shield(self._start(key, version, compute))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        lookups = self.hits + self.stale_hits + self.misses
+        stats.update({
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "revalidations": self.revalidations,
+            "revalidation_errors": self.revalidation_errors,
+            "in_flight": len(self._inflight),
+        })
+        return stats
+
+
+recommendation_cache = RecommendationCache(
+    max_entries=settings.AI_RECOMMENDATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AI_RECOMMENDATION_CACHE_TTL_SECONDS,
+    stale_seconds=settings.AI_RECOMMENDATION_CACHE_STALE_SECONDS,
+)
@@ -0,0 +1,42 @@
+# backend/app/ai/text.py
+#
+# Tokenización para la búsqueda léxica del catálogo: minúsculas, sin acentos, sin
+# palabras vacías y con un stemming liviano para el español (singular/plural y
+# masculino/femenino caen en la misma raíz: "dulces" y "dulce" -> "dulc",
+# "alfajores" -> "alfajor", "facturas" -> "factur").
+
+from typing import Iterable, List
+
+from app.geo.gazetteer import normalize
+
+STOPWORDS = frozenset("""
+    a al algo algun alguna alguno algunos ante con contra cual cuando de del desde donde
+    durante e el ella ellas ellos en entre era es esa ese eso esta este esto fue ha hay
+    la las le les lo los mas me mi mis muy ni no nos o otra otro para pero poco por que
+    quiero quien se sea ser si sin sobre su sus tambien te tiene tu un una uno unos y ya yo
+""".split())
+
+
+def stem(token: str) -> str:
+    if len(token) > 4 and token.endswith("es"):
+        token = token[:-2]
+    elif len(token) > 3 and token.endswith("s"):
+        token = token[:-1]
+    if len(token) > 3 and token[-1] in "aeo":
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(token) for token in normalize(text or "").split() if len(token) > 1 and token not in STOPWORDS]
+
+
+def tokenize_fields(*fields: Iterable[str]) -> List[str]:
+    """Tokens de varios campos; cada campo es un texto, una lista de textos o None."""
+    tokens: List[str] = []
+    for field in fields:
+        if not field:
+            continue
+        for text in ([field] if isinstance(field, str) else field):
+            tokens.extend(tokenize(text))
+    return tokens
@@ -0,0 +1,109 @@
+# backend/app/ai/vectors.py
+#
+# Índice vectorial en memoria para recomendar sin el modelo. Cada documento es un vector
+# de `dim` posiciones (feature hashing con signo, crc32) de sus raíces (peso 1) y de los
+# trigramas de caracteres de cada raíz (peso menor, tolera errores de tipeo y palabras
+# parciales: "chocolat" ~ "chocolate"), con tf sublineal y norma 1. Los vectores viven
+# en una única matriz float32 contigua; la búsqueda es un producto matriz-vector
+# (coseno contra todo el catálogo) y un argpartition para el top-K.
+#
+# Altas, bajas y modificaciones son incrementales: cada documento ocupa una fila; las
+# filas liberadas se reutilizan y la matriz crece duplicando su capacidad.
+# Memoria: dim * 4 bytes por producto (256 -> 1 KB; 100k productos ~ 100 MB).
+# No es thread-safe: quien lo comparta entre hilos debe serializar el acceso.
+
+import math
+import zlib
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_TRIGRAM_WEIGHT = 0.3
+# Por debajo de esta similitud el parecido es ruido de las colisiones del hashing
+_MIN_SCORE = 0.15
+
+
+def _features(token: str) -> Iterable[Tuple[str, float]]:
+    yield "w:" + token, 1.0
+    padded = f"#{token}#"
+    for i in range(len(padded) - 2):
+        yield "g:" + padded[i:i + 3], _TRIGRAM_WEIGHT
+
+
+class VectorIndex:
+    def __init__(self, dim: int = 256, capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids: List[Optional[Hashable]] = []  # fila -> documento (None: fila libre)
+        self._rows: Dict[Hashable, int] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._rows
+
+    @property
+    def nbytes(self) -> int:
+        return self._matrix.nbytes
+
+    def embed(self, tokens: Iterable[str]) -> np.ndarray:
+        """Vector de norma 1 (o nulo, si no hay tokens) para los tokens dados."""
+        weights: Dict[int, float] = {}
+        for token, tf in Counter(tokens).items():
+            scale = 1.0 + math.log(tf)
+            for feature, weight in _features(token):
+                h = zlib.crc32(feature.encode())  # estable entre procesos, a diferencia de hash()
+                # Un bit del hash decide el signo: las colisiones tienden a cancelarse
+                signed = weight * scale if h & 0x100000 else -weight * scale
+                weights[h % self.dim] = weights.get(h % self.dim, 0.0) + signed
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if weights:
+            vector[list(weights)] = list(weights.values())
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector /= norm
+        return vector
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        row = len(self._ids)
+        if row == len(self._matrix):
+            grown = np.zeros((max(1, 2 * len(self._matrix)), self.dim), dtype=np.float32)
+            grown[:row] = self._matrix
+            self._matrix = grown
+        self._ids.append(None)
+        return row
+
+    def add(self, doc_id: Hashable, tokens: Iterable[str]) -> None:
+        """Agrega el documento, o reemplaza su vector si ya estaba."""
+        row = self._rows.get(doc_id)
+        if row is None:
+            row = self._allocate()
+            self._rows[doc_id] = row
+            self._ids[row] = doc_id
+        self._matrix[row] = self.embed(tokens)
+
+    def remove(self, doc_id: Hashable) -> bool:
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return False
+        self._matrix[row] = 0.0
+        self._ids[row] = None
+        self._free.append(row)
+        return True
+
+    def search(self, query_tokens: Iterable[str], k: int = 10) -> List[Tuple[Hashable, float]]:
+        """Los `k` documentos más parecidos (coseno) a la consulta, de mayor a menor."""
+        query = self.embed(query_tokens)
+        used = len(self._ids)
+        if not used or k <= 0 or not query.any():
+            return []
+        scores = self._matrix[:used] @ query
+        k = min(k, used)
+        top = np.argpartition(scores, used - k)[used - k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(self._ids[row], float(scores[row])) for row in top if scores[row] >= _MIN_SCORE]
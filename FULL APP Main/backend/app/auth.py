@@ -1,38 +1,47 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Iterable, Optional
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
 from app.schemas import TokenData # Import the Pydantic schema for TokenData
 
-# Password hashing context (for bcrypt algorithm)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # --- Password Hashing Functions ---
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verifies if a plain password matches a hashed password.
-    Args:
-        plain_password: The password in plain text.
-        hashed_password: The hashed password from the database.
-    Returns:
-        True if passwords match, False otherwise.
-    """
-    return pwd_context.verify(plain_password, hashed_password)
+# Re-exported from app.core.security, the single CryptContext of the app (bounded
+# executor, configurable bcrypt rounds and rehash-on-login).
+from app.core.security import (  # noqa: F401
+    pwd_context,
+    verify_password,
+    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    verify_and_update_password_async,
+)
 
-def get_password_hash(password: str) -> str:
+# --- JWT Token Functions ---
+
+# Versión del formato de claims. Los tokens sin "cv" (o con una versión anterior) se
+# siguen aceptando en get_current_user, pero no en las dependencias que autorizan solo
+# con el token (get_current_claims).
+CLAIMS_VERSION = 2
+
+def build_user_claims(user, negocio_ids: Iterable) -> dict:
     """
-    Hashes a plain password.
-    Args:
-        password: The password in plain text.
-    Returns:
-        The hashed password string.
+    Arma los claims del token de un usuario: identidad, rol, negocio asignado,
+    negocios propios y plugins activos, más la versión de token para revocación.
     """
-    return pwd_context.hash(password)
+    return {
+        "cv": CLAIMS_VERSION,
+        "user_id": str(user.id),
+        "email": user.email,
+        "tipo_tier": user.tipo_tier.value,
+        "tv": user.token_version or 0,
+        "rol": user.rol.value if user.rol else None,
+        "negocio_asignado_id": str(user.negocio_asignado_id) if user.negocio_asignado_id else None,
+        "negocios": [str(negocio_id) for negocio_id in negocio_ids],
+        "plugins_activos": list(user.plugins_activos or []),
+    }
 
-# --- JWT Token Functions ---
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a JWT access token.
@@ -0,0 +1,29 @@
+# backend/app/core/business_binding.py
+#
+# Vínculo usuario -> negocio de Panadería Ñiam ya resuelto, para que los endpoints /niam
+# arranquen con una búsqueda por clave primaria en lugar de los LIKE sobre negocios.
+# crud.business invalida el vínculo del propietario al crear, modificar o borrar negocios.
+
+from typing import Optional
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+niam_business_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.NIAM_BUSINESS_CACHE_TTL_SECONDS,
+    name="niam_business",
+)
+
+
+def get_bound_business_id(user_id: UUID) -> Optional[UUID]:
+    return niam_business_cache.get(str(user_id))
+
+
+def bind_business(user_id: UUID, negocio_id: UUID) -> None:
+    niam_business_cache.set(str(user_id), negocio_id)
+
+
+def invalidate_business_binding(user_id: UUID) -> None:
+    niam_business_cache.delete(str(user_id))
@@ -0,0 +1,96 @@
+# backend/app/core/http_cache.py
+#
+# GET condicional (ETag / Last-Modified) para los endpoints públicos. La "versión" de un
+# recurso se calcula con una sola consulta agregada: max(fecha_actualizacion) y count(*)
+# de las filas que lo componen. Si el cliente ya tiene esa versión se responde 304 sin
+# cargar ni serializar el contenido.
+#
+# Last-Modified solo se envía para recursos individuales: en un listado, borrar una fila
+# que no es la más reciente no cambia max(fecha_actualizacion), y If-Modified-Since no
+# lo detectaría. El ETag incluye el conteo, así que sí lo detecta.
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+# Los clientes pueden guardar la respuesta pero deben revalidarla en cada uso
+CACHE_CONTROL = "public, no-cache"
+
+# Forma parte del ETag: cambiarlo invalida los ETags emitidos cuando cambia la
+# serialización de las respuestas públicas (campos nuevos, formato, etc.).
+REPRESENTATION_VERSION = "1"
+
+
+def resource_version(query: Query, updated_column) -> Tuple[Optional[datetime], int]:
+    """(max(updated_column), count) de las filas de `query`, en una sola consulta."""
+    max_updated, count = query.order_by(None).with_entities(func.max(updated_column), func.count()).one()
+    return max_updated, count
+
+
+def make_etag(resource: str, max_updated: Optional[datetime], count: int, variant: str = "") -> str:
+    """ETag fuerte a partir de la versión del recurso y la variante pedida (p. ej. los query params)."""
+    stamp = max_updated.isoformat() if max_updated else ""
+    digest = hashlib.sha256(f"{REPRESENTATION_VERSION}|{resource}|{variant}|{stamp}|{count}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def body_etag(body: bytes) -> str:
+    """
+    ETag fuerte a partir del cuerpo ya serializado. Para recursos compuestos cuya versión
+    no sale de una sola consulta agregada (p. ej. la vitrina de un negocio).
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Comparación débil (RFC 9110 §13.1.2): W/"x" coincide con "x"
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # Last-Modified tiene resolución de segundos
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Agrega ETag (y Last-Modified si se indica) a `response`. Si la petición trae
+    If-None-Match / If-Modified-Since y el cliente ya tiene esta versión, devuelve la
+    respuesta 304 que el endpoint debe retornar; si no, devuelve None.
+    If-None-Match tiene prioridad: If-Modified-Since solo se evalúa si no viene.
+    """
+    # Vary: la representación (y su ETag) depende del formato negociado (core/serialization.py)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
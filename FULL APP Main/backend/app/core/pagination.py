@@ -0,0 +1,91 @@
+# backend/app/core/pagination.py
+#
+# Utilidades de paginación por cursor (keyset). El cursor es opaco para el cliente:
+# base64 url-safe de un JSON con los valores de la última fila de la página.
+# Los endpoints devuelven el cursor de la página siguiente en el header X-Next-Cursor
+# (el cuerpo sigue siendo la lista, compatible con los clientes existentes).
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import Select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_APPROXIMATE_HEADER = "X-Total-Count-Approximate"
+_RELTUPLES_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+
+def encode_cursor(*values) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else str(value) for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(payload, list):
+            raise ValueError
+        return payload
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginación inválido")
+
+
+def decode_datetime_id_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    """Decodifica un cursor (fecha, id) generado con encode_cursor. None si no hay cursor."""
+    if not cursor:
+        return None
+    payload = _decode(cursor)
+    try:
+        fecha, row_id = payload
+        return datetime.fromisoformat(fecha), UUID(row_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginación inválido")
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def approximate_count(db: Session, query: Query, table_name: str, cap: int = 1000, filtered: bool = True) -> Tuple[int, bool]:
+    """
+    Total de filas de `query` sin recorrer toda la tabla. Cuenta como máximo `cap` filas;
+    si hay más, devuelve la estimación del planificador (pg_class.reltuples) cuando la
+    consulta no tiene filtros, o `cap` en caso contrario. Retorna (total, es_aproximado).
+    """
+    limited = query.order_by(None).limit(cap + 1).subquery()
+    total = db.execute(select(func.count()).select_from(limited)).scalar() or 0
+    if total <= cap:
+        return total, False
+    if not filtered:
+        estimate = db.execute(_RELTUPLES_SQL, {"table": table_name}).scalar()
+        if estimate and estimate > cap:
+            return int(estimate), True
+    return cap, True
+
+
+async def approximate_count_async(db: AsyncSession, stmt: Select, table_name: str, cap: int = 1000, filtered: bool = True) -> Tuple[int, bool]:
+    """Versión asíncrona de approximate_count, sobre un select() en vez de un Query."""
+    limited = stmt.order_by(None).limit(cap + 1).subquery()
+    total = (await db.execute(select(func.count()).select_from(limited))).scalar() or 0
+    if total <= cap:
+        return total, False
+    if not filtered:
+        estimate = (await db.execute(_RELTUPLES_SQL, {"table": table_name})).scalar()
+        if estimate and estimate > cap:
+            return int(estimate), True
+    return cap, True
+
+
+def set_total_count(response: Response, total: int, approximate: bool) -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    response.headers[TOTAL_COUNT_APPROXIMATE_HEADER] = "true" if approximate else "false"
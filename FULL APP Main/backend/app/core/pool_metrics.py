@@ -0,0 +1,110 @@
+# backend/app/core/pool_metrics.py
+#
+# Contadores del pool de conexiones de SQLAlchemy para dimensionar el pool con datos
+# reales (expuestos en GET /internal/pool).
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    Contadores thread-safe de uso del pool: checkouts, conexiones abiertas,
+    timeouts y tiempo de espera para obtener una conexión.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.invalidated = 0
+            self.timeouts = 0
+            self.wait_count = 0
+            self.wait_total_seconds = 0.0
+            self.wait_max_seconds = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_seconds += seconds
+            if seconds > self.wait_max_seconds:
+                self.wait_max_seconds = seconds
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def _increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def attach(self, engine) -> None:
+        """Registra los listeners de eventos del pool del engine."""
+        event.listen(engine, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(engine, "checkin", lambda *args: self._increment("checkins"))
+        event.listen(engine, "connect", lambda *args: self._increment("connects"))
+        event.listen(engine, "invalidate", lambda *args: self._increment("invalidated"))
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "pool_class": type(pool).__name__,
+                "checkouts_total": self.checkouts,
+                "checkins_total": self.checkins,
+                "connections_opened_total": self.connects,
+                "connections_invalidated_total": self.invalidated,
+                "checkout_timeouts_total": self.timeouts,
+                "checkout_wait": {
+                    "count": self.wait_count,
+                    "total_ms": round(self.wait_total_seconds * 1000, 3),
+                    "avg_ms": round(self.wait_total_seconds * 1000 / self.wait_count, 3) if self.wait_count else 0.0,
+                    "max_ms": round(self.wait_max_seconds * 1000, 3),
+                },
+            }
+        # Estado actual del pool (solo disponible en pools con cola, no en NullPool)
+        if isinstance(pool, QueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return data
+
+
+pool_metrics = PoolMetrics()
+replica_pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mide cuánto tarda cada checkout (espera en la cola más la apertura
+    de una conexión de overflow) y cuenta los timeouts ("QueuePool limit reached").
+    """
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+
+class ReplicaQueuePool(InstrumentedQueuePool):
+    """Pool instrumentado de la réplica de lectura (contadores separados)."""
+
+    metrics = replica_pool_metrics
@@ -0,0 +1,77 @@
+# backend/app/core/principal_cache.py
+#
+# Cache del usuario autenticado (principal) para no repetir el SELECT de Usuario en
+# cada request autenticado. Se guarda una copia de las columnas, no la instancia ORM,
+# y en cada acierto se arma una instancia nueva que se adjunta a la sesión del request
+# sin consultar la base (merge con load=False).
+#
+# Clave: (user_id, token). crud.user invalida todas las entradas de un usuario cuando
+# modifica su fila.
+
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import Usuario
+
+principal_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    name="principal",
+)
+
+# Usuario.token_version por usuario, para validar la revocación de tokens en las
+# dependencias que autorizan solo con los claims (sin cargar el Usuario completo).
+token_version_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    name="token_version",
+)
+
+_USUARIO_COLUMNS = [attr.key for attr in inspect(Usuario).column_attrs]
+
+
+def _snapshot(user: Usuario) -> Dict[str, Any]:
+    values = {}
+    for key in _USUARIO_COLUMNS:
+        value = getattr(user, key)
+        values[key] = list(value) if isinstance(value, list) else value
+    return values
+
+
+def _build_detached(values: Dict[str, Any]) -> Usuario:
+    # Copias nuevas de las listas: la instancia del request nunca comparte estado con el cache
+    user = Usuario(**{key: list(value) if isinstance(value, list) else value for key, value in values.items()})
+    make_transient_to_detached(user)
+    return user
+
+
+def get_cached_principal(user_id: UUID, token: str) -> Optional[Usuario]:
+    """Devuelve un Usuario desacoplado (detached) si hay un acierto, o None."""
+    values = principal_cache.get((str(user_id), token))
+    if values is None:
+        return None
+    return _build_detached(values)
+
+
+def cache_principal(user_id: UUID, token: str, user: Usuario) -> None:
+    principal_cache.set((str(user_id), token), _snapshot(user))
+
+
+def get_cached_token_version(user_id: UUID) -> Optional[int]:
+    return token_version_cache.get(str(user_id))
+
+
+def cache_token_version(user_id: UUID, token_version: int) -> None:
+    token_version_cache.set(str(user_id), token_version)
+
+
+def invalidate_principal(user_id: UUID) -> int:
+    """Elimina todas las entradas del usuario (todas sus sesiones/tokens)."""
+    user_key = str(user_id)
+    token_version_cache.delete(user_key)
+    return principal_cache.delete_where(lambda key: key[0] == user_key)
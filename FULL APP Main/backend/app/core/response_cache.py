@@ -0,0 +1,251 @@
+# backend/app/core/response_cache.py
+#
+# Cache de respuestas de los endpoints públicos (cuerpo JSON ya serializado + headers).
+# Cada entrada pertenece a un "scope" (p. ej. "productos:<negocio_id>"); las escrituras en
+# crud/product, crud/business y crud/venta invalidan los scopes afectados.
+#
+# La invalidación es por generación: la clave incluye el número de generación del scope y
+# invalidar solo lo incrementa, así que las entradas viejas dejan de ser alcanzables (y
+# expiran por TTL). Una respuesta armada con datos leídos antes de una invalidación se
+# guarda bajo la generación anterior y nunca se sirve.
+#
+# Backends:
+#   memory -> LRU en proceso (TTLCache). Cada worker tiene el suyo.
+#   redis  -> cualquier servidor con protocolo Redis (requiere el paquete `redis`);
+#             compartido entre workers, la invalidación alcanza a todos.
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[bytes]: ...
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None: ...
+    def get_counter(self, key: str) -> int: ...
+    def incr(self, key: str) -> int: ...
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class MemoryBackend:
+    """LRU en proceso. Las generaciones se guardan aparte y nunca se descartan."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._entries = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds, name="public_responses")
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries.set(key, value, ttl_seconds=ttl_seconds)
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        return {
+            "backend": "memory",
+            "entries": stats["entries"],
+            "max_entries": stats["max_entries"],
+            "evictions": stats["evictions"],
+            "expirations": stats["expirations"],
+            "memory_bytes": sum(len(value) for value in self._entries.values()),
+            "scopes_invalidated": len(self._counters),
+        }
+
+
+class RedisBackend:
+    """Servidor con protocolo Redis. `client` es un redis.Redis (o compatible)."""
+
+    def __init__(self, client, prefix: str = "soup:public:"):
+        self._client = client
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._client.set(self._prefix + key, value, ex=max(1, int(ttl_seconds)))
+
+    def get_counter(self, key: str) -> int:
+        value = self._client.get(self._prefix + key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(self._prefix + key)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"backend": "redis"}
+        info = getattr(self._client, "info", None)
+        if info is not None:
+            try:
+                stats["memory_bytes"] = info("memory").get("used_memory")
+            except Exception as e:  # Las métricas nunca deben romper el endpoint interno
+                stats["error"] = str(e)
+        return stats
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    headers: Dict[str, str]
+
+
+def _pack(response: CachedResponse) -> bytes:
+    return json.dumps(response.headers).encode() + b"\n" + response.body
+
+
+def _unpack(raw: bytes) -> CachedResponse:
+    headers, _, body = raw.partition(b"\n")
+    return CachedResponse(body=body, headers=json.loads(headers))
+
+
+class ResponseCache:
+    def __init__(self, backend: Optional[CacheBackend], ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl_seconds > 0
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def key_for(self, scope: str, variant: str = "") -> str:
+        """Clave de la variante `variant` del scope, en su generación actual."""
+        generation = self.backend.get_counter(f"gen:{scope}")
+        return f"resp:{scope}:{generation}:{variant}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self.backend.get(key)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return _unpack(raw)
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        self.backend.set(key, _pack(response), self.ttl_seconds)
+
+    def invalidate(self, scopes: Iterable[str]) -> None:
+        if not self.enabled:
+            return
+        for scope in set(scopes):
+            self.backend.incr(f"gen:{scope}")
+            with self._lock:
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"name": "public_responses", "enabled": False}
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "name": "public_responses",
+                "enabled": True,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+        stats.update(self.backend.stats())
+        return stats
+
+
+# --- Scopes ---
+# Listados globales y por negocio (tenant) y recursos individuales.
+
+SCOPE_BUSINESSES = "negocios"
+SCOPE_PRODUCTS = "productos"
+
+
+def business_scope(negocio_id: UUID) -> str:
+    return f"negocio:{negocio_id}"
+
+
+def products_scope(negocio_id: Optional[UUID] = None) -> str:
+    return f"productos:{negocio_id}" if negocio_id else SCOPE_PRODUCTS
+
+
+def product_scope(producto_id: UUID) -> str:
+    return f"producto:{producto_id}"
+
+
+def storefront_scope(negocio_id: UUID) -> str:
+    """Vitrina del negocio: depende del negocio y de todos sus productos."""
+    return f"vitrina:{negocio_id}"
+
+
+def _build_backend() -> Optional[CacheBackend]:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        import redis  # Dependencia opcional: solo se requiere con este backend
+        return RedisBackend(redis.Redis.from_url(settings.RESPONSE_CACHE_REDIS_URL))
+    if settings.RESPONSE_CACHE_BACKEND == "none":
+        return None
+    raise ValueError(f"RESPONSE_CACHE_BACKEND no soportado: {settings.RESPONSE_CACHE_BACKEND}")
+
+
+response_cache = ResponseCache(_build_backend(), settings.RESPONSE_CACHE_TTL_SECONDS)
+
+# Otros consumidores del catálogo que deben enterarse de cada escritura (p. ej. el índice
+# de recomendaciones de app/ai). Reciben los mismos argumentos que invalidate_catalog.
+_catalog_listeners: List[Callable[..., None]] = []
+
+
+def add_catalog_listener(listener: Callable[..., None]) -> None:
+    _catalog_listeners.append(listener)
+
+
+def invalidate_catalog(negocio_id: Optional[UUID] = None, producto_ids: Iterable[UUID] = (), business_changed: bool = False) -> None:
+    """
+    Invalida las respuestas públicas afectadas por una escritura. Llamar después del commit.
+    Productos: su detalle, el listado del negocio y los listados globales.
+    Negocio (business_changed=True): su detalle y el listado de negocios; al borrarlo se
+    pasan también los ids de sus productos (se borran en cascada).
+    En ambos casos, la vitrina del negocio.
+    """
+    producto_ids = list(producto_ids)
+    scopes = [product_scope(producto_id) for producto_id in producto_ids]
+    if producto_ids:
+        scopes.append(SCOPE_PRODUCTS)
+        if negocio_id:
+            scopes.append(products_scope(negocio_id))
+    if business_changed:
+        scopes.append(SCOPE_BUSINESSES)
+        if negocio_id:
+            scopes.append(business_scope(negocio_id))
+    if negocio_id and (producto_ids or business_changed):
+        scopes.append(storefront_scope(negocio_id))
+    response_cache.invalidate(scopes)
+    for listener in _catalog_listeners:
+        listener(negocio_id, producto_ids, business_changed)
+
+
+def cached_lookup(scope: str, variant: str = "") -> Tuple[Optional[str], Optional[CachedResponse]]:
+    """(clave, respuesta cacheada o None). La clave es None si el cache está desactivado."""
+    if not response_cache.enabled:
+        return None, None
+    key = response_cache.key_for(scope, variant)
+    return key, response_cache.get(key)
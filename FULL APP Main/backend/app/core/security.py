@@ -1,11 +1,49 @@
 # backend/app/core/security.py
+#
+# Único punto de hashing de contraseñas de la app (app.auth re-exporta estas funciones).
+# bcrypt es CPU-bound (~250 ms con 12 rondas): todo hash/verificación corre en un pool de
+# hilos acotado (PASSWORD_HASH_WORKERS), de modo que no bloquea el event loop y un pico
+# de logins no acapara todos los hilos del servidor.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+# min_rounds == max_rounds: un hash con otra cantidad de rondas se considera
+# desactualizado y se vuelve a generar en el próximo login (verify_and_update).
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _hash_executor.submit(pwd_context.hash, password).result()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password) 
\ No newline at end of file
+    return _hash_executor.submit(pwd_context.verify, plain_password, hashed_password).result()
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, pwd_context.hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, pwd_context.verify, plain_password, hashed_password
+    )
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña y, si el hash usa otra configuración (p. ej. otras rondas),
+    devuelve también el hash nuevo para guardarlo. Retorna (válida, hash_nuevo_o_None).
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
@@ -0,0 +1,112 @@
+# backend/app/core/serialization.py
+#
+# Serialización de respuestas de listados. En lugar del camino por defecto de FastAPI
+# (un model_validate por fila, jsonable_encoder y json.dumps), la lista completa se valida
+# y serializa de una vez con un TypeAdapter armado al importar el router (pydantic-core).
+#
+# El formato se negocia con el header Accept:
+#   application/json     -> JSON (por defecto, también si Accept falta o no coincide)
+#   application/msgpack  -> MessagePack, más compacto y rápido de decodificar (terminales POS)
+# Las respuestas llevan "Vary: Accept"; quien cachee una representación (ETag, cache de
+# respuestas) debe incluir el formato en la variante.
+#
+# El resto de los endpoints usa ORJSONResponse como clase de respuesta por defecto (main.py).
+
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+try:
+    import msgpack
+except ImportError:  # Dependencia opcional: sin ella solo se ofrece JSON
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Nombres con los que los clientes piden MessagePack
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    ranges = []
+    for item in accept.split(","):
+        media_range, *params = (part.strip() for part in item.split(";"))
+        if not media_range:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges.append((media_range.lower(), q))
+    return ranges
+
+
+def _quality(ranges: List[Tuple[str, float]], media_types: Tuple[str, ...]) -> Tuple[float, int]:
+    """(q, especificidad) del rango más específico de Accept que cubre alguno de `media_types`."""
+    best = (0.0, -1)
+    for media_range, q in ranges:
+        if media_range in media_types:
+            specificity = 2
+        elif media_range == "application/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        if specificity > best[1]:
+            best = (q, specificity)
+    return best
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Media type de la respuesta para el header Accept dado. Ante empate gana JSON."""
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+    ranges = _parse_accept(accept)
+    msgpack_q, msgpack_specificity = _quality(ranges, _MSGPACK_ALIASES)
+    json_q, json_specificity = _quality(ranges, (JSON_MEDIA_TYPE,))
+    if msgpack_q > json_q or (msgpack_q == json_q and msgpack_q > 0 and msgpack_specificity > json_specificity):
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def response_media_type(request: Request) -> str:
+    return negotiate(request.headers.get("accept"))
+
+
+def validate(adapter: TypeAdapter, data):
+    """Valida `data` (objetos ORM o dicts) contra el schema del adapter, en bloque."""
+    return adapter.validate_python(data, from_attributes=True)
+
+
+def encode(adapter: TypeAdapter, validated, media_type: str) -> bytes:
+    """Serializa un valor ya validado por `adapter` en el formato pedido."""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        # mode="json": UUID, datetime y Enum como en la representación JSON
+        return msgpack.packb(adapter.dump_python(validated, mode="json"), use_bin_type=True)
+    return adapter.dump_json(validated)
+
+
+def serialized_response(
+    request: Request,
+    adapter: TypeAdapter,
+    data,
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = 200,
+    validated: bool = False,
+) -> Response:
+    """
+    Respuesta con `data` serializado en el formato negociado. `headers` suele ser
+    response.headers del endpoint (X-Total-Count, X-Next-Cursor, ...).
+    """
+    media_type = response_media_type(request)
+    body = encode(adapter, data if validated else validate(adapter, data), media_type)
+    headers = {key: value for key, value in (headers or {}).items() if key.lower() not in ("content-length", "content-type")}
+    headers["Vary"] = "Accept"
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -0,0 +1,104 @@
+# backend/app/crud/aio/business.py
+# Versión asíncrona (AsyncSession) de app/crud/business.py
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from typing import List, Optional
+
+from app.models import Negocio, Producto
+from app.core.business_binding import invalidate_business_binding
+from app.core.response_cache import invalidate_catalog
+from app.geo.locate import locate_business
+from app.schemas import NegocioCreate, NegocioUpdate
+
+async def create_business(db: AsyncSession, user_id: UUID, business: NegocioCreate) -> Negocio:
+    """
+    Crea un nuevo negocio en la base de datos asociado a un usuario.
+    """
+    business_data = business.model_dump()
+    if business_data.get('fotos_urls') is None:
+        business_data['fotos_urls'] = []
+
+    db_business = Negocio(**business_data, propietario_id=user_id)
+    locate_business(
+        db_business,
+        coordinates_given=business.latitud is not None and business.longitud is not None,
+        location_changed=True,
+    )
+    try:
+        db.add(db_business)
+        await db.commit()
+        invalidate_business_binding(user_id)
+        await db.refresh(db_business)
+        invalidate_catalog(db_business.id, business_changed=True)
+        return db_business
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Error de integridad al crear el negocio. Podría haber un duplicado.")
+
+async def get_business_by_id(db: AsyncSession, business_id: UUID) -> Optional[Negocio]:
+    """
+    Obtiene un negocio de la base de datos por su ID.
+    """
+    result = await db.execute(select(Negocio).where(Negocio.id == business_id))
+    return result.scalars().first()
+
+async def get_businesses_by_user_id(db: AsyncSession, user_id: UUID) -> List[Negocio]:
+    """
+    Obtiene una lista de todos los negocios asociados a un usuario específico.
+    """
+    result = await db.execute(select(Negocio).where(Negocio.propietario_id == user_id))
+    return list(result.scalars().all())
+
+async def get_all_businesses(db: AsyncSession) -> List[Negocio]:
+    """
+    Obtiene una lista de todos los negocios en la base de datos (listado público).
+    """
+    result = await db.execute(select(Negocio))
+    return list(result.scalars().all())
+
+async def update_business(db: AsyncSession, business_id: UUID, business_update: NegocioUpdate) -> Optional[Negocio]:
+    """
+    Actualiza los campos de un negocio existente.
+    """
+    result = await db.execute(select(Negocio).where(Negocio.id == business_id))
+    db_business = result.scalars().first()
+    if db_business:
+        update_data = business_update.model_dump(exclude_unset=True)
+        if 'fotos_urls' in update_data and update_data['fotos_urls'] is None:
+            update_data['fotos_urls'] = []
+
+        for key, value in update_data.items():
+            setattr(db_business, key, value)
+        coordinates_given = 'latitud' in update_data or 'longitud' in update_data
+        if coordinates_given or 'localizacion_geografica' in update_data:
+            locate_business(db_business, coordinates_given, 'localizacion_geografica' in update_data)
+        try:
+            await db.commit()
+            await db.refresh(db_business)
+            invalidate_business_binding(db_business.propietario_id)
+            invalidate_catalog(business_id, business_changed=True)
+            return db_business
+        except IntegrityError:
+            await db.rollback()
+            raise ValueError("Error de integridad al actualizar el negocio.")
+    return None
+
+async def delete_business(db: AsyncSession, business_id: UUID) -> bool:
+    """
+    Elimina un negocio de la base de datos por su ID.
+    """
+    result = await db.execute(select(Negocio).where(Negocio.id == business_id))
+    db_business = result.scalars().first()
+    if db_business:
+        propietario_id = db_business.propietario_id
+        # Los productos se borran en cascada: también hay que invalidar su detalle público
+        producto_ids = list((await db.execute(select(Producto.id).where(Producto.negocio_id == business_id))).scalars().all())
+        await db.delete(db_business)
+        await db.commit()
+        invalidate_business_binding(propietario_id)
+        invalidate_catalog(business_id, producto_ids, business_changed=True)
+        return True
+    return False
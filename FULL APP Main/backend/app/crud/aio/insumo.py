@@ -0,0 +1,68 @@
+# backend/app/crud/aio/insumo.py
+# Versión asíncrona (AsyncSession) de app/crud/insumo.py
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from typing import List, Optional
+
+from app.models import Insumo
+from app.schemas import InsumoCreate, InsumoUpdate
+
+async def create_insumo(db: AsyncSession, user_id: UUID, insumo: InsumoCreate) -> Insumo:
+    """
+    Crea un nuevo insumo en la base de datos asociado a un usuario.
+    """
+    db_insumo = Insumo(**insumo.model_dump(), usuario_id=user_id)
+    try:
+        db.add(db_insumo)
+        await db.commit()
+        await db.refresh(db_insumo)
+        return db_insumo
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Error de integridad al crear el insumo. Podría haber un duplicado o datos inválidos.")
+
+async def get_insumo_by_id(db: AsyncSession, insumo_id: UUID) -> Optional[Insumo]:
+    """
+    Obtiene un insumo de la base de datos por su ID.
+    """
+    result = await db.execute(select(Insumo).where(Insumo.id == insumo_id))
+    return result.scalars().first()
+
+async def get_all_insumos_by_user_id(db: AsyncSession, user_id: UUID) -> List[Insumo]:
+    """
+    Obtiene una lista de todos los insumos asociados a un usuario específico.
+    """
+    result = await db.execute(select(Insumo).where(Insumo.usuario_id == user_id))
+    return list(result.scalars().all())
+
+async def update_insumo(db: AsyncSession, insumo_id: UUID, insumo_update: InsumoUpdate) -> Optional[Insumo]:
+    """
+    Actualiza los campos de un insumo existente.
+    """
+    db_insumo = await get_insumo_by_id(db, insumo_id)
+    if db_insumo:
+        update_data = insumo_update.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_insumo, key, value)
+        try:
+            await db.commit()
+            await db.refresh(db_insumo)
+            return db_insumo
+        except IntegrityError:
+            await db.rollback()
+            raise ValueError("Error de integridad al actualizar el insumo.")
+    return None
+
+async def delete_insumo(db: AsyncSession, insumo_id: UUID) -> bool:
+    """
+    Elimina un insumo de la base de datos por su ID.
+    """
+    db_insumo = await get_insumo_by_id(db, insumo_id)
+    if db_insumo:
+        await db.delete(db_insumo)
+        await db.commit()
+        return True
+    return False
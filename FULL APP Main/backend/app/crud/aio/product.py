@@ -0,0 +1,289 @@
+# backend/app/crud/aio/product.py
+# Versión asíncrona (AsyncSession) de app/crud/product.py
+#
+# En modo asíncrono no hay lazy loading implícito: las relaciones que serializa
+# ProductoResponse (insumos_asociados -> insumo) se cargan siempre con selectinload.
+
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from uuid import UUID
+from typing import List, Optional
+
+from app.models import Producto, Insumo, ProductoInsumo, ProductType
+from app.crud.product import PUBLIC_CATALOG_OPTIONS, PUBLIC_PRODUCT_SORTS
+from app.core.response_cache import invalidate_catalog
+from app.schemas import ProductoCreate, ProductoUpdate, ProductoInsumoCreate
+
+_PRODUCT_LOAD_OPTIONS = (
+    selectinload(Producto.insumos_asociados).selectinload(ProductoInsumo.insumo),
+)
+
+def _product_select():
+    return select(Producto).options(*_PRODUCT_LOAD_OPTIONS)
+
+async def _sync_product_insumos(db: AsyncSession, db_product: Producto, insumos_data: List[ProductoInsumoCreate]):
+    await db.refresh(db_product, attribute_names=['insumos_asociados'])
+    existing = {pi.insumo_id: pi for pi in db_product.insumos_asociados}
+    incoming_insumo_ids = {pi.insumo_id for pi in insumos_data}
+    # Insumos a eliminar
+    for insumo_id, pi in existing.items():
+        if insumo_id not in incoming_insumo_ids:
+            await db.delete(pi)
+    # Validar propiedad de todos los insumos en una sola consulta
+    if incoming_insumo_ids:
+        result = await db.execute(
+            select(Insumo.id).where(
+                Insumo.id.in_(incoming_insumo_ids),
+                Insumo.usuario_id == db_product.propietario_id
+            )
+        )
+        owned_ids = set(result.scalars().all())
+    else:
+        owned_ids = set()
+    # Insumos a actualizar o crear
+    for insumo_data in insumos_data:
+        if insumo_data.insumo_id not in owned_ids:
+            raise ValueError(f"Insumo con ID {insumo_data.insumo_id} no encontrado o no pertenece al usuario.")
+        if insumo_data.insumo_id in existing:
+            existing[insumo_data.insumo_id].cantidad_necesaria = insumo_data.cantidad_necesaria
+        else:
+            db.add(ProductoInsumo(
+                producto_id=db_product.id,
+                insumo_id=insumo_data.insumo_id,
+                cantidad_necesaria=insumo_data.cantidad_necesaria
+            ))
+    await db.flush()
+
+async def _calculate_product_costs_and_prices(db: AsyncSession, db_product: Producto) -> None:
+    # COGS calculado en la base de datos con un único JOIN
+    result = await db.execute(
+        select(func.coalesce(func.sum(ProductoInsumo.cantidad_necesaria * Insumo.costo_unitario_compra), 0.0))
+        .join(Insumo, Insumo.id == ProductoInsumo.insumo_id)
+        .where(ProductoInsumo.producto_id == db_product.id)
+    )
+    db_product.cogs = float(result.scalar() or 0.0)
+    if db_product.cogs is not None and db_product.margen_ganancia_sugerido is not None and db_product.margen_ganancia_sugerido >= 0:
+        db_product.precio_sugerido = db_product.cogs * (1 + db_product.margen_ganancia_sugerido / 100)
+    else:
+        db_product.precio_sugerido = None
+
+async def create_product(db: AsyncSession, propietario_id: UUID, product: ProductoCreate) -> Producto:
+    insumos_data = product.insumos if product.insumos is not None else []
+    product_data = product.model_dump(exclude_unset=True, exclude={"insumos"})
+    if product_data.get("rating_promedio") is None:
+        product_data["rating_promedio"] = 0.0
+    if product_data.get("reviews_count") is None:
+        product_data["reviews_count"] = 0
+    product_data["fecha_actualizacion"] = datetime.utcnow()
+
+    db_product = Producto(**product_data, propietario_id=propietario_id)
+    try:
+        db.add(db_product)
+        await db.flush()
+        product_id, negocio_id = db_product.id, db_product.negocio_id
+        await _sync_product_insumos(db, db_product, insumos_data)
+        await _calculate_product_costs_and_prices(db, db_product)
+        await db.commit()
+        invalidate_catalog(negocio_id, [product_id])
+    except IntegrityError as e:
+        await db.rollback()
+        raise ValueError(f"Error de integridad al crear el producto: {str(e)}")
+    except ValueError:
+        await db.rollback()
+        raise
+    return await get_product_by_id(db, product_id)
+
+async def get_product_by_id(db: AsyncSession, product_id: UUID) -> Optional[Producto]:
+    result = await db.execute(
+        _product_select().where(Producto.id == product_id).execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def get_all_products(db: AsyncSession) -> List[Producto]:
+    """Obtiene todos los productos públicos (para endpoints públicos)"""
+    result = await db.execute(_product_select())
+    return list(result.scalars().all())
+
+def select_public_products(
+    negocio_id: Optional[UUID] = None,
+    tipo_producto: Optional[ProductType] = None,
+    categoria: Optional[str] = None,
+    precio_min: Optional[float] = None,
+    precio_max: Optional[float] = None,
+):
+    """Consulta filtrada del catálogo público (sin orden ni paginación), como query_public_products."""
+    stmt = select(Producto)
+    if negocio_id is not None:
+        stmt = stmt.where(Producto.negocio_id == negocio_id)
+    if tipo_producto is not None:
+        stmt = stmt.where(Producto.tipo_producto == tipo_producto)
+    if categoria:
+        stmt = stmt.where(Producto.categoria == categoria)
+    if precio_min is not None:
+        stmt = stmt.where(Producto.precio >= precio_min)
+    if precio_max is not None:
+        stmt = stmt.where(Producto.precio <= precio_max)
+    return stmt
+
+async def get_public_products_page(db: AsyncSession, stmt, sort: str = "recientes", offset: int = 0, limit: int = 50) -> List[Producto]:
+    """Una página del catálogo público con un orden estable."""
+    if sort not in PUBLIC_PRODUCT_SORTS:
+        raise ValueError(f"Orden no soportado: {sort}")
+    result = await db.execute(
+        stmt.options(*PUBLIC_CATALOG_OPTIONS).order_by(*PUBLIC_PRODUCT_SORTS[sort]).offset(offset).limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def get_all_products_by_user_id(db: AsyncSession, propietario_id: UUID) -> List[Producto]:
+    result = await db.execute(_product_select().where(Producto.propietario_id == propietario_id))
+    return list(result.scalars().all())
+
+async def get_products_by_business_id(db: AsyncSession, business_id: UUID) -> List[Producto]:
+    result = await db.execute(_product_select().where(Producto.negocio_id == business_id))
+    return list(result.scalars().all())
+
+async def update_product(db: AsyncSession, product_id: UUID, product_update: ProductoUpdate) -> Optional[Producto]:
+    db_product = await get_product_by_id(db, product_id)
+    if not db_product:
+        return None
+    insumos_data = product_update.insumos
+    product_data = product_update.model_dump(exclude_unset=True, exclude={"insumos"})
+    previous_negocio_id = db_product.negocio_id
+    for key, value in product_data.items():
+        setattr(db_product, key, value)
+    negocio_id = db_product.negocio_id
+    try:
+        await db.flush()
+        if insumos_data is not None:
+            await _sync_product_insumos(db, db_product, insumos_data)
+        await _calculate_product_costs_and_prices(db, db_product)
+        await db.commit()
+        invalidate_catalog(previous_negocio_id, [product_id])
+        if negocio_id != previous_negocio_id:
+            invalidate_catalog(negocio_id, [product_id])
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Error de integridad al actualizar el producto. Podría haber un duplicado o datos inválidos.")
+    except ValueError:
+        await db.rollback()
+        raise
+    return await get_product_by_id(db, product_id)
+
+async def delete_product(db: AsyncSession, product_id: UUID) -> bool:
+    db_product = await get_product_by_id(db, product_id)
+    if db_product:
+        negocio_id = db_product.negocio_id
+        await db.delete(db_product)
+        await db.commit()
+        invalidate_catalog(negocio_id, [product_id])
+        return True
+    return False
+
+async def record_sale(db: AsyncSession, product_id: UUID, quantity_sold: float, user_id: UUID, precio_unitario: float = None):
+    """
+    Registra una venta de producto y actualiza el inventario (ver app.crud.product.record_sale).
+    """
+    db_product = await get_product_by_id(db, product_id)
+
+    if not db_product:
+        raise ValueError("Producto no encontrado")
+
+    if db_product.propietario_id != user_id:
+        raise ValueError("No autorizado para vender este producto")
+
+    if db_product.stock_terminado is not None and db_product.stock_terminado < quantity_sold:
+        raise ValueError(f"Stock insuficiente. Disponible: {db_product.stock_terminado}, Solicitado: {quantity_sold}")
+
+    if precio_unitario is None:
+        precio_unitario = db_product.precio_venta or 0.0
+
+    total_venta = precio_unitario * quantity_sold
+
+    if db_product.stock_terminado is not None:
+        db_product.stock_terminado -= quantity_sold
+
+    # Los insumos ya vienen cargados con selectinload: sin consultas adicionales por insumo
+    insumos_actualizados = []
+    for insumo_asociado in db_product.insumos_asociados:
+        insumo = insumo_asociado.insumo
+        if insumo:
+            cantidad_necesaria = insumo_asociado.cantidad_necesaria * quantity_sold
+            insumo.cantidad_disponible -= cantidad_necesaria
+            insumos_actualizados.append({
+                'nombre': insumo.nombre,
+                'cantidad_descontada': cantidad_necesaria,
+                'stock_restante': insumo.cantidad_disponible
+            })
+
+    db_product.fecha_actualizacion = datetime.utcnow()
+    negocio_id = db_product.negocio_id
+
+    try:
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise ValueError(f"Error al registrar la venta: {str(e)}")
+    invalidate_catalog(negocio_id, [product_id])
+
+    return {
+        'producto_id': product_id,
+        'producto_nombre': db_product.nombre,
+        'quantity_sold': quantity_sold,
+        'precio_unitario': precio_unitario,
+        'total_venta': total_venta,
+        'stock_restante': db_product.stock_terminado,
+        'insumos_actualizados': insumos_actualizados,
+        'fecha_venta': datetime.now()
+    }
+
+async def update_product_stock(db: AsyncSession, product_id: UUID, new_stock: float, user_id: UUID):
+    """
+    Actualiza el stock terminado de un producto
+    """
+    db_product = await get_product_by_id(db, product_id)
+
+    if not db_product:
+        raise ValueError("Producto no encontrado")
+
+    if db_product.propietario_id != user_id:
+        raise ValueError("No autorizado para actualizar este producto")
+
+    db_product.stock_terminado = new_stock
+    db_product.fecha_actualizacion = datetime.utcnow()
+    negocio_id = db_product.negocio_id
+
+    try:
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise ValueError(f"Error al actualizar stock: {str(e)}")
+    invalidate_catalog(negocio_id, [product_id])
+    return db_product
+
+async def get_products_low_stock(db: AsyncSession, user_id: UUID, threshold: float = 5.0) -> List[Producto]:
+    """
+    Obtiene productos con stock bajo
+    """
+    result = await db.execute(
+        _product_select().where(
+            Producto.propietario_id == user_id,
+            Producto.stock_terminado <= threshold,
+            Producto.stock_terminado > 0
+        )
+    )
+    return list(result.scalars().all())
+
+async def get_products_out_of_stock(db: AsyncSession, user_id: UUID) -> List[Producto]:
+    """
+    Obtiene productos sin stock
+    """
+    result = await db.execute(
+        _product_select().where(
+            Producto.propietario_id == user_id,
+            (Producto.stock_terminado == 0) | (Producto.stock_terminado.is_(None))
+        )
+    )
+    return list(result.scalars().all())
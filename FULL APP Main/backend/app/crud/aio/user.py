@@ -0,0 +1,137 @@
+# backend/app/crud/aio/user.py
+# Versión asíncrona (AsyncSession) de app/crud/user.py
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+
+from app.models import Usuario
+from app.schemas import UsuarioCreate, UsuarioUpdate
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.principal_cache import invalidate_principal
+from app.crud.user import bump_token_version, revokes_tokens
+
+async def get_user(db: AsyncSession, user_id: UUID) -> Optional[Usuario]:
+    result = await db.execute(select(Usuario).where(Usuario.id == user_id))
+    return result.scalars().first()
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[Usuario]:
+    result = await db.execute(select(Usuario).where(Usuario.email == email))
+    return result.scalars().first()
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Usuario]:
+    result = await db.execute(select(Usuario).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+async def create_user(db: AsyncSession, user: UsuarioCreate) -> Usuario:
+    # bcrypt es CPU-bound: se ejecuta en el pool de hashing, fuera del event loop
+    hashed_password = await get_password_hash_async(user.password)
+    db_user = Usuario(
+        email=user.email,
+        nombre=user.nombre,
+        hashed_password=hashed_password,
+        tipo_tier=user.tipo_tier,
+        localizacion=user.localizacion,
+        curriculum_vitae=user.curriculum_vitae,
+        plugins_activos=[]  # Inicializar lista vacía de plugins
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_user(db: AsyncSession, user_id: UUID, user_update: UsuarioUpdate) -> Optional[Usuario]:
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return None
+
+    update_data = user_update.model_dump(exclude_unset=True)
+
+    # Manejar actualización de contraseña (revoca los tokens emitidos con la anterior)
+    if "password" in update_data:
+        update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
+        bump_token_version(db_user)
+    elif revokes_tokens(db_user, update_data):
+        bump_token_version(db_user)
+
+    for field, value in update_data.items():
+        if hasattr(db_user, field):
+            setattr(db_user, field, value)
+
+    await db.commit()
+    invalidate_principal(user_id)
+    await db.refresh(db_user)
+    return db_user
+
+async def delete_user(db: AsyncSession, user_id: UUID) -> bool:
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return False
+
+    await db.delete(db_user)
+    await db.commit()
+    invalidate_principal(user_id)
+    return True
+
+async def revoke_user_tokens(db: AsyncSession, user_id: UUID) -> Optional[Usuario]:
+    """Invalida todos los tokens emitidos para el usuario (incrementa token_version)"""
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return None
+
+    db_user.token_version = (db_user.token_version or 0) + 1
+    await db.commit()
+    invalidate_principal(user_id)
+    await db.refresh(db_user)
+    return db_user
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[Usuario]:
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
+# GESTIÓN DE PLUGINS
+async def activate_plugin(db: AsyncSession, user_id: UUID, plugin_name: str) -> Optional[Usuario]:
+    """Activa un plugin para un usuario específico"""
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return None
+
+    plugins = list(db_user.plugins_activos or [])
+    if plugin_name not in plugins:
+        # Se reasigna la lista para que SQLAlchemy detecte el cambio en la columna ARRAY
+        db_user.plugins_activos = plugins + [plugin_name]
+        await db.commit()
+        invalidate_principal(user_id)
+        await db.refresh(db_user)
+
+    return db_user
+
+async def deactivate_plugin(db: AsyncSession, user_id: UUID, plugin_name: str) -> Optional[Usuario]:
+    """Desactiva un plugin para un usuario específico"""
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return None
+
+    plugins = list(db_user.plugins_activos or [])
+    if plugin_name in plugins:
+        plugins.remove(plugin_name)
+        db_user.plugins_activos = plugins
+        bump_token_version(db_user)  # sin esto, el plugin seguiría habilitado hasta que venza el token
+        await db.commit()
+        invalidate_principal(user_id)
+        await db.refresh(db_user)
+
+    return db_user
+
+async def get_user_plugins(db: AsyncSession, user_id: UUID) -> List[str]:
+    """Obtiene la lista de plugins activos de un usuario"""
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return []
+
+    return db_user.plugins_activos or []
@@ -0,0 +1,367 @@
+# backend/app/crud/aio/venta.py
+# Versión asíncrona (AsyncSession) de app/crud/venta.py
+
+from sqlalchemy import select, func, and_, desc, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID
+from datetime import datetime, date, timedelta
+
+from app.models import Venta, DetalleVenta, CarritoCompra, ItemCarrito, Producto
+from app.schemas import VentaCreate, CarritoCompraCreate, ItemCarritoCreate
+from app.crud.venta import generate_venta_number
+from app.core.pagination import encode_cursor
+from app.core.response_cache import invalidate_catalog
+
+def _venta_select():
+    return select(Venta).options(selectinload(Venta.detalles))
+
+def _carrito_select():
+    return select(CarritoCompra).options(
+        selectinload(CarritoCompra.items),
+        selectinload(CarritoCompra.negocio)
+    )
+
+async def create_venta(db: AsyncSession, venta_data: VentaCreate, propietario_id: UUID) -> Venta:
+    """Crea una nueva venta con sus detalles"""
+
+    db_venta = Venta(
+        negocio_id=venta_data.negocio_id,
+        cliente_id=venta_data.cliente_id,
+        numero_venta=generate_venta_number(),
+        subtotal=venta_data.subtotal,
+        descuento=venta_data.descuento,
+        impuestos=venta_data.impuestos,
+        total=venta_data.total,
+        metodo_pago=venta_data.metodo_pago,
+        estado=venta_data.estado,
+        notas=venta_data.notas
+    )
+
+    db.add(db_venta)
+    await db.flush()  # Para obtener el ID de la venta
+
+    # Cargar todos los productos de la venta en una sola consulta
+    producto_ids = {detalle.producto_id for detalle in venta_data.detalles}
+    result = await db.execute(select(Producto).where(Producto.id.in_(producto_ids)))
+    productos = {p.id: p for p in result.scalars().all()}
+
+    costo_total = 0.0
+    margen_total = 0.0
+    stock_actualizado: Dict[UUID, List[UUID]] = {}  # negocio_id -> productos con stock modificado
+
+    for detalle_data in venta_data.detalles:
+        producto = productos.get(detalle_data.producto_id)
+        if not producto:
+            continue
+
+        subtotal_detalle = (detalle_data.precio_unitario - detalle_data.descuento_unitario) * detalle_data.cantidad
+
+        costo_unitario = producto.cogs or 0.0
+        costo_detalle = costo_unitario * detalle_data.cantidad
+        margen_detalle = subtotal_detalle - costo_detalle
+
+        costo_total += costo_detalle
+        margen_total += margen_detalle
+
+        db.add(DetalleVenta(
+            venta_id=db_venta.id,
+            producto_id=detalle_data.producto_id,
+            cantidad=detalle_data.cantidad,
+            precio_unitario=detalle_data.precio_unitario,
+            descuento_unitario=detalle_data.descuento_unitario,
+            subtotal=subtotal_detalle,
+            costo_unitario=costo_unitario,
+            margen_ganancia=margen_detalle,
+            codigo_lote=producto.codigo_lote
+        ))
+
+        # Actualizar stock del producto
+        if producto.stock_terminado is not None:
+            producto.stock_terminado = max(producto.stock_terminado - detalle_data.cantidad, 0)
+            stock_actualizado.setdefault(producto.negocio_id, []).append(producto.id)
+
+    db_venta.costo_total = costo_total
+    db_venta.margen_ganancia_total = margen_total
+
+    venta_id = db_venta.id
+    await db.commit()
+    for negocio_id, producto_ids in stock_actualizado.items():
+        invalidate_catalog(negocio_id, producto_ids)
+
+    return await get_venta(db, venta_id)
+
+async def get_venta(db: AsyncSession, venta_id: UUID) -> Optional[Venta]:
+    """Obtiene una venta por ID"""
+    result = await db.execute(
+        _venta_select()
+        .options(selectinload(Venta.negocio))
+        .where(Venta.id == venta_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def get_ventas_by_negocio(db: AsyncSession, negocio_id: UUID, skip: int = 0, limit: int = 100) -> List[Venta]:
+    """Obtiene todas las ventas de un negocio (paginación por offset; preferir get_ventas_page)"""
+    result = await db.execute(
+        _venta_select()
+        .where(Venta.negocio_id == negocio_id)
+        .order_by(Venta.fecha_venta.desc(), Venta.id.desc())
+        .offset(skip).limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def get_ventas_page(
+    db: AsyncSession,
+    negocio_id: UUID,
+    limit: int = 100,
+    after: Optional[Tuple[datetime, UUID]] = None
+) -> Tuple[List[Venta], Optional[str]]:
+    """Página de ventas por cursor sobre (fecha_venta, id). Ver app.crud.venta.get_ventas_page."""
+    stmt = _venta_select().where(Venta.negocio_id == negocio_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(Venta.fecha_venta, Venta.id) < tuple_(*after))
+    result = await db.execute(stmt.order_by(Venta.fecha_venta.desc(), Venta.id.desc()).limit(limit + 1))
+    ventas = list(result.scalars().all())
+
+    next_cursor = None
+    if len(ventas) > limit:
+        ventas = ventas[:limit]
+        next_cursor = encode_cursor(ventas[-1].fecha_venta, ventas[-1].id)
+    return ventas, next_cursor
+
+async def get_ventas_by_date_range(db: AsyncSession, negocio_id: UUID, fecha_inicio: date, fecha_fin: date) -> List[Venta]:
+    """Obtiene ventas en un rango de fechas"""
+    result = await db.execute(
+        select(Venta)
+        .options(selectinload(Venta.detalles).selectinload(DetalleVenta.producto))
+        .where(
+            and_(
+                Venta.negocio_id == negocio_id,
+                func.date(Venta.fecha_venta) >= fecha_inicio,
+                func.date(Venta.fecha_venta) <= fecha_fin
+            )
+        )
+    )
+    return list(result.scalars().all())
+
+async def get_analisis_ventas(db: AsyncSession, negocio_id: UUID, fecha_inicio: date, fecha_fin: date) -> Dict[str, Any]:
+    """Obtiene análisis de ventas para un período"""
+
+    ventas = await get_ventas_by_date_range(db, negocio_id, fecha_inicio, fecha_fin)
+
+    total_ventas = sum(venta.total for venta in ventas)
+    total_productos = sum(sum(detalle.cantidad for detalle in venta.detalles) for venta in ventas)
+    margen_total = sum(venta.margen_ganancia_total or 0 for venta in ventas)
+
+    ventas_por_dia = {}
+    for venta in ventas:
+        fecha = venta.fecha_venta.date()
+        if fecha not in ventas_por_dia:
+            ventas_por_dia[fecha] = {"total": 0, "cantidad": 0}
+        ventas_por_dia[fecha]["total"] += venta.total
+        ventas_por_dia[fecha]["cantidad"] += len(venta.detalles)
+
+    productos_vendidos = {}
+    for venta in ventas:
+        for detalle in venta.detalles:
+            producto_id = str(detalle.producto_id)
+            if producto_id not in productos_vendidos:
+                productos_vendidos[producto_id] = {
+                    "producto_id": detalle.producto_id,
+                    "nombre": detalle.producto.nombre,
+                    "cantidad": 0,
+                    "total": 0
+                }
+            productos_vendidos[producto_id]["cantidad"] += detalle.cantidad
+            productos_vendidos[producto_id]["total"] += detalle.subtotal
+
+    productos_mas_vendidos = sorted(
+        productos_vendidos.values(),
+        key=lambda x: x["cantidad"],
+        reverse=True
+    )[:10]
+
+    return {
+        "fecha_inicio": fecha_inicio,
+        "fecha_fin": fecha_fin,
+        "total_ventas": total_ventas,
+        "total_productos_vendidos": total_productos,
+        "margen_ganancia_total": margen_total,
+        "ventas_por_dia": [
+            {"fecha": str(fecha), **datos}
+            for fecha, datos in ventas_por_dia.items()
+        ],
+        "productos_mas_vendidos": productos_mas_vendidos
+    }
+
+async def get_alertas_stock(db: AsyncSession, negocio_id: UUID) -> List[Dict[str, Any]]:
+    """Obtiene alertas de stock bajo"""
+    result = await db.execute(
+        select(Producto).where(
+            and_(
+                Producto.negocio_id == negocio_id,
+                Producto.stock_terminado <= Producto.stock_minimo
+            )
+        )
+    )
+    productos = result.scalars().all()
+
+    alertas = []
+    for producto in productos:
+        dias_sin_stock = None
+        if producto.stock_terminado == 0:
+            # Fecha de la última venta del producto
+            ultima = await db.execute(
+                select(Venta.fecha_venta)
+                .join(DetalleVenta, DetalleVenta.venta_id == Venta.id)
+                .where(
+                    and_(
+                        DetalleVenta.producto_id == producto.id,
+                        Venta.negocio_id == negocio_id
+                    )
+                )
+                .order_by(desc(DetalleVenta.id))
+                .limit(1)
+            )
+            fecha_ultima_venta = ultima.scalar()
+            if fecha_ultima_venta:
+                dias_sin_stock = (datetime.now(fecha_ultima_venta.tzinfo) - fecha_ultima_venta).days
+
+        alertas.append({
+            "producto_id": producto.id,
+            "nombre_producto": producto.nombre,
+            "stock_actual": producto.stock_terminado or 0,
+            "stock_minimo": producto.stock_minimo or 0,
+            "unidad_venta": producto.unidad_venta or "unidad",
+            "dias_sin_stock": dias_sin_stock
+        })
+
+    return alertas
+
+async def get_productos_por_vencer(db: AsyncSession, negocio_id: UUID, dias_limite: int = 7) -> List[Dict[str, Any]]:
+    """Obtiene productos próximos a vencer"""
+    fecha_limite = date.today() + timedelta(days=dias_limite)
+
+    result = await db.execute(
+        select(Producto).where(
+            and_(
+                Producto.negocio_id == negocio_id,
+                Producto.fecha_vencimiento <= fecha_limite,
+                Producto.fecha_vencimiento >= date.today(),
+                Producto.stock_terminado > 0
+            )
+        )
+    )
+
+    productos_vencimiento = [
+        {
+            "producto_id": producto.id,
+            "nombre_producto": producto.nombre,
+            "fecha_vencimiento": producto.fecha_vencimiento,
+            "dias_para_vencer": (producto.fecha_vencimiento - date.today()).days,
+            "stock_disponible": producto.stock_terminado or 0,
+            "unidad_venta": producto.unidad_venta or "unidad"
+        }
+        for producto in result.scalars().all()
+    ]
+
+    return sorted(productos_vencimiento, key=lambda x: x["dias_para_vencer"])
+
+# FUNCIONES PARA CARRITO DE COMPRAS
+async def create_carrito(db: AsyncSession, carrito_data: CarritoCompraCreate) -> CarritoCompra:
+    """Crea un nuevo carrito de compras"""
+    db_carrito = CarritoCompra(**carrito_data.model_dump())
+    db.add(db_carrito)
+    await db.commit()
+    return await get_carrito(db, db_carrito.id)
+
+async def add_item_to_carrito(db: AsyncSession, carrito_id: UUID, item_data: ItemCarritoCreate) -> ItemCarrito:
+    """Añade un item al carrito"""
+
+    result = await db.execute(
+        select(ItemCarrito).where(
+            and_(
+                ItemCarrito.carrito_id == carrito_id,
+                ItemCarrito.producto_id == item_data.producto_id
+            )
+        )
+    )
+    existing_item = result.scalars().first()
+
+    if existing_item:
+        existing_item.cantidad += item_data.cantidad
+        await db.commit()
+        await db.refresh(existing_item)
+        return existing_item
+
+    producto = await db.get(Producto, item_data.producto_id)
+    if not producto:
+        raise ValueError("Producto no encontrado")
+
+    db_item = ItemCarrito(
+        carrito_id=carrito_id,
+        producto_id=item_data.producto_id,
+        cantidad=item_data.cantidad,
+        precio_unitario=producto.precio
+    )
+
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    return db_item
+
+async def get_carrito(db: AsyncSession, carrito_id: UUID) -> Optional[CarritoCompra]:
+    """Obtiene un carrito por ID (con items y negocio cargados)"""
+    result = await db.execute(
+        _carrito_select().where(CarritoCompra.id == carrito_id).execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def get_carrito_by_cliente(db: AsyncSession, negocio_id: UUID, cliente_id: Optional[UUID] = None, session_id: Optional[str] = None) -> Optional[CarritoCompra]:
+    """Obtiene el carrito activo de un cliente"""
+    query = _carrito_select().where(
+        and_(
+            CarritoCompra.negocio_id == negocio_id,
+            CarritoCompra.activo == True
+        )
+    )
+
+    if cliente_id:
+        query = query.where(CarritoCompra.cliente_id == cliente_id)
+    elif session_id:
+        query = query.where(CarritoCompra.session_id == session_id)
+    else:
+        return None
+
+    result = await db.execute(query)
+    return result.scalars().first()
+
+async def remove_item_from_carrito(db: AsyncSession, carrito_id: UUID, item_id: UUID) -> bool:
+    """Elimina un item del carrito"""
+    result = await db.execute(
+        select(ItemCarrito).where(
+            and_(
+                ItemCarrito.carrito_id == carrito_id,
+                ItemCarrito.id == item_id
+            )
+        )
+    )
+    item = result.scalars().first()
+
+    if item:
+        await db.delete(item)
+        await db.commit()
+        return True
+    return False
+
+async def clear_carrito(db: AsyncSession, carrito_id: UUID) -> bool:
+    """Limpia todos los items del carrito"""
+    result = await db.execute(select(ItemCarrito).where(ItemCarrito.carrito_id == carrito_id))
+
+    for item in result.scalars().all():
+        await db.delete(item)
+
+    await db.commit()
+    return True
@@ -1,11 +1,16 @@
 # backend/app/crud/business.py
 
+from sqlalchemy import and_, case, func, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.models import Negocio, Usuario # Importa los modelos Negocio y Usuario
+from app.models import Negocio, Producto, ProductType, Publicidad, Usuario # Importa los modelos
+from app.core.business_binding import invalidate_business_binding
+from app.core.response_cache import invalidate_catalog
+from app.geo.geohash import EARTH_RADIUS_KM, cells_covering
+from app.geo.locate import locate_business
 from app.schemas import NegocioCreate, NegocioUpdate # Importa los esquemas Pydantic
 
 # Función para crear un nuevo negocio
@@ -14,61 +19,46 @@ def create_business(db: Session, user_id: UUID, business: NegocioCreate) -> Nego
     Crea un nuevo negocio en la base de datos asociado a un usuario.
     """
     business_data = business.model_dump()
-    # Convertir fotos_urls a JSON string si existe
-    if business_data.get('fotos_urls'):
-        import json
-        business_data['fotos_urls'] = json.dumps(business_data['fotos_urls'])
-    
+    if business_data.get('fotos_urls') is None:
+        business_data['fotos_urls'] = []
+
     db_business = Negocio(**business_data, propietario_id=user_id)
+    locate_business(
+        db_business,
+        coordinates_given=business.latitud is not None and business.longitud is not None,
+        location_changed=True,
+    )
     try:
         db.add(db_business)
         db.commit()
+        invalidate_business_binding(user_id)
+        invalidate_catalog(db_business.id, business_changed=True)
         db.refresh(db_business)
         return db_business
     except IntegrityError:
         db.rollback()
         raise ValueError("Error de integridad al crear el negocio. Podría haber un duplicado.")
 
-# Función auxiliar para convertir fotos_urls de JSON a lista
-def _convert_fotos_urls(business):
+# Función para obtener solo los IDs de los negocios de un usuario (claims del token)
+def get_business_ids_by_user_id(db: Session, user_id: UUID) -> List[UUID]:
     """
-    Convierte fotos_urls de JSON string a lista si es necesario.
+    Obtiene los IDs de los negocios de los que el usuario es propietario.
     """
-    if hasattr(business, 'fotos_urls'):
-        import json
-        try:
-            if business.fotos_urls is None:
-                business.fotos_urls = []
-            elif isinstance(business.fotos_urls, str):
-                if business.fotos_urls.strip():
-                    business.fotos_urls = json.loads(business.fotos_urls)
-                else:
-                    business.fotos_urls = []
-            elif not isinstance(business.fotos_urls, list):
-                business.fotos_urls = []
-        except (json.JSONDecodeError, TypeError, AttributeError):
-            business.fotos_urls = []
-    else:
-        business.fotos_urls = []
-    return business
+    return [row[0] for row in db.query(Negocio.id).filter(Negocio.propietario_id == user_id).all()]
 
 # Función para obtener un negocio por su ID
 def get_business_by_id(db: Session, business_id: UUID) -> Optional[Negocio]:
     """
     Obtiene un negocio de la base de datos por su ID.
     """
-    business = db.query(Negocio).filter(Negocio.id == business_id).first()
-    if business:
-        return _convert_fotos_urls(business)
-    return None
+    return db.query(Negocio).filter(Negocio.id == business_id).first()
 
 # Función para obtener todos los negocios de un usuario específico
 def get_businesses_by_user_id(db: Session, user_id: UUID) -> List[Negocio]:
     """
     Obtiene una lista de todos los negocios asociados a un usuario específico.
     """
-    businesses = db.query(Negocio).filter(Negocio.propietario_id == user_id).all()
-    return [_convert_fotos_urls(business) for business in businesses]
+    return db.query(Negocio).filter(Negocio.propietario_id == user_id).all()
 
 # NUEVA FUNCIÓN: Obtener todos los negocios (para listado público)
 def get_all_businesses(db: Session) -> List[Negocio]:
@@ -76,8 +66,100 @@ def get_all_businesses(db: Session) -> List[Negocio]:
     Obtiene una lista de todos los negocios en la base de datos.
     Utilizado para el listado público.
     """
-    businesses = db.query(Negocio).all()
-    return [_convert_fotos_urls(business) for business in businesses]
+    return db.query(Negocio).all()
+
+def _distance_km(lat: float, lon: float):
+    """Distancia (haversine, km) desde (lat, lon) hasta el negocio, como expresión SQL."""
+    dlat = func.radians(Negocio.latitud - lat)
+    dlon = func.radians(Negocio.longitud - lon)
+    a = (
+        func.power(func.sin(dlat / 2), 2)
+        + func.cos(func.radians(lat)) * func.cos(func.radians(Negocio.latitud)) * func.power(func.sin(dlon / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
+
+# Negocios cercanos a un punto (listado público)
+def get_businesses_near(db: Session, lat: float, lon: float, radius_km: float, limit: int = 20) -> List[Tuple[Negocio, float]]:
+    """
+    Negocios a menos de `radius_km` del punto, del más cercano al más lejano, con su distancia.
+    Solo se calcula la distancia de los candidatos de las celdas geohash que cubren el radio
+    (búsquedas por prefijo en ix_negocios_geohash), no de toda la tabla.
+    """
+    distance = _distance_km(lat, lon).label("distancia_km")
+    cells = cells_covering(lat, lon, radius_km)
+    rows = (
+        db.query(Negocio, distance)
+        .filter(or_(*[Negocio.geohash.like(f"{cell}%") for cell in cells]))
+        .filter(distance <= radius_km)
+        .order_by(distance, Negocio.id)
+        .limit(limit)
+        .all()
+    )
+    return [(negocio, distancia_km) for negocio, distancia_km in rows]
+
+# Estado de stock calculado en la consulta: solo los bienes físicos llevan stock
+_ESTADO_STOCK = case(
+    (Producto.tipo_producto != ProductType.PHYSICAL_GOOD, "disponible"),
+    (func.coalesce(Producto.stock_terminado, 0) <= 0, "agotado"),
+    (Producto.stock_terminado <= func.coalesce(Producto.stock_minimo, 0), "stock_bajo"),
+    else_="disponible",
+).label("estado_stock")
+
+_STOREFRONT_PRODUCT_COLUMNS = (
+    Producto.id, Producto.nombre, Producto.descripcion, Producto.precio, Producto.precio_venta,
+    Producto.tipo_producto, Producto.categoria, Producto.unidad_venta, Producto.stock_terminado,
+    Producto.rating_promedio, Producto.reviews_count, Producto.alergenos,
+)
+
+# Vitrina pública de un negocio (negocio + catálogo + publicidades vigentes)
+def get_storefront(db: Session, business_id: UUID) -> Optional[Dict[str, Any]]:
+    """
+    Todo lo que muestra la landing de un negocio, en dos consultas:
+    1. El negocio con sus publicidades vigentes (las suyas y las de sus productos) en un
+       LEFT JOIN: una fila por publicidad, o una sola fila sin publicidad.
+    2. Las columnas públicas de sus productos, con el estado de stock calculado en SQL.
+    El resumen de calificaciones se arma con las filas de la consulta 2.
+    Retorna None si el negocio no existe.
+    """
+    now = func.now()
+    rows = (
+        db.query(Negocio, Publicidad)
+        .outerjoin(Publicidad, and_(
+            Publicidad.fecha_inicio <= now,
+            Publicidad.fecha_fin >= now,
+            or_(
+                Publicidad.item_publicitado_id == Negocio.id,
+                Publicidad.item_publicitado_id.in_(
+                    db.query(Producto.id).filter(Producto.negocio_id == business_id)
+                ),
+            ),
+        ))
+        .filter(Negocio.id == business_id)
+        .order_by(Publicidad.fecha_inicio, Publicidad.id)
+        .all()
+    )
+    if not rows:
+        return None
+
+    productos = (
+        db.query(*_STOREFRONT_PRODUCT_COLUMNS, _ESTADO_STOCK)
+        .filter(Producto.negocio_id == business_id)
+        .order_by(Producto.fecha_creacion.desc(), Producto.id.desc())
+        .all()
+    )
+    total_reviews = sum(producto.reviews_count or 0 for producto in productos)
+    rating_ponderado = sum((producto.rating_promedio or 0) * (producto.reviews_count or 0) for producto in productos)
+    return {
+        "negocio": rows[0][0],
+        "productos": productos,
+        "publicidades": [publicidad for _, publicidad in rows if publicidad is not None],
+        "resumen": {
+            "total_productos": len(productos),
+            "productos_disponibles": sum(1 for producto in productos if producto.estado_stock != "agotado"),
+            "rating_promedio": round(rating_ponderado / total_reviews, 2) if total_reviews else None,
+            "total_reviews": total_reviews,
+        },
+    }
 
 # Función para actualizar un negocio existente
 def update_business(db: Session, business_id: UUID, business_update: NegocioUpdate) -> Optional[Negocio]:
@@ -87,17 +169,20 @@ def update_business(db: Session, business_id: UUID, business_update: NegocioUpda
     db_business = db.query(Negocio).filter(Negocio.id == business_id).first()
     if db_business:
         update_data = business_update.model_dump(exclude_unset=True)
-        # Convertir fotos_urls a JSON string si existe
-        if 'fotos_urls' in update_data and update_data['fotos_urls'] is not None:
-            import json
-            update_data['fotos_urls'] = json.dumps(update_data['fotos_urls'])
-        
+        if 'fotos_urls' in update_data and update_data['fotos_urls'] is None:
+            update_data['fotos_urls'] = []
+
         for key, value in update_data.items():
             setattr(db_business, key, value)
+        coordinates_given = 'latitud' in update_data or 'longitud' in update_data
+        if coordinates_given or 'localizacion_geografica' in update_data:
+            locate_business(db_business, coordinates_given, 'localizacion_geografica' in update_data)
         try:
             db.add(db_business)
             db.commit()
             db.refresh(db_business)
+            invalidate_business_binding(db_business.propietario_id)
+            invalidate_catalog(business_id, business_changed=True)
             return db_business
         except IntegrityError:
             db.rollback()
@@ -111,8 +196,13 @@ def delete_business(db: Session, business_id: UUID) -> bool:
     """
     db_business = db.query(Negocio).filter(Negocio.id == business_id).first()
     if db_business:
+        propietario_id = db_business.propietario_id
+        # Los productos se borran en cascada: también hay que invalidar su detalle público
+        producto_ids = [row[0] for row in db.query(Producto.id).filter(Producto.negocio_id == business_id).all()]
         db.delete(db_business)
         db.commit()
+        invalidate_business_binding(propietario_id)
+        invalidate_catalog(business_id, producto_ids, business_changed=True)
         return True
     return False
 
@@ -1,14 +1,29 @@
 # backend/app/crud/product.py
 
-from sqlalchemy import func
+from sqlalchemy import func, inspect
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
 from sqlalchemy.exc import IntegrityError
 from uuid import UUID
 from typing import List, Optional
 
-from app.models import Producto, Insumo, ProductoInsumo, Usuario
-from app.schemas import ProductoCreate, ProductoUpdate, ProductoInsumoCreate
+from app.models import Producto, Insumo, ProductoInsumo, Usuario, ProductType
+from app.core.response_cache import invalidate_catalog
+from app.schemas import ProductoCreate, ProductoUpdate, ProductoInsumoCreate, ProductoResponse
+
+# Relaciones que serializa ProductoResponse (insumos_asociados -> insumo): con selectinload
+# son dos consultas por listado, no una por producto y otra por asociación.
+_RESPONSE_RELATIONSHIPS = selectinload(Producto.insumos_asociados).selectinload(ProductoInsumo.insumo)
+
+# Listados que solo se serializan: cualquier otra relación queda en raiseload, así un
+# acceso accidental (que sería una consulta por fila) falla en vez de degradar en silencio.
+PRODUCT_LIST_OPTIONS = (_RESPONSE_RELATIONSHIPS, raiseload("*"))
+
+# Catálogo público: además, solo las columnas que expone ProductoResponse
+_PRODUCT_COLUMNS = {attr.key for attr in inspect(Producto).column_attrs}
+PUBLIC_CATALOG_OPTIONS = PRODUCT_LIST_OPTIONS + (
+    load_only(*[getattr(Producto, name) for name in ProductoResponse.model_fields if name in _PRODUCT_COLUMNS]),
+)
 
 # Función auxiliar para sincronizar insumos asociados a un producto
 def _sync_product_insumos(db: Session, db_product: Producto, insumos_data: List[ProductoInsumoCreate]):
@@ -77,6 +92,7 @@ def create_product(db: Session, propietario_id: UUID, product: ProductoCreate) -
         _sync_product_insumos(db, db_product, insumos_data)
         _calculate_product_costs_and_prices(db, db_product)
         db.commit()
+        invalidate_catalog(db_product.negocio_id, [db_product.id])
         db.refresh(db_product)
         return db_product
     except IntegrityError as e:
@@ -90,17 +106,62 @@ def create_product(db: Session, propietario_id: UUID, product: ProductoCreate) -
         raise e
 
 def get_product_by_id(db: Session, product_id: UUID) -> Optional[Producto]:
-    return db.query(Producto).filter(Producto.id == product_id).first()
+    return db.query(Producto).options(_RESPONSE_RELATIONSHIPS).filter(Producto.id == product_id).first()
+
+def get_products_by_ids(db: Session, product_ids: List[UUID]) -> List[Producto]:
+    """Productos con esos ids en el mismo orden (una consulta IN); los inexistentes se omiten."""
+    if not product_ids:
+        return []
+    by_id = {p.id: p for p in db.query(Producto).options(*PRODUCT_LIST_OPTIONS).filter(Producto.id.in_(set(product_ids)))}
+    return [by_id[product_id] for product_id in product_ids if product_id in by_id]
 
 def get_all_products(db: Session) -> List[Producto]:
     """Obtiene todos los productos públicos (para endpoints públicos)"""
-    return db.query(Producto).all()
+    return db.query(Producto).options(*PRODUCT_LIST_OPTIONS).all()
+
+# Ordenamientos del catálogo público. Todos terminan en Producto.id para que el orden
+# sea estable entre páginas aunque haya empates.
+PUBLIC_PRODUCT_SORTS = {
+    "recientes": (Producto.fecha_creacion.desc(), Producto.id.desc()),
+    "precio_asc": (Producto.precio.asc(), Producto.id.asc()),
+    "precio_desc": (Producto.precio.desc(), Producto.id.desc()),
+    "nombre": (Producto.nombre.asc(), Producto.id.asc()),
+    "rating": (Producto.rating_promedio.desc(), Producto.id.desc()),
+}
+
+def query_public_products(
+    db: Session,
+    negocio_id: Optional[UUID] = None,
+    tipo_producto: Optional[ProductType] = None,
+    categoria: Optional[str] = None,
+    precio_min: Optional[float] = None,
+    precio_max: Optional[float] = None,
+):
+    """Consulta filtrada del catálogo público (sin orden ni paginación)."""
+    query = db.query(Producto)
+    if negocio_id is not None:
+        query = query.filter(Producto.negocio_id == negocio_id)
+    if tipo_producto is not None:
+        query = query.filter(Producto.tipo_producto == tipo_producto)
+    if categoria:
+        query = query.filter(Producto.categoria == categoria)
+    if precio_min is not None:
+        query = query.filter(Producto.precio >= precio_min)
+    if precio_max is not None:
+        query = query.filter(Producto.precio <= precio_max)
+    return query
+
+def get_public_products_page(db: Session, query, sort: str = "recientes", offset: int = 0, limit: int = 50) -> List[Producto]:
+    """Una página del catálogo público con un orden estable."""
+    if sort not in PUBLIC_PRODUCT_SORTS:
+        raise ValueError(f"Orden no soportado: {sort}")
+    return query.options(*PUBLIC_CATALOG_OPTIONS).order_by(*PUBLIC_PRODUCT_SORTS[sort]).offset(offset).limit(limit).all()
 
 def get_all_products_by_user_id(db: Session, propietario_id: UUID) -> List[Producto]:
-    return db.query(Producto).filter(Producto.propietario_id == propietario_id).all()
+    return db.query(Producto).options(*PRODUCT_LIST_OPTIONS).filter(Producto.propietario_id == propietario_id).all()
 
 def get_products_by_business_id(db: Session, business_id: UUID) -> List[Producto]:
-    return db.query(Producto).filter(Producto.negocio_id == business_id).all()
+    return db.query(Producto).options(*PRODUCT_LIST_OPTIONS).filter(Producto.negocio_id == business_id).all()
 
 def update_product(db: Session, product_id: UUID, product_update: ProductoUpdate) -> Optional[Producto]:
     db_product = db.query(Producto).filter(Producto.id == product_id).first()
@@ -108,6 +169,7 @@ def update_product(db: Session, product_id: UUID, product_update: ProductoUpdate
         return None
     insumos_data = product_update.insumos
     product_data = product_update.model_dump(exclude_unset=True, exclude={"insumos"})
+    previous_negocio_id = db_product.negocio_id
     for key, value in product_data.items():
         setattr(db_product, key, value)
     try:
@@ -117,6 +179,9 @@ def update_product(db: Session, product_id: UUID, product_update: ProductoUpdate
             _sync_product_insumos(db, db_product, insumos_data)
         _calculate_product_costs_and_prices(db, db_product)
         db.commit()
+        invalidate_catalog(previous_negocio_id, [product_id])
+        if db_product.negocio_id != previous_negocio_id:
+            invalidate_catalog(db_product.negocio_id, [product_id])
         db.refresh(db_product)
         return db_product
     except IntegrityError:
@@ -129,8 +194,10 @@ def update_product(db: Session, product_id: UUID, product_update: ProductoUpdate
 def delete_product(db: Session, product_id: UUID) -> bool:
     db_product = db.query(Producto).filter(Producto.id == product_id).first()
     if db_product:
+        negocio_id = db_product.negocio_id
         db.delete(db_product)
         db.commit()
+        invalidate_catalog(negocio_id, [product_id])
         return True
     return False
 
@@ -199,6 +266,7 @@ def record_sale(db: Session, product_id: UUID, quantity_sold: float, user_id: UU
     
     try:
         db.commit()
+        invalidate_catalog(db_product.negocio_id, [product_id])
         db.refresh(db_product)
         
         return {
@@ -242,6 +310,7 @@ def update_product_stock(db: Session, product_id: UUID, new_stock: float, user_i
     
     try:
         db.commit()
+        invalidate_catalog(db_product.negocio_id, [product_id])
         db.refresh(db_product)
         return db_product
     except Exception as e:
@@ -260,7 +329,7 @@ def get_products_low_stock(db: Session, user_id: UUID, threshold: float = 5.0):
     Returns:
         List[Producto]: Lista de productos con stock bajo
     """
-    return db.query(Producto).filter(
+    return db.query(Producto).options(*PRODUCT_LIST_OPTIONS).filter(
         Producto.propietario_id == user_id,
         Producto.stock_terminado <= threshold,
         Producto.stock_terminado > 0
@@ -277,7 +346,7 @@ def get_products_out_of_stock(db: Session, user_id: UUID):
     Returns:
         List[Producto]: Lista de productos sin stock
     """
-    return db.query(Producto).filter(
+    return db.query(Producto).options(*PRODUCT_LIST_OPTIONS).filter(
         Producto.propietario_id == user_id,
         (Producto.stock_terminado == 0) | (Producto.stock_terminado.is_(None))
     ).all()
@@ -0,0 +1,90 @@
+# backend/app/crud/search.py
+#
+# Búsqueda de texto completo del marketplace público sobre productos y negocios.
+# La columna search_vector (tsvector) la mantienen triggers de la base de datos
+# (migración v0007) con la configuración es_unaccent: español y sin acentos, así que
+# "azucar" encuentra "azúcar" y "panes" encuentra "pan".
+
+from typing import Any, List, Tuple
+
+from sqlalchemy import func, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models import Negocio, Producto
+
+SEARCH_CONFIG = "es_unaccent"
+SEARCH_SCOPES = ("todos", "productos", "negocios")
+
+# Opciones de ts_headline: fragmentos cortos con las coincidencias entre <mark>
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=8, MaxFragments=2"
+
+
+def _ts_query(q: str):
+    # websearch_to_tsquery acepta texto libre ("pan integral", "-queso", "\"pan dulce\"") sin errores de sintaxis
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+def _product_select(ts_query):
+    return select(
+        literal("producto").label("tipo"),
+        Producto.id.label("id"),
+        Producto.nombre.label("nombre"),
+        Producto.negocio_id.label("negocio_id"),
+        Producto.precio.label("precio"),
+        func.ts_rank(Producto.search_vector, ts_query).label("rank"),
+        func.concat_ws(" ", Producto.nombre, Producto.descripcion).label("documento"),
+    ).where(Producto.search_vector.op("@@")(ts_query))
+
+
+def _business_select(ts_query):
+    return select(
+        literal("negocio").label("tipo"),
+        Negocio.id.label("id"),
+        Negocio.nombre.label("nombre"),
+        null().label("negocio_id"),
+        null().label("precio"),
+        func.ts_rank(Negocio.search_vector, ts_query).label("rank"),
+        func.concat_ws(" ", Negocio.nombre, Negocio.rubro, Negocio.descripcion).label("documento"),
+    ).where(Negocio.search_vector.op("@@")(ts_query))
+
+
+def search_public(db: Session, q: str, scope: str = "todos", offset: int = 0, limit: int = 20) -> Tuple[List[Any], int]:
+    """
+    Busca `q` en productos y/o negocios. Devuelve (filas de la página, total de coincidencias).
+    Cada fila tiene tipo, id, nombre, negocio_id, precio, rank y snippet.
+    """
+    if scope not in SEARCH_SCOPES:
+        raise ValueError(f"Ámbito de búsqueda no soportado: {scope}")
+
+    ts_query = _ts_query(q)
+    selects = []
+    if scope in ("todos", "productos"):
+        selects.append(_product_select(ts_query))
+    if scope in ("todos", "negocios"):
+        selects.append(_business_select(ts_query))
+    matches = (union_all(*selects) if len(selects) > 1 else selects[0]).subquery("matches")
+
+    total = db.execute(select(func.count()).select_from(matches)).scalar() or 0
+    if total == 0:
+        return [], 0
+
+    # Primero se ordena y recorta la página; ts_headline (costoso) solo corre sobre esas filas
+    page = (
+        select(matches)
+        .order_by(matches.c.rank.desc(), matches.c.id)
+        .offset(offset)
+        .limit(limit)
+        .subquery("page")
+    )
+    rows = db.execute(
+        select(
+            page.c.tipo,
+            page.c.id,
+            page.c.nombre,
+            page.c.negocio_id,
+            page.c.precio,
+            page.c.rank,
+            func.ts_headline(SEARCH_CONFIG, page.c.documento, _ts_query(q), HEADLINE_OPTIONS).label("snippet"),
+        ).order_by(page.c.rank.desc(), page.c.id)
+    ).all()
+    return rows, total
@@ -6,6 +6,7 @@ from uuid import UUID
 from app.models import Usuario
 from app.schemas import UsuarioCreate, UsuarioUpdate
 from app.core.security import get_password_hash, verify_password
+from app.core.principal_cache import invalidate_principal
 
 def get_user(db: Session, user_id: UUID) -> Optional[Usuario]:
     return db.query(Usuario).filter(Usuario.id == user_id).first()
@@ -32,6 +33,19 @@ def create_user(db: Session, user: UsuarioCreate) -> Usuario:
     db.refresh(db_user)
     return db_user
 
+# Campos del usuario que viajan como claims en el token (build_user_claims): si cambian,
+# los tokens emitidos quedan desactualizados y se revocan (token_version). Agregar un
+# plugin no revoca: el token anterior solo queda sin el permiso nuevo hasta renovarse.
+_CLAIM_FIELDS = ("email", "tipo_tier")
+
+def bump_token_version(db_user: Usuario) -> None:
+    db_user.token_version = (db_user.token_version or 0) + 1
+
+def revokes_tokens(db_user: Usuario, update_data: dict) -> bool:
+    if "plugins_activos" in update_data and set(db_user.plugins_activos or []) - set(update_data["plugins_activos"] or []):
+        return True
+    return any(field in update_data and update_data[field] != getattr(db_user, field) for field in _CLAIM_FIELDS)
+
 def update_user(db: Session, user_id: UUID, user_update: UsuarioUpdate) -> Optional[Usuario]:
     db_user = get_user(db, user_id)
     if not db_user:
@@ -39,9 +53,12 @@ def update_user(db: Session, user_id: UUID, user_update: UsuarioUpdate) -> Optio
     
     update_data = user_update.dict(exclude_unset=True)
     
-    # Manejar actualización de contraseña
+    # Manejar actualización de contraseña (revoca los tokens emitidos con la anterior)
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        bump_token_version(db_user)
+    elif revokes_tokens(db_user, update_data):
+        bump_token_version(db_user)
     
     # Actualizar plugins_activos si se proporciona
     if "plugins_activos" in update_data:
@@ -53,6 +70,7 @@ def update_user(db: Session, user_id: UUID, user_update: UsuarioUpdate) -> Optio
             setattr(db_user, field, value)
     
     db.commit()
+    invalidate_principal(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -63,8 +81,28 @@ def delete_user(db: Session, user_id: UUID) -> bool:
     
     db.delete(db_user)
     db.commit()
+    invalidate_principal(user_id)
     return True
 
+def revoke_user_tokens(db: Session, user_id: UUID) -> Optional[Usuario]:
+    """Invalida todos los tokens emitidos para el usuario (incrementa token_version)"""
+    db_user = get_user(db, user_id)
+    if not db_user:
+        return None
+
+    db_user.token_version = (db_user.token_version or 0) + 1
+    db.commit()
+    invalidate_principal(user_id)
+    db.refresh(db_user)
+    return db_user
+
+def update_password_hash(db: Session, db_user: Usuario, hashed_password: str) -> Usuario:
+    """Guarda un hash regenerado de la misma contraseña (no revoca los tokens)"""
+    db_user.hashed_password = hashed_password
+    db.commit()
+    invalidate_principal(db_user.id)
+    return db_user
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[Usuario]:
     user = get_user_by_email(db, email)
     if not user:
@@ -84,8 +122,10 @@ def activate_plugin(db: Session, user_id: UUID, plugin_name: str) -> Optional[Us
         db_user.plugins_activos = []
     
     if plugin_name not in db_user.plugins_activos:
-        db_user.plugins_activos.append(plugin_name)
+        # Se reasigna la lista para que SQLAlchemy detecte el cambio en la columna ARRAY
+        db_user.plugins_activos = db_user.plugins_activos + [plugin_name]
         db.commit()
+        invalidate_principal(user_id)
         db.refresh(db_user)
     
     return db_user
@@ -97,8 +137,10 @@ def deactivate_plugin(db: Session, user_id: UUID, plugin_name: str) -> Optional[
         return None
     
     if db_user.plugins_activos and plugin_name in db_user.plugins_activos:
-        db_user.plugins_activos.remove(plugin_name)
+        db_user.plugins_activos = [p for p in db_user.plugins_activos if p != plugin_name]
+        bump_token_version(db_user)  # sin esto, el plugin seguiría habilitado hasta que venza el token
         db.commit()
+        invalidate_principal(user_id)
         db.refresh(db_user)
     
     return db_user
@@ -1,14 +1,16 @@
 # backend/app/crud/venta.py
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, and_, or_, desc, tuple_
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime, date, timedelta
 import uuid
 
 from app.models import Venta, DetalleVenta, CarritoCompra, ItemCarrito, Producto
 from app.schemas import VentaCreate, DetalleVentaCreate, CarritoCompraCreate, ItemCarritoCreate
+from app.core.pagination import encode_cursor
+from app.core.response_cache import invalidate_catalog
 
 def generate_venta_number() -> str:
     """Genera un número único de venta"""
@@ -42,6 +44,7 @@ def create_venta(db: Session, venta_data: VentaCreate, propietario_id: UUID) ->
     # Calcular costos y márgenes
     costo_total = 0.0
     margen_total = 0.0
+    stock_actualizado: Dict[UUID, List[UUID]] = {}  # negocio_id -> productos con stock modificado
     
     # Crear detalles de venta
     for detalle_data in venta_data.detalles:
@@ -81,12 +84,15 @@ def create_venta(db: Session, venta_data: VentaCreate, propietario_id: UUID) ->
             producto.stock_terminado -= detalle_data.cantidad
             if producto.stock_terminado < 0:
                 producto.stock_terminado = 0
+            stock_actualizado.setdefault(producto.negocio_id, []).append(producto.id)
     
     # Actualizar costos y márgenes totales de la venta
     db_venta.costo_total = costo_total
     db_venta.margen_ganancia_total = margen_total
     
     db.commit()
+    for negocio_id, producto_ids in stock_actualizado.items():
+        invalidate_catalog(negocio_id, producto_ids)
     db.refresh(db_venta)
     
     return db_venta
@@ -96,8 +102,41 @@ def get_venta(db: Session, venta_id: UUID) -> Optional[Venta]:
     return db.query(Venta).filter(Venta.id == venta_id).first()
 
 def get_ventas_by_negocio(db: Session, negocio_id: UUID, skip: int = 0, limit: int = 100) -> List[Venta]:
-    """Obtiene todas las ventas de un negocio"""
-    return db.query(Venta).filter(Venta.negocio_id == negocio_id).offset(skip).limit(limit).all()
+    """Obtiene todas las ventas de un negocio (paginación por offset; preferir get_ventas_page)"""
+    return (
+        db.query(Venta)
+        .options(selectinload(Venta.detalles))
+        .filter(Venta.negocio_id == negocio_id)
+        .order_by(Venta.fecha_venta.desc(), Venta.id.desc())
+        .offset(skip).limit(limit).all()
+    )
+
+def get_ventas_page(
+    db: Session,
+    negocio_id: UUID,
+    limit: int = 100,
+    after: Optional[Tuple[datetime, UUID]] = None
+) -> Tuple[List[Venta], Optional[str]]:
+    """
+    Página de ventas de un negocio, de la más reciente a la más antigua, paginada por
+    cursor sobre (fecha_venta, id): usa el índice ix_ventas_negocio_fecha_id y el costo no
+    crece con la profundidad de la página. Los detalles llegan en una sola consulta IN.
+    Retorna (ventas, cursor_siguiente_o_None).
+    """
+    query = (
+        db.query(Venta)
+        .options(selectinload(Venta.detalles))
+        .filter(Venta.negocio_id == negocio_id)
+    )
+    if after is not None:
+        query = query.filter(tuple_(Venta.fecha_venta, Venta.id) < tuple_(*after))
+    ventas = query.order_by(Venta.fecha_venta.desc(), Venta.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(ventas) > limit:
+        ventas = ventas[:limit]
+        next_cursor = encode_cursor(ventas[-1].fecha_venta, ventas[-1].id)
+    return ventas, next_cursor
 
 def get_ventas_by_date_range(db: Session, negocio_id: UUID, fecha_inicio: date, fecha_fin: date) -> List[Venta]:
     """Obtiene ventas en un rango de fechas"""
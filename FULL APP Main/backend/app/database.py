@@ -1,15 +1,38 @@
 # backend/app/database.py
 
-from sqlalchemy import create_engine
+from typing import AsyncGenerator
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
 from app.core.config import settings # Importar la instancia de configuración
+from app.core.pool_metrics import pool_metrics, replica_pool_metrics, InstrumentedQueuePool, ReplicaQueuePool
 
 # Obtener la URL de la base de datos desde las configuraciones
 DATABASE_URL = settings.DATABASE_URL
 
+def _pool_kwargs(poolclass=None) -> dict:
+    """
+    Parámetros del pool de conexiones según la configuración.
+    Con DB_USE_NULLPOOL cada sesión abre y cierra su conexión (el pooling lo hace PgBouncer).
+    """
+    if settings.DB_USE_NULLPOOL:
+        return {"poolclass": NullPool}
+    kwargs = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if poolclass is not None:
+        kwargs["poolclass"] = poolclass
+    return kwargs
+
 # Crear el motor de la base de datos
 # El parámetro 'echo' se establece en settings.DEBUG para mostrar las consultas SQL solo en modo depuración.
-engine = create_engine(DATABASE_URL, echo=settings.DEBUG)
+engine = create_engine(DATABASE_URL, echo=settings.DEBUG, **_pool_kwargs(InstrumentedQueuePool))
+pool_metrics.attach(engine)
 
 # Crear una sesión local de la base de datos
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -17,10 +40,76 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base declarativa para los modelos de SQLAlchemy
 Base = declarative_base()
 
-# Función de utilidad para obtener una sesión de base de datos
+# Función de utilidad para obtener una sesión de base de datos.
+# Es el ÚNICO proveedor de sesión por request: todos los routers y app.dependencies
+# deben usar esta misma función para que FastAPI reutilice la sesión (y la conexión
+# del pool) dentro de un mismo request en lugar de abrir una por dependencia.
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# --- Réplica de solo lectura ---
+# Endpoints públicos y de análisis usan get_read_db. Sin READ_REPLICA_URL, get_read_db
+# ES get_db: FastAPI reutiliza la misma sesión del request y no se abre una segunda conexión.
+# Los flujos de escritura y de lectura-tras-escritura (checkout, POS) siguen en get_db.
+
+replica_engine = None
+ReplicaSessionLocal = None
+
+if settings.READ_REPLICA_URL:
+    replica_engine = create_engine(settings.READ_REPLICA_URL, echo=settings.DEBUG, **_pool_kwargs(ReplicaQueuePool))
+    replica_pool_metrics.attach(replica_engine)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+    @event.listens_for(ReplicaSessionLocal, "before_flush")
+    def _block_replica_writes(session, flush_context, instances):
+        raise RuntimeError("Las sesiones de la réplica de lectura no admiten escrituras; usa get_db.")
+
+    def get_read_db():
+        db = ReplicaSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+else:
+    get_read_db = get_db
+
+
+# --- Modo asíncrono (asyncpg) ---
+
+def build_async_database_url(url: str) -> str:
+    """
+    Convierte una URL síncrona de PostgreSQL (psycopg2) en su equivalente para asyncpg.
+    """
+    if url.startswith("postgresql+asyncpg://"):
+        return url
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+# El motor asíncrono solo se crea si el modo está habilitado, para que el modo
+# síncrono no requiera asyncpg instalado.
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or build_async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=settings.DEBUG, **_pool_kwargs())
+    # expire_on_commit=False evita recargas implícitas (I/O) al leer atributos después del commit
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db() -> AsyncGenerator:
+    """
+    Dependencia que provee una AsyncSession por request (solo con DB_ASYNC_ENABLED=True).
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("El modo asíncrono de base de datos no está habilitado (DB_ASYNC_ENABLED=False).")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,28 +1,24 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from uuid import UUID
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.auth import decode_access_token
+from sqlalchemy import select
+from sqlalchemy.orm import Session, contains_eager, selectinload
+# get_db is re-exported from app.database on purpose: FastAPI caches a dependency per
+# request by callable identity, so get_current_user and the endpoint share ONE session.
+from app.database import get_db, get_async_db
+from app.auth import decode_access_token, build_user_claims, CLAIMS_VERSION
+from app.crud.business import get_business_ids_by_user_id
 from app.schemas import TokenData
-from app.models import Usuario
+from app.models import Usuario, Negocio, CarritoCompra, Venta
+from app.core.principal_cache import (
+    get_cached_principal, cache_principal, get_cached_token_version, cache_token_version
+)
 
 # OAuth2PasswordBearer is used for handling token-based authentication
 # The "tokenUrl" argument specifies the URL where the client can obtain the token (e.g., login endpoint)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
-def get_db() -> Generator[Session, None, None]:
-    """
-    Dependency to provide a database session.
-    This function creates a new SQLAlchemy session for each request,
-    and ensures it's closed after the request is finished.
-    """
-    db = SessionLocal()  # Create a new session
-    try:
-        yield db  # Yield the session to the calling function (FastAPI route)
-    finally:
-        db.close()  # Ensure the session is closed after use
-
 async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Usuario:
     """
     Dependency to get the current authenticated user from the JWT token.
@@ -47,8 +43,221 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except Exception as e: # Catch any exception during token decoding (e.g., JWTError)
         raise credentials_exception from e
 
+    # Cache hit: attach the cached copy to this request's session without a SELECT
+    cached = get_cached_principal(token_data.user_id, token)
+    if cached is not None:
+        if not _token_version_matches(token_data, cached.token_version):
+            raise credentials_exception
+        return db.merge(cached, load=False)
+
     # Query the database to find the user by ID
     user = db.query(Usuario).filter(Usuario.id == token_data.user_id).first()
-    if user is None:
+    if user is None or not _token_version_matches(token_data, user.token_version):
+        raise credentials_exception
+    cache_principal(token_data.user_id, token, user)
+    return user
+
+def _token_version_matches(token_data: TokenData, token_version: Optional[int]) -> bool:
+    # Legacy tokens (without "tv") are accepted until they expire
+    return token_data.tv is None or token_data.tv == (token_version or 0)
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _decode_claims(token: str) -> TokenData:
+    """Decodes the token and rejects it if it has no user."""
+    try:
+        token_data: Optional[TokenData] = decode_access_token(token)
+        if token_data is None or token_data.user_id is None:
+            raise _credentials_exception()
+    except Exception as e:
+        raise _credentials_exception() from e
+    return token_data
+
+def _is_legacy_claims(token_data: TokenData) -> bool:
+    # Tokens emitidos antes de los claims versionados: no traen rol, negocios ni plugins
+    return token_data.cv is None or token_data.cv < CLAIMS_VERSION
+
+def _claims_from_user(token_data: TokenData, user: Optional[Usuario], negocio_ids) -> TokenData:
+    if user is None or not _token_version_matches(token_data, user.token_version):
+        raise _credentials_exception()
+    return TokenData(**build_user_claims(user, negocio_ids))
+
+def get_current_claims(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> TokenData:
+    """
+    Dependency that authorizes from the token alone: returns the versioned claims
+    (rol, negocio_asignado_id, negocios, plugins_activos) without loading the Usuario.
+    Only the token version is checked against the database, and that value is cached,
+    so a revoked token stops working within PRINCIPAL_CACHE_TTL_SECONDS on other workers.
+    Tokens issued before versioned claims are still accepted until they expire: their
+    claims are rebuilt from the database on every request.
+    Raises:
+        HTTPException: If the token is invalid, expired or revoked.
+    """
+    token_data = _decode_claims(token)
+    if _is_legacy_claims(token_data):
+        user = db.query(Usuario).filter(Usuario.id == token_data.user_uuid).first()
+        return _claims_from_user(token_data, user, get_business_ids_by_user_id(db, token_data.user_uuid) if user else [])
+    token_version = get_cached_token_version(token_data.user_id)
+    if token_version is None:
+        token_version = db.query(Usuario.token_version).filter(Usuario.id == token_data.user_uuid).scalar()
+        if token_version is None:
+            raise _credentials_exception()
+        cache_token_version(token_data.user_id, token_version)
+    if token_data.tv != token_version:
+        raise _credentials_exception()
+    return token_data
+
+def is_negocio_member(claims: TokenData, negocio: Negocio) -> bool:
+    """The owner of the business or an employee assigned to it (negocio_asignado_id claim)."""
+    return negocio.propietario_id == claims.user_uuid or claims.negocio_asignado_id == str(negocio.id)
+
+def authorize_negocio(db: Session, claims: TokenData, negocio_id: UUID) -> Negocio:
+    """
+    Loads the business by primary key and checks that the user may operate on it.
+    For ids that come in the request body; path ids use get_authorized_negocio.
+    Raises:
+        HTTPException: 404 if the business does not exist, 403 if the user is not a member.
+    """
+    negocio = db.get(Negocio, negocio_id)
+    if negocio is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Negocio no encontrado")
+    if not is_negocio_member(claims, negocio):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos sobre este negocio")
+    return negocio
+
+def get_authorized_negocio(
+    negocio_id: UUID,
+    request: Request,
+    claims: TokenData = Depends(get_current_claims),
+    db: Session = Depends(get_db)
+) -> Negocio:
+    """Dependency for /{negocio_id} routes: authorized Negocio, also stored in request.state.negocio."""
+    negocio = authorize_negocio(db, claims, negocio_id)
+    request.state.negocio = negocio
+    return negocio
+
+def get_authorized_carrito(
+    carrito_id: UUID,
+    request: Request,
+    claims: TokenData = Depends(get_current_claims),
+    db: Session = Depends(get_db)
+) -> CarritoCompra:
+    """
+    Dependency for /carrito/{carrito_id} routes: loads the cart and its business in one
+    joined query and stores it in request.state.carrito.
+    Raises:
+        HTTPException: 404 if the cart does not exist, 403 if the user is not a member of its business.
+    """
+    carrito = (
+        db.query(CarritoCompra)
+        .join(CarritoCompra.negocio)
+        .options(contains_eager(CarritoCompra.negocio))
+        .filter(CarritoCompra.id == carrito_id)
+        .first()
+    )
+    if carrito is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Carrito no encontrado")
+    if not is_negocio_member(claims, carrito.negocio):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos sobre este carrito")
+    request.state.carrito = carrito
+    return carrito
+
+def get_authorized_venta(
+    venta_id: UUID,
+    request: Request,
+    claims: TokenData = Depends(get_current_claims),
+    db: Session = Depends(get_db)
+) -> Venta:
+    """
+    Dependency for /{venta_id} routes: loads the sale joined with its business (details
+    in one extra IN query) and stores it in request.state.venta.
+    Raises:
+        HTTPException: 404 if the sale does not exist, 403 if the user is not a member of its business.
+    """
+    venta = (
+        db.query(Venta)
+        .join(Venta.negocio)
+        .options(contains_eager(Venta.negocio), selectinload(Venta.detalles))
+        .filter(Venta.id == venta_id)
+        .first()
+    )
+    if venta is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Venta no encontrada")
+    if not is_negocio_member(claims, venta.negocio):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos para ver esta venta")
+    request.state.venta = venta
+    return venta
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db=Depends(get_async_db)) -> Usuario:
+    """
+    Async-mode equivalent of get_current_user, using the request's AsyncSession.
+    Raises:
+        HTTPException: If the token is invalid, expired, or the user is not found.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        token_data: Optional[TokenData] = decode_access_token(token)
+        if token_data is None or token_data.user_id is None:
+            raise credentials_exception
+    except Exception as e:
+        raise credentials_exception from e
+
+    cached = get_cached_principal(token_data.user_id, token)
+    if cached is not None:
+        if not _token_version_matches(token_data, cached.token_version):
+            raise credentials_exception
+        return await db.merge(cached, load=False)
+
+    result = await db.execute(select(Usuario).where(Usuario.id == token_data.user_id))
+    user = result.scalars().first()
+    if user is None or not _token_version_matches(token_data, user.token_version):
         raise credentials_exception
+    cache_principal(token_data.user_id, token, user)
     return user
+
+async def get_current_claims_async(token: str = Depends(oauth2_scheme), db=Depends(get_async_db)) -> TokenData:
+    """
+    Async-mode equivalent of get_current_claims, using the request's AsyncSession.
+    Raises:
+        HTTPException: If the token is invalid, expired or revoked.
+    """
+    token_data = _decode_claims(token)
+    if _is_legacy_claims(token_data):
+        user = await db.get(Usuario, token_data.user_uuid)
+        negocio_ids = []
+        if user is not None:
+            result = await db.execute(select(Negocio.id).where(Negocio.propietario_id == user.id))
+            negocio_ids = list(result.scalars().all())
+        return _claims_from_user(token_data, user, negocio_ids)
+    token_version = get_cached_token_version(token_data.user_id)
+    if token_version is None:
+        result = await db.execute(select(Usuario.token_version).where(Usuario.id == token_data.user_uuid))
+        token_version = result.scalar()
+        if token_version is None:
+            raise _credentials_exception()
+        cache_token_version(token_data.user_id, token_version)
+    if token_data.tv != token_version:
+        raise _credentials_exception()
+    return token_data
+
+async def authorize_negocio_async(db, claims: TokenData, negocio_id: UUID) -> Negocio:
+    """
+    Async-mode equivalent of authorize_negocio (owner or assigned employee).
+    Raises:
+        HTTPException: 404 if the business does not exist, 403 if the user is not a member.
+    """
+    negocio = await db.get(Negocio, negocio_id)
+    if negocio is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Negocio no encontrado")
+    if not is_negocio_member(claims, negocio):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos sobre este negocio")
+    return negocio
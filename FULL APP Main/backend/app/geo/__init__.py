@@ -0,0 +1,9 @@
+# backend/app/geo/__init__.py
+#
+# Geolocalización de negocios sin extensiones de Postgres: geohash (índice btree por
+# prefijo) + un gazetteer offline para convertir localizacion_geografica en lat/lon.
+
+from app.geo.geohash import cells_covering, encode, haversine_km
+from app.geo.gazetteer import geocode
+
+__all__ = ["cells_covering", "encode", "geocode", "haversine_km"]
@@ -0,0 +1,56 @@
+# backend/app/geo/__main__.py
+#
+# Backfill de coordenadas de negocios desde el gazetteer offline:
+#   python -m app.geo backfill [--batch-size 500] [--overwrite]
+# Recorre la tabla por lotes (keyset por id) y confirma cada lote por separado, así que
+# puede correr con la aplicación en línea e interrumpirse/reanudarse sin problemas.
+
+import argparse
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.geo.locate import locate_business
+from app.models import Negocio
+
+
+def backfill(batch_size: int = 500, overwrite: bool = False) -> tuple:
+    """Geocodifica los negocios sin coordenadas (o todos con overwrite). Devuelve (ubicados, sin_resolver)."""
+    located = unresolved = 0
+    last_id = None
+    with SessionLocal() as db:
+        while True:
+            stmt = select(Negocio).where(Negocio.localizacion_geografica.isnot(None)).order_by(Negocio.id).limit(batch_size)
+            if not overwrite:
+                stmt = stmt.where(Negocio.latitud.is_(None))
+            if last_id is not None:
+                stmt = stmt.where(Negocio.id > last_id)
+            batch = db.execute(stmt).scalars().all()
+            if not batch:
+                break
+            for negocio in batch:
+                if locate_business(negocio, coordinates_given=False, location_changed=True):
+                    located += 1
+                else:
+                    unresolved += 1
+            last_id = batch[-1].id
+            db.commit()
+            db.expunge_all()
+    return located, unresolved
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.geo", description="Geolocalización de negocios")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = subparsers.add_parser("backfill", help="Completa latitud/longitud desde localizacion_geografica")
+    backfill_parser.add_argument("--batch-size", type=int, default=500)
+    backfill_parser.add_argument("--overwrite", action="store_true", help="Recalcula también los que ya tienen coordenadas")
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        located, unresolved = backfill(batch_size=args.batch_size, overwrite=args.overwrite)
+        print(f"✅ {located} negocio(s) ubicados; {unresolved} sin resolver (localización no reconocida).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# backend/app/geo/gazetteer.py
+#
+# Geocodificación offline a partir de gazetteer_ar.csv (ciudades argentinas y barrios de
+# CABA). Convierte textos libres como "Palermo, CABA" o "Córdoba, Argentina" en la
+# coordenada del lugar conocido más específico. Sin red ni servicios externos.
+
+import csv
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+GAZETTEER_PATH = Path(__file__).with_name("gazetteer_ar.csv")
+
+
+class Place(NamedTuple):
+    nombre: str
+    provincia: str
+    latitud: float
+    longitud: float
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin acentos ni puntuación, espacios simples."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+@lru_cache(maxsize=1)
+def _index() -> Dict[str, Place]:
+    index: Dict[str, Place] = {}
+    with GAZETTEER_PATH.open(encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            place = Place(row["nombre"], row["provincia"], float(row["latitud"]), float(row["longitud"]))
+            names = [row["nombre"]] + [alias for alias in (row["alias"] or "").split("|") if alias]
+            for name in names:
+                # El primer lugar con un nombre gana (barrio antes que homónimos más lejanos)
+                index.setdefault(normalize(name), place)
+    return index
+
+
+def geocode(localizacion: Optional[str]) -> Optional[Place]:
+    """
+    Busca las partes de la localización (separadas por coma) de la más específica a la
+    más general: "Palermo, CABA, Argentina" -> Palermo. Devuelve None si no reconoce nada.
+    """
+    if not localizacion:
+        return None
+    index = _index()
+    for part in [localizacion] + localizacion.split(","):
+        place = index.get(normalize(part))
+        if place is not None:
+            return place
+    return None
@@ -0,0 +1,81 @@
+# backend/app/geo/geohash.py
+#
+# Geohash: cada carácter agrega 5 bits alternando longitud y latitud, así que puntos
+# cercanos comparten prefijo. Una búsqueda por radio se resuelve con la celda del
+# centro y sus 8 vecinas (consultas por prefijo sobre un índice btree) y luego se
+# filtra/ordena por distancia real solo sobre esos candidatos.
+
+import math
+from typing import List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # ~4.8 m x 4.8 m: la precisión guardada en Negocio.geohash
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # los bits pares son de longitud
+    while len(chars) < precision:
+        value_range, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            value_range[0] = mid
+        else:
+            bits <<= 1
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """(alto en grados de latitud, ancho en grados de longitud) de una celda."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def precision_for_radius(lat: float, radius_km: float) -> int:
+    """
+    Mayor precisión cuya celda es al menos tan alta y ancha como el radio: así la celda
+    del centro y sus 8 vecinas cubren todo el círculo de búsqueda.
+    """
+    radius_lat = radius_km / KM_PER_DEGREE_LAT
+    radius_lon = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lon = cell_size_degrees(precision)
+        if cell_lat >= radius_lat and cell_lon >= radius_lon:
+            return precision
+    return 1
+
+
+def cells_covering(lat: float, lon: float, radius_km: float) -> List[str]:
+    """Prefijos de geohash (celda del centro + vecinas) que cubren el radio alrededor del punto."""
+    precision = precision_for_radius(lat, radius_km)
+    cell_lat, cell_lon = cell_size_degrees(precision)
+    cells = set()
+    for dlat in (-cell_lat, 0.0, cell_lat):
+        for dlon in (-cell_lon, 0.0, cell_lon):
+            neighbour_lat = max(-90.0, min(90.0, lat + dlat))
+            neighbour_lon = (lon + dlon + 180.0) % 360.0 - 180.0  # antimeridiano
+            cells.add(encode(neighbour_lat, neighbour_lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
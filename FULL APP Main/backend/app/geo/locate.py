@@ -0,0 +1,24 @@
+# backend/app/geo/locate.py
+#
+# Coordenadas de un Negocio al crearlo/actualizarlo: las explícitas (latitud/longitud)
+# tienen prioridad; si no hay, se geocodifica localizacion_geografica con el gazetteer.
+
+from app.geo.gazetteer import geocode
+from app.geo.geohash import encode
+
+
+def locate_business(negocio, coordinates_given: bool, location_changed: bool) -> bool:
+    """
+    Completa latitud/longitud/geohash de `negocio`. Devuelve True si las coordenadas quedaron
+    definidas. Si cambió el texto de la localización y no se dieron coordenadas, se
+    reemplazan las anteriores (o se borran si el gazetteer no reconoce el lugar).
+    """
+    if not coordinates_given and location_changed:
+        place = geocode(negocio.localizacion_geografica)
+        negocio.latitud = place.latitud if place else None
+        negocio.longitud = place.longitud if place else None
+    if negocio.latitud is not None and negocio.longitud is not None:
+        negocio.geohash = encode(negocio.latitud, negocio.longitud)
+        return True
+    negocio.geohash = None
+    return False
@@ -1,5 +1,9 @@
 from fastapi import FastAPI
-from app.database import Base, engine # Import Base and engine from database.py
+from fastapi.responses import ORJSONResponse
+from app.database import engine, async_engine # Import engines from database.py
+from app.migrations import check_schema_version, upgrade as upgrade_schema
+from app.core.config import settings
+from app.ai import gemini_client
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import auth_router, user_router
 from app.routers import business_router
@@ -10,59 +14,37 @@ from app.routers import public_ai_router
 from app.routers import plugin_router # Import the new plugin router
 from app.routers import venta_router # Import the new venta router
 from app.routers import niam_router # Import the new niam router
+from app.routers import internal_router # Internal operational metrics
 
 # Create the FastAPI application instance
 app = FastAPI(
     title="SOUP Emprendimientos API",
     description="API para la gestión de micro-emprendimientos y freelancers, incluyendo tiendas virtuales, productos, servicios, gestión de encargos e integración con IA.",
     version="0.1.0",
+    # orjson para los endpoints que devuelven objetos; los listados serializan en bloque
+    # y negocian JSON/MessagePack por su cuenta (app/core/serialization.py)
+    default_response_class=ORJSONResponse,
 )
 
-# Function to create database tables
-# IMPORTANT: Ensure models are imported/loaded BEFORE calling Base.metadata.create_all
-# Importing app.models here ensures that all declarative models are registered with Base.metadata
-def create_db_tables():
-    # Importing models here ensures that all model classes (like Usuario) are
-    # defined and registered with Base.metadata before create_all is called.
-    import app.models
-    Base.metadata.create_all(bind=engine)
-
 # Startup event handler for FastAPI application
+# El esquema lo gestionan las migraciones versionadas (app/migrations): al arrancar solo
+# se compara la versión aplicada con la esperada, en una única consulta.
 @app.on_event("startup")
 async def startup_event():
-    print("Creating database tables...")
-    print(f"SQLAlchemy Engine URL: {engine.url}") # Debug line
-    
-    # Forzar la recarga de enums limpiando el cache de SQLAlchemy
-    from sqlalchemy import inspect
-    inspector = inspect(engine)
-    # Limpiar el cache forzando una nueva conexión
-    inspector.get_table_names()
-    
-    # Limpiar completamente el cache de tipos de enum
-    from sqlalchemy import event
-    from sqlalchemy.engine import Engine
-    
-    @event.listens_for(Engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        # Forzar la recarga de metadatos
-        if hasattr(dbapi_connection, 'execute'):
-            dbapi_connection.execute("SELECT 1")
-    
-    # Forzar la recarga de metadatos
-    from sqlalchemy import MetaData
-    metadata = MetaData()
-    metadata.reflect(bind=engine)
-    
-    # Limpiar el cache de tipos de enum específicamente
-    from sqlalchemy import types
-    if hasattr(types, '_type_map'):
-        types._type_map.clear()
-    
-    print("Cache de SQLAlchemy limpiado.")
-    
-    create_db_tables() # Call the function to create database tables
-    print("Database tables created.")
+    if settings.DB_AUTO_MIGRATE:
+        applied = upgrade_schema(engine)
+        if applied:
+            print(f"Migraciones aplicadas hasta la versión {applied[-1].version}.")
+    version = check_schema_version(engine)
+    print(f"Esquema de base de datos en versión {version}.")
+
+# Shutdown event handler: release pooled asyncpg connections in async mode and the
+# keep-alive connections of the LLM provider client
+@app.on_event("shutdown")
+async def shutdown_event():
+    if async_engine is not None:
+        await async_engine.dispose()
+    await gemini_client.aclose()
 
 # Configure CORS middleware
 origins = [
@@ -99,3 +81,9 @@ app.include_router(public_ai_router.router, tags=["AI Recomendaciones"])
 app.include_router(plugin_router.router, tags=["Plugins"])
 app.include_router(venta_router.router, tags=["Ventas & POS"])
 app.include_router(niam_router.router, tags=["Panadería Ñiam"])
+app.include_router(internal_router.router, tags=["Internal"], include_in_schema=False)
+
+# Async data layer (AsyncSession + asyncpg), mounted side by side with the sync endpoints
+if settings.DB_ASYNC_ENABLED:
+    from app.routers import async_router
+    app.include_router(async_router.router, prefix=settings.ASYNC_API_PREFIX)
@@ -0,0 +1,15 @@
+# backend/app/migrations/__init__.py
+#
+# Migraciones versionadas del esquema. Uso desde backend/:
+#   python -m app.migrations upgrade     # aplica las migraciones pendientes
+#   python -m app.migrations current     # muestra la versión aplicada y la esperada
+
+from app.migrations.runner import (
+    SchemaVersionError,
+    check_schema_version,
+    create_index_concurrently,
+    current_version,
+    head_version,
+    load_migrations,
+    upgrade,
+)
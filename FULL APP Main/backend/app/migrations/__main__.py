@@ -0,0 +1,35 @@
+# backend/app/migrations/__main__.py
+
+import argparse
+import logging
+
+from app.database import engine
+from app.migrations.runner import current_version, head_version, load_migrations, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="Migraciones versionadas de SOUP")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="Aplica las migraciones pendientes")
+    upgrade_parser.add_argument("--target", type=int, default=None, help="Versión máxima a aplicar")
+    subparsers.add_parser("current", help="Muestra la versión aplicada y la esperada")
+    subparsers.add_parser("list", help="Lista las migraciones conocidas")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, target=args.target)
+        if applied:
+            print(f"✅ {len(applied)} migración(es) aplicadas. Versión actual: {applied[-1].version}")
+        else:
+            print(f"✅ Esquema al día (versión {current_version(engine)}).")
+    elif args.command == "current":
+        print(f"Versión aplicada: {current_version(engine)}  |  Versión esperada: {head_version()}")
+    elif args.command == "list":
+        for migration in load_migrations():
+            print(f"{migration.version:04d}  {migration.description}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# backend/app/migrations/runner.py
+#
+# Motor de migraciones versionadas. Cada módulo de app/migrations/versions se llama
+# vNNNN_<descripcion>.py y define VERSION (int), DESCRIPTION (str) y upgrade(conn).
+# La versión aplicada se guarda en la tabla schema_version; cada migración corre en su
+# propia transacción junto con el registro de su versión.
+#
+# Una migración que define TRANSACTIONAL = False (p. ej. un backfill por lotes sobre una
+# tabla en uso) recibe una conexión sin transacción envolvente y hace commit ella misma;
+# su versión se registra al terminar. Debe poder reanudarse si se interrumpe a mitad.
+# Los índices sobre tablas en uso se crean así, con create_index_concurrently: un
+# CREATE INDEX normal bloquea las escrituras de la tabla mientras se construye.
+
+import importlib
+import logging
+import pkgutil
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import ProgrammingError
+
+from app.migrations import versions
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+# Clave arbitraria para pg_advisory_lock: evita que dos instancias que arrancan a la
+# vez (autoscaling) apliquen las mismas migraciones en paralelo.
+MIGRATION_LOCK_KEY = 0x50550001
+
+
+def create_index_concurrently(conn: Connection, name: str, definition: str) -> None:
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS `name` `definition` (p. ej. "ON productos (precio, id)"),
+    para migraciones con TRANSACTIONAL = False. No bloquea las escrituras, pero no puede
+    correr dentro de una transacción: la conexión pasa a autocommit. Si un intento anterior
+    se interrumpió, el índice quedó inválido (IF NOT EXISTS lo daría por creado): se borra
+    y se vuelve a construir.
+    """
+    if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        # El nivel de aislamiento solo se puede cambiar sin transacción en curso
+        conn.commit()
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+    invalid = conn.execute(
+        text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace AND NOT i.indisvalid
+        """),
+        {"name": name},
+    ).scalar()
+    if invalid:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+
+
+class SchemaVersionError(RuntimeError):
+    """La base de datos no está en la versión de esquema que espera el código."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+    module: str
+    transactional: bool = True
+
+
+def load_migrations() -> List[Migration]:
+    """Descubre y ordena las migraciones del paquete app.migrations.versions."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        if not module_info.name.startswith("v"):
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(
+            version=module.VERSION,
+            description=module.DESCRIPTION,
+            upgrade=module.upgrade,
+            module=module_info.name,
+            transactional=getattr(module, "TRANSACTIONAL", True),
+        ))
+    migrations.sort(key=lambda m: m.version)
+
+    seen = set()
+    for migration in migrations:
+        if migration.version in seen:
+            raise ValueError(f"Versión de migración duplicada: {migration.version}")
+        seen.add(migration.version)
+    return migrations
+
+
+def head_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR NOT NULL,
+            applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+        )
+    """))
+
+
+def _record_version(conn: Connection, migration: Migration) -> None:
+    conn.execute(
+        text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) VALUES (:version, :description)"),
+        {"version": migration.version, "description": migration.description}
+    )
+
+
+def current_version(engine: Engine) -> Optional[int]:
+    """
+    Versión de esquema aplicada (una sola consulta). Devuelve None si la tabla
+    schema_version todavía no existe.
+    """
+    with engine.connect() as conn:
+        try:
+            return conn.execute(text(f"SELECT COALESCE(MAX(version), 0) FROM {SCHEMA_VERSION_TABLE}")).scalar()
+        except ProgrammingError:
+            return None
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """Aplica en orden las migraciones pendientes hasta `target` (por defecto la última)."""
+    migrations = load_migrations()
+    applied = []
+    with engine.connect() as lock_conn:
+        # El lock es de sesión: sin transacción abierta, que CREATE INDEX CONCURRENTLY
+        # (en otra conexión) no tenga que esperar a esta
+        lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            with engine.begin() as conn:
+                _ensure_version_table(conn)
+                done = set(conn.execute(text(f"SELECT version FROM {SCHEMA_VERSION_TABLE}")).scalars())
+
+            for migration in migrations:
+                if migration.version in done:
+                    continue
+                if target is not None and migration.version > target:
+                    break
+                logger.info("Aplicando migración %04d: %s", migration.version, migration.description)
+                if migration.transactional:
+                    with engine.begin() as conn:
+                        migration.upgrade(conn)
+                        _record_version(conn, migration)
+                else:
+                    with engine.connect() as conn:
+                        migration.upgrade(conn)
+                        conn.commit()
+                    with engine.begin() as conn:
+                        _record_version(conn, migration)
+                applied.append(migration)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            lock_conn.commit()
+    return applied
+
+
+def check_schema_version(engine: Engine) -> int:
+    """
+    Verificación de arranque: compara la versión aplicada con la última migración
+    conocida y lanza SchemaVersionError si la base de datos está atrasada.
+    """
+    expected = head_version()
+    current = current_version(engine)
+    if current is None or current < expected:
+        raise SchemaVersionError(
+            f"Esquema de base de datos en versión {current or 0}, se esperaba {expected}. "
+            "Ejecuta 'python -m app.migrations upgrade' desde backend/."
+        )
+    if current > expected:
+        logger.warning("El esquema (v%s) es más nuevo que el código (v%s).", current, expected)
+    return current
@@ -0,0 +1,6 @@
+# backend/app/migrations/versions/__init__.py
+#
+# Un módulo por migración: vNNNN_<descripcion>.py con VERSION, DESCRIPTION y upgrade(conn).
+# Las migraciones deben ser idempotentes (IF NOT EXISTS, comprobaciones previas): la
+# v0001 crea las tablas a partir de los modelos actuales en una base vacía, y las bases
+# creadas antes de este sistema llegan con parte del esquema ya aplicado.
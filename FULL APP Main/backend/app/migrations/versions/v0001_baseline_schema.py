@@ -0,0 +1,17 @@
+# backend/app/migrations/versions/v0001_baseline_schema.py
+#
+# Esquema base: crea las tablas (y sus tipos enum) que todavía no existan, a partir de
+# los modelos. Reemplaza al create_all que se ejecutaba en cada arranque y a
+# debugging/migrations/create_tables.py.
+
+from sqlalchemy.engine import Connection
+
+VERSION = 1
+DESCRIPTION = "Esquema base (tablas de los modelos)"
+
+
+def upgrade(conn: Connection) -> None:
+    import app.models  # noqa: F401  (registra los modelos en Base.metadata)
+    from app.database import Base
+
+    Base.metadata.create_all(bind=conn, checkfirst=True)
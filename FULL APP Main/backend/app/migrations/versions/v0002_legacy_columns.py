@@ -0,0 +1,117 @@
+# backend/app/migrations/versions/v0002_legacy_columns.py
+#
+# Cambios de columnas que antes se aplicaban a mano con los scripts de
+# debugging/migrations (migrate_to_new_models, migrate_add_*_fields, migrate_add_plugins,
+# migrate_add_tipo_negocio, migrate_rename_usuario_to_propietario, fix_product_columns,
+# fix_propietario_foreign_key) y backend/migrate_add_ai_fields.py.
+# En una base creada por la v0001 todo esto es un no-op.
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 2
+DESCRIPTION = "Columnas agregadas por los scripts de migración manuales"
+
+ADD_COLUMNS = {
+    "usuarios": [
+        ("hashed_password", "VARCHAR"),
+        ("is_active", "BOOLEAN DEFAULT TRUE"),
+        ("curriculum_vitae", "TEXT"),
+        ("plugins_activos", "VARCHAR[] DEFAULT '{}'"),
+        ("negocio_asignado_id", "UUID REFERENCES negocios(id)"),
+        ("fecha_contratacion", "DATE"),
+        ("salario", "FLOAT"),
+        ("horario_trabajo", "VARCHAR"),
+        ("permisos_especiales", "VARCHAR[]"),
+    ],
+    "negocios": [
+        ("rubro", "VARCHAR"),
+        ("localizacion_geografica", "VARCHAR"),
+        ("fotos_urls", "TEXT"),
+        ("calificacion_promedio", "FLOAT"),
+        ("total_calificaciones", "INTEGER"),
+        ("ventas_completadas", "INTEGER"),
+    ],
+    "productos": [
+        ("precio_venta", "FLOAT"),
+        ("margen_ganancia_sugerido", "FLOAT"),
+        ("precio_sugerido", "FLOAT"),
+        ("cogs", "FLOAT"),
+        ("margen_ganancia_real", "FLOAT"),
+        ("stock_terminado", "FLOAT DEFAULT 0.0"),
+        ("rating_promedio", "FLOAT DEFAULT 0.0"),
+        ("reviews_count", "INTEGER DEFAULT 0"),
+        ("calificacion_promedio", "FLOAT"),
+        ("total_calificaciones", "INTEGER"),
+        ("ventas_completadas", "INTEGER"),
+        ("categoria", "VARCHAR"),
+        ("codigo_lote", "VARCHAR"),
+        ("fecha_vencimiento", "DATE"),
+        ("fecha_produccion", "DATE"),
+        ("stock_minimo", "FLOAT DEFAULT 0.0"),
+        ("stock_maximo", "FLOAT"),
+        ("unidad_venta", "VARCHAR DEFAULT 'unidad'"),
+        ("es_perecedero", "BOOLEAN DEFAULT TRUE"),
+        ("tiempo_vida_util", "INTEGER"),
+        ("requiere_refrigeracion", "BOOLEAN DEFAULT FALSE"),
+        ("ingredientes", "VARCHAR[]"),
+        ("alergenos", "VARCHAR[]"),
+        ("calorias_por_porcion", "FLOAT"),
+        ("peso_porcion", "FLOAT"),
+        ("unidad_peso", "VARCHAR DEFAULT 'g'"),
+    ],
+    "producto_insumos": [
+        ("fecha_asociacion", "TIMESTAMP WITH TIME ZONE DEFAULT NOW()"),
+    ],
+}
+
+
+def _column_exists(conn: Connection, table: str, column: str) -> bool:
+    return conn.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column
+    """), {"table": table, "column": column}).first() is not None
+
+
+def _rename_usuario_id_to_propietario_id(conn: Connection, table: str) -> None:
+    has_usuario = _column_exists(conn, table, "usuario_id")
+    has_propietario = _column_exists(conn, table, "propietario_id")
+    if has_usuario and not has_propietario:
+        conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN usuario_id TO propietario_id"))
+    elif has_usuario and has_propietario:
+        conn.execute(text(f"UPDATE {table} SET propietario_id = usuario_id WHERE propietario_id IS NULL"))
+        conn.execute(text(f"ALTER TABLE {table} DROP COLUMN usuario_id"))
+
+
+def upgrade(conn: Connection) -> None:
+    # productos/negocios.usuario_id -> propietario_id (con su FK a usuarios)
+    for table in ("productos", "negocios"):
+        _rename_usuario_id_to_propietario_id(conn, table)
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.table_constraints
+                WHERE table_name = 'productos' AND constraint_type = 'FOREIGN KEY'
+                  AND constraint_name LIKE '%propietario%'
+            ) THEN
+                ALTER TABLE productos ADD CONSTRAINT productos_propietario_id_fkey
+                    FOREIGN KEY (propietario_id) REFERENCES usuarios(id);
+            END IF;
+        END $$;
+    """))
+
+    # negocios.tipo_negocio (enum businesstype)
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'businesstype') THEN
+                CREATE TYPE businesstype AS ENUM ('PRODUCTOS', 'SERVICIOS', 'AMBOS');
+            END IF;
+        END $$;
+    """))
+    conn.execute(text("ALTER TABLE negocios ADD COLUMN IF NOT EXISTS tipo_negocio businesstype NOT NULL DEFAULT 'PRODUCTOS'"))
+
+    for table, columns in ADD_COLUMNS.items():
+        for name, ddl in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {name} {ddl}"))
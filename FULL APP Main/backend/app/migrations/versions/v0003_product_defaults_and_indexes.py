@@ -0,0 +1,47 @@
+# backend/app/migrations/versions/v0003_product_defaults_and_indexes.py
+#
+# Defaults y NOT NULL de productos (fix_fecha_actualizacion_productos.sql,
+# migrate_fix_product_defaults.py) y los índices que creaban migrate_add_ventas_tables*
+# y migrate_add_niam_tables.
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 3
+DESCRIPTION = "Defaults de productos e índices de ventas/Ñiam"
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_ventas_negocio_id ON ventas(negocio_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ventas_fecha ON ventas(fecha_venta)",
+    "CREATE INDEX IF NOT EXISTS idx_detalles_venta_id ON detalles_venta(venta_id)",
+    "CREATE INDEX IF NOT EXISTS idx_carritos_negocio_id ON carritos_compra(negocio_id)",
+    "CREATE INDEX IF NOT EXISTS idx_productos_categoria ON productos(categoria)",
+    "CREATE INDEX IF NOT EXISTS idx_productos_fecha_vencimiento ON productos(fecha_vencimiento)",
+    "CREATE INDEX IF NOT EXISTS idx_recetas_negocio_id ON recetas(negocio_id)",
+    "CREATE INDEX IF NOT EXISTS idx_recetas_producto_id ON recetas(producto_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ingredientes_receta_id ON ingredientes_receta(receta_id)",
+    "CREATE INDEX IF NOT EXISTS idx_producciones_negocio_id ON producciones(negocio_id)",
+    "CREATE INDEX IF NOT EXISTS idx_producciones_fecha ON producciones(fecha_produccion)",
+    "CREATE INDEX IF NOT EXISTS idx_producciones_estado ON producciones(estado)",
+    "CREATE INDEX IF NOT EXISTS idx_horarios_pico_negocio_id ON horarios_pico(negocio_id)",
+    "CREATE INDEX IF NOT EXISTS idx_horarios_pico_dia ON horarios_pico(dia_semana)",
+    "CREATE INDEX IF NOT EXISTS idx_usuarios_rol ON usuarios(rol)",
+    "CREATE INDEX IF NOT EXISTS idx_usuarios_negocio_asignado ON usuarios(negocio_asignado_id)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text("UPDATE productos SET fecha_actualizacion = NOW() WHERE fecha_actualizacion IS NULL"))
+    conn.execute(text("ALTER TABLE productos ALTER COLUMN fecha_actualizacion SET DEFAULT NOW()"))
+
+    conn.execute(text("UPDATE productos SET rating_promedio = 0.0 WHERE rating_promedio IS NULL"))
+    conn.execute(text("UPDATE productos SET reviews_count = 0 WHERE reviews_count IS NULL"))
+    conn.execute(text("ALTER TABLE productos ALTER COLUMN rating_promedio SET DEFAULT 0.0"))
+    conn.execute(text("ALTER TABLE productos ALTER COLUMN rating_promedio SET NOT NULL"))
+    conn.execute(text("ALTER TABLE productos ALTER COLUMN reviews_count SET DEFAULT 0"))
+    conn.execute(text("ALTER TABLE productos ALTER COLUMN reviews_count SET NOT NULL"))
+
+    conn.execute(text("ALTER TABLE productos ALTER COLUMN propietario_id SET NOT NULL"))
+
+    for statement in INDEXES:
+        conn.execute(text(statement))
@@ -0,0 +1,13 @@
+# backend/app/migrations/versions/v0004_usuario_token_version.py
+#
+# Usuario.token_version: contador para revocar los tokens JWT emitidos (claim "tv").
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 4
+DESCRIPTION = "usuarios.token_version para revocación de tokens"
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text("ALTER TABLE usuarios ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0"))
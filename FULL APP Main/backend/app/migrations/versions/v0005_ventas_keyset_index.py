@@ -0,0 +1,19 @@
+# backend/app/migrations/versions/v0005_ventas_keyset_index.py
+#
+# Índice compuesto para el historial de ventas por negocio paginado por cursor
+# (negocio_id, fecha_venta, id). Reemplaza a idx_ventas_negocio_id, que queda cubierto.
+# Fuera de transacción (CONCURRENTLY): las ventas se siguen registrando mientras tanto.
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.migrations.runner import create_index_concurrently
+
+VERSION = 5
+DESCRIPTION = "Índice ventas(negocio_id, fecha_venta, id) para paginación por cursor"
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_concurrently(conn, "ix_ventas_negocio_fecha_id", "ON ventas (negocio_id, fecha_venta, id)")
+    conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS idx_ventas_negocio_id"))
@@ -0,0 +1,25 @@
+# backend/app/migrations/versions/v0006_productos_catalog_indexes.py
+#
+# Índices del catálogo público paginado (GET /public/products): filtros por negocio y
+# tipo, y los órdenes "recientes" y por precio con Producto.id como desempate.
+# Fuera de transacción (CONCURRENTLY): productos sigue aceptando escrituras mientras tanto.
+
+from sqlalchemy.engine import Connection
+
+from app.migrations.runner import create_index_concurrently
+
+VERSION = 6
+DESCRIPTION = "Índices de productos para el catálogo público paginado"
+TRANSACTIONAL = False
+
+INDEXES = [
+    ("ix_productos_negocio_fecha_id", "ON productos (negocio_id, fecha_creacion, id)"),
+    ("ix_productos_fecha_id", "ON productos (fecha_creacion, id)"),
+    ("ix_productos_precio_id", "ON productos (precio, id)"),
+    ("ix_productos_tipo_producto", "ON productos (tipo_producto)"),
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for name, definition in INDEXES:
+        create_index_concurrently(conn, name, definition)
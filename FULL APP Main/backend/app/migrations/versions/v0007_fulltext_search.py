@@ -0,0 +1,75 @@
+# backend/app/migrations/versions/v0007_fulltext_search.py
+#
+# Búsqueda de texto completo del marketplace público. Crea la configuración
+# es_unaccent (diccionario español sin acentos), una columna search_vector (tsvector)
+# en productos y negocios mantenida por triggers, su índice GIN y el backfill inicial.
+#
+# Pesos: A = nombre; B = descripcion (productos) / rubro (negocios);
+#        C = ingredientes (productos) / descripcion (negocios).
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 7
+DESCRIPTION = "Búsqueda de texto completo (tsvector + GIN) en productos y negocios"
+
+STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = pg_catalog.spanish);
+            ALTER TEXT SEARCH CONFIGURATION es_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+        END IF;
+    END
+    $$
+    """,
+    "ALTER TABLE productos ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "ALTER TABLE negocios ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION productos_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('es_unaccent', coalesce(NEW.nombre, '')), 'A') ||
+            setweight(to_tsvector('es_unaccent', coalesce(NEW.descripcion, '')), 'B') ||
+            setweight(to_tsvector('es_unaccent', coalesce(array_to_string(NEW.ingredientes, ' '), '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION negocios_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('es_unaccent', coalesce(NEW.nombre, '')), 'A') ||
+            setweight(to_tsvector('es_unaccent', coalesce(NEW.rubro, '')), 'B') ||
+            setweight(to_tsvector('es_unaccent', coalesce(NEW.descripcion, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS productos_search_vector_trigger ON productos",
+    """
+    CREATE TRIGGER productos_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF nombre, descripcion, ingredientes ON productos
+        FOR EACH ROW EXECUTE FUNCTION productos_search_vector_update()
+    """,
+    "DROP TRIGGER IF EXISTS negocios_search_vector_trigger ON negocios",
+    """
+    CREATE TRIGGER negocios_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF nombre, rubro, descripcion ON negocios
+        FOR EACH ROW EXECUTE FUNCTION negocios_search_vector_update()
+    """,
+    # Backfill: el UPDATE de una columna vigilada dispara el trigger
+    "UPDATE productos SET nombre = nombre WHERE search_vector IS NULL",
+    "UPDATE negocios SET nombre = nombre WHERE search_vector IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_productos_search_vector ON productos USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_negocios_search_vector ON negocios USING gin (search_vector)",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
@@ -0,0 +1,18 @@
+# backend/app/migrations/versions/v0008_fecha_actualizacion_indexes.py
+#
+# max(fecha_actualizacion) es la base del ETag / Last-Modified de los endpoints públicos
+# (app/core/http_cache.py); con estos índices se resuelve sin recorrer la tabla.
+# Fuera de transacción (CONCURRENTLY): no bloquea las escrituras mientras se construyen.
+
+from sqlalchemy.engine import Connection
+
+from app.migrations.runner import create_index_concurrently
+
+VERSION = 8
+DESCRIPTION = "Índices de fecha_actualizacion en productos y negocios para GET condicional"
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_concurrently(conn, "ix_productos_fecha_actualizacion", "ON productos (fecha_actualizacion)")
+    create_index_concurrently(conn, "ix_negocios_fecha_actualizacion", "ON negocios (fecha_actualizacion)")
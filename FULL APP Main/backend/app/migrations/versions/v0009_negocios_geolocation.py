@@ -0,0 +1,25 @@
+# backend/app/migrations/versions/v0009_negocios_geolocation.py
+#
+# Coordenadas opcionales de negocios y su geohash para búsquedas por cercanía
+# (/public/businesses/near). El índice usa varchar_pattern_ops para que las consultas
+# por prefijo (geohash LIKE 'abc%') lo aprovechen con cualquier collation.
+# Las coordenadas de los negocios existentes se completan con 'python -m app.geo backfill'.
+# Fuera de transacción: las columnas nuevas (nulables) se agregan en una transacción corta
+# y el índice se construye con CONCURRENTLY, sin bloquear las escrituras.
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.migrations.runner import create_index_concurrently
+
+VERSION = 9
+DESCRIPTION = "Latitud, longitud y geohash en negocios"
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text("ALTER TABLE negocios ADD COLUMN IF NOT EXISTS latitud DOUBLE PRECISION"))
+    conn.execute(text("ALTER TABLE negocios ADD COLUMN IF NOT EXISTS longitud DOUBLE PRECISION"))
+    conn.execute(text("ALTER TABLE negocios ADD COLUMN IF NOT EXISTS geohash VARCHAR(12)"))
+    conn.commit()
+    create_index_concurrently(conn, "ix_negocios_geohash", "ON negocios (geohash varchar_pattern_ops)")
@@ -0,0 +1,129 @@
+# backend/app/migrations/versions/v0010_negocios_fotos_urls_array.py
+#
+# negocios.fotos_urls pasa de TEXT (una lista serializada como JSON) a VARCHAR[], como
+# el resto de las listas del modelo (ingredientes, plugins_activos, ...). Así la lista
+# llega ya armada desde el driver y las lecturas no tienen que parsearla.
+#
+# Conversión en línea, sin bloquear la tabla mientras se copian los datos:
+#   1. Columna nueva fotos_urls_arr y un trigger que la mantiene al día con las
+#      escrituras de la versión anterior de la app mientras dura el backfill.
+#   2. Backfill por lotes de BATCH_SIZE filas, con commit por lote.
+#   3. En una transacción corta (con la tabla bloqueada): se completan las filas que
+#      falten, se borra la columna vieja y se renombra la nueva.
+# Si se interrumpe, volver a ejecutarla retoma el backfill donde quedó.
+#
+# Valores existentes: JSON de una lista -> sus elementos; NULL, vacío, JSON que no es
+# una lista o texto inválido -> {} (lo mismo que devolvía la conversión al leer).
+# También se aceptan literales de arreglo ('{a,b}'): es lo que guardaba un flush de la
+# lista que la conversión al leer dejaba asignada en la columna de texto.
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 10
+DESCRIPTION = "negocios.fotos_urls como VARCHAR[]"
+TRANSACTIONAL = False
+
+BATCH_SIZE = 1000
+
+_CONVERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION soup_fotos_urls_to_array(raw TEXT) RETURNS VARCHAR[]
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    parsed JSONB;
+BEGIN
+    IF raw IS NULL OR btrim(raw) = '' THEN
+        RETURN '{}';
+    END IF;
+    BEGIN
+        parsed := raw::jsonb;
+    EXCEPTION WHEN others THEN
+        parsed := NULL;
+    END;
+    IF parsed IS NOT NULL THEN
+        IF jsonb_typeof(parsed) <> 'array' THEN
+            RETURN '{}';
+        END IF;
+        RETURN ARRAY(
+            SELECT elem FROM jsonb_array_elements_text(parsed) AS elem WHERE elem IS NOT NULL
+        );
+    END IF;
+    BEGIN
+        RETURN array_remove(raw::varchar[], NULL);
+    EXCEPTION WHEN others THEN
+        RETURN '{}';
+    END;
+END
+$$
+"""
+
+_SYNC_FUNCTION = """
+CREATE OR REPLACE FUNCTION negocios_fotos_urls_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.fotos_urls_arr := soup_fotos_urls_to_array(NEW.fotos_urls);
+    RETURN NEW;
+END
+$$
+"""
+
+_BACKFILL_BATCH = """
+UPDATE negocios SET fotos_urls_arr = soup_fotos_urls_to_array(fotos_urls)
+WHERE id IN (
+    SELECT id FROM negocios WHERE fotos_urls_arr IS NULL LIMIT :batch_size FOR UPDATE SKIP LOCKED
+)
+"""
+
+
+def _column_type(conn: Connection, column: str):
+    return conn.execute(
+        text("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'negocios' AND column_name = :column
+        """),
+        {"column": column},
+    ).scalar()
+
+
+def _finish_column(conn: Connection) -> None:
+    conn.execute(text("ALTER TABLE negocios ALTER COLUMN fotos_urls SET DEFAULT '{}'"))
+    conn.execute(text("ALTER TABLE negocios ALTER COLUMN fotos_urls SET NOT NULL"))
+
+
+def upgrade(conn: Connection) -> None:
+    # Base creada desde los modelos actuales (v0001) o con el script viejo de
+    # debugging/migrations (TEXT[]): la columna ya es un arreglo
+    if _column_type(conn, "fotos_urls") == "ARRAY" and _column_type(conn, "fotos_urls_arr") is None:
+        conn.execute(text("UPDATE negocios SET fotos_urls = '{}' WHERE fotos_urls IS NULL"))
+        _finish_column(conn)
+        conn.commit()
+        return
+
+    # 1. Columna nueva + trigger de sincronización
+    conn.execute(text("ALTER TABLE negocios ADD COLUMN IF NOT EXISTS fotos_urls_arr VARCHAR[]"))
+    conn.execute(text(_CONVERT_FUNCTION))
+    conn.execute(text(_SYNC_FUNCTION))
+    conn.execute(text("DROP TRIGGER IF EXISTS negocios_fotos_urls_sync_trigger ON negocios"))
+    conn.execute(text("""
+        CREATE TRIGGER negocios_fotos_urls_sync_trigger
+            BEFORE INSERT OR UPDATE OF fotos_urls ON negocios
+            FOR EACH ROW EXECUTE FUNCTION negocios_fotos_urls_sync()
+    """))
+    conn.commit()
+
+    # 2. Backfill por lotes: cada lote bloquea solo sus filas y hace commit
+    while conn.execute(text(_BACKFILL_BATCH), {"batch_size": BATCH_SIZE}).rowcount:
+        conn.commit()
+    conn.commit()
+
+    # 3. Intercambio de columnas. SET NOT NULL recorre la tabla con el bloqueo tomado,
+    # pero ya no hay filas por convertir.
+    conn.execute(text("LOCK TABLE negocios IN ACCESS EXCLUSIVE MODE"))
+    conn.execute(text("UPDATE negocios SET fotos_urls_arr = soup_fotos_urls_to_array(fotos_urls) WHERE fotos_urls_arr IS NULL"))
+    conn.execute(text("DROP TRIGGER negocios_fotos_urls_sync_trigger ON negocios"))
+    conn.execute(text("ALTER TABLE negocios DROP COLUMN fotos_urls"))
+    conn.execute(text("ALTER TABLE negocios RENAME COLUMN fotos_urls_arr TO fotos_urls"))
+    _finish_column(conn)
+    conn.execute(text("DROP FUNCTION negocios_fotos_urls_sync()"))
+    conn.execute(text("DROP FUNCTION soup_fotos_urls_to_array(TEXT)"))
+    conn.commit()
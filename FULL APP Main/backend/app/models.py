@@ -1,7 +1,7 @@
 # backend/app/models.py
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text, Enum, ARRAY, Date
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text, Enum, ARRAY, Date, Index
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from uuid import uuid4
@@ -79,6 +79,9 @@ class Usuario(Base):
     horario_trabajo: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # "8:00-16:00", etc.
     permisos_especiales: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), nullable=True)  # Lista de permisos específicos
 
+    # Versión de los tokens emitidos (claim "tv"): incrementarla revoca todos los tokens vigentes
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     # Relaciones
     negocios: Mapped[List["Negocio"]] = relationship(
         "Negocio",
@@ -104,13 +107,19 @@ class Negocio(Base):
     tipo_negocio: Mapped[BusinessType] = mapped_column(Enum(BusinessType), nullable=False)
     rubro: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     localizacion_geografica: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    fotos_urls: Mapped[Optional[List[str]]] = mapped_column(Text, nullable=True)  # Se almacenará como JSON
+    # Coordenadas opcionales (explícitas o geocodificadas desde localizacion_geografica)
+    latitud: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitud: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    geohash: Mapped[Optional[str]] = mapped_column(String(12), nullable=True)  # Ver app/geo/geohash.py
+    fotos_urls: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=False, default=list, server_default="{}")
     fecha_creacion: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     fecha_actualizacion: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     # Nuevos campos para IA
     calificacion_promedio: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     total_calificaciones: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     ventas_completadas: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Búsqueda de texto completo: lo mantiene un trigger (migración v0007), no el ORM
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, nullable=True, deferred=True)
 
     # Relaciones
     propietario: Mapped["Usuario"] = relationship(
@@ -127,6 +136,12 @@ class Negocio(Base):
         overlaps="producto_publicitado" # Añadido overlaps
     )
 
+    __table_args__ = (
+        Index("ix_negocios_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_negocios_fecha_actualizacion", "fecha_actualizacion"),
+        Index("ix_negocios_geohash", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+    )
+
 
 class Producto(Base):
     __tablename__ = "productos"
@@ -170,12 +185,24 @@ class Producto(Base):
     calorias_por_porcion: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     peso_porcion: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     unidad_peso: Mapped[Optional[str]] = mapped_column(String, nullable=True, default="g")  # g, kg, etc.
+    # Búsqueda de texto completo: lo mantiene un trigger (migración v0007), no el ORM
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, nullable=True, deferred=True)
 
     # Relaciones
     propietario: Mapped["Usuario"] = relationship("Usuario", back_populates="productos")
     negocio: Mapped["Negocio"] = relationship("Negocio", back_populates="productos")
     insumos_asociados: Mapped[List["ProductoInsumo"]] = relationship("ProductoInsumo", back_populates="producto", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Catálogo público: filtros y órdenes con Producto.id como desempate
+        Index("ix_productos_negocio_fecha_id", "negocio_id", "fecha_creacion", "id"),
+        Index("ix_productos_fecha_id", "fecha_creacion", "id"),
+        Index("ix_productos_precio_id", "precio", "id"),
+        Index("ix_productos_tipo_producto", "tipo_producto"),
+        Index("ix_productos_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_productos_fecha_actualizacion", "fecha_actualizacion"),
+    )
+
 
 class Insumo(Base):
     __tablename__ = "insumos"
@@ -227,6 +254,10 @@ class Publicidad(Base):
 
 class Venta(Base):
     __tablename__ = "ventas"
+    __table_args__ = (
+        # Historial por negocio paginado por cursor (fecha_venta, id)
+        Index("ix_ventas_negocio_fecha_id", "negocio_id", "fecha_venta", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4, unique=True, nullable=False)
     negocio_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("negocios.id"), nullable=False)
@@ -0,0 +1,274 @@
+# backend/app/routers/async_router.py
+#
+# Endpoints asíncronos (AsyncSession + asyncpg) equivalentes a los endpoints
+# síncronos más usados. Se montan bajo settings.ASYNC_API_PREFIX solo cuando
+# settings.DB_ASYNC_ENABLED es True, de modo que ambos modos conviven y se pueden
+# comparar con la misma carga (ej. GET /products/me vs GET /async/products/me).
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from app.database import get_async_db
+from app.dependencies import get_current_user_async, get_current_claims_async, authorize_negocio_async, is_negocio_member
+from app.models import Usuario, UserTier, Negocio, ProductType
+from app.schemas import (
+    TokenData, ProductoCreate, ProductoResponse, NegocioResponse, InsumoResponse, UsuarioResponse,
+    VentaCreate, VentaResponse, DetalleVentaCreate,
+    CarritoCompraCreate, CarritoCompraResponse, ItemCarritoCreate, ItemCarritoResponse
+)
+from app.crud.aio import product as crud_product
+from app.crud.aio import business as crud_business
+from app.crud.aio import insumo as crud_insumo
+from app.crud.aio import venta as crud_venta
+from app.routers.product_router import _calculate_margen_ganancia_real
+from app.core.pagination import decode_datetime_id_cursor, set_next_cursor, approximate_count_async, set_total_count
+
+router = APIRouter()
+
+def _to_producto_response(db_product) -> ProductoResponse:
+    response_data = ProductoResponse.model_validate(db_product)
+    response_data.margen_ganancia_real = _calculate_margen_ganancia_real(db_product)
+    return response_data
+
+# Como en product_router, solo el propietario crea productos; ventas y carritos admiten
+# también al empleado asignado (authorize_negocio_async / is_negocio_member)
+async def _get_owned_negocio(db: AsyncSession, negocio_id: UUID, user_id: UUID) -> Optional[Negocio]:
+    result = await db.execute(
+        select(Negocio).where(and_(Negocio.id == negocio_id, Negocio.propietario_id == user_id))
+    )
+    return result.scalars().first()
+
+# --- Perfil ---
+
+@router.get("/profile/me", response_model=UsuarioResponse, tags=["Async"])
+async def get_current_user_profile(current_user: Usuario = Depends(get_current_user_async)):
+    return current_user
+
+# --- Negocios ---
+
+@router.get("/businesses/me", response_model=List[NegocioResponse], tags=["Async"])
+async def get_my_businesses(
+    current_user: Usuario = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await crud_business.get_businesses_by_user_id(db, user_id=current_user.id)
+
+# --- Insumos ---
+
+@router.get("/insumos/me", response_model=List[InsumoResponse], tags=["Async"])
+async def get_my_insumos(
+    current_user: Usuario = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await crud_insumo.get_all_insumos_by_user_id(db, user_id=current_user.id)
+
+# --- Productos ---
+
+@router.post("/products/", response_model=ProductoResponse, status_code=status.HTTP_201_CREATED, tags=["Async"])
+async def create_product(
+    product: ProductoCreate,
+    current_user: Usuario = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user.tipo_tier not in [UserTier.MICROEMPRENDIMIENTO, UserTier.FREELANCER]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only micro-entrepreneurs and freelancers can create products/services."
+        )
+    if not await _get_owned_negocio(db, product.negocio_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Business not found or does not belong to the current user."
+        )
+    try:
+        db_product = await crud_product.create_product(db, propietario_id=current_user.id, product=product)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _to_producto_response(db_product)
+
+@router.get("/products/me", response_model=List[ProductoResponse], tags=["Async"])
+async def get_all_my_products(
+    current_user: Usuario = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    products = await crud_product.get_all_products_by_user_id(db, propietario_id=current_user.id)
+    return [_to_producto_response(p) for p in products]
+
+@router.get("/products/{product_id}", response_model=ProductoResponse, tags=["Async"])
+async def get_product(
+    product_id: UUID,
+    current_user: Usuario = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_product = await crud_product.get_product_by_id(db, product_id=product_id)
+    if not db_product:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product/Service not found.")
+    if db_product.propietario_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this product/service.")
+    return _to_producto_response(db_product)
+
+# --- Ventas & POS ---
+
+@router.post("/ventas/", response_model=VentaResponse, tags=["Async"])
+async def crear_venta(
+    venta_data: VentaCreate,
+    claims: TokenData = Depends(get_current_claims_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Crea una nueva venta (POS)"""
+    await authorize_negocio_async(db, claims, venta_data.negocio_id)
+    try:
+        return await crud_venta.create_venta(db, venta_data, claims.user_uuid)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error al crear la venta: {str(e)}"
+        )
+
+@router.get("/ventas/{venta_id}", response_model=VentaResponse, tags=["Async"])
+async def obtener_venta(
+    venta_id: UUID,
+    claims: TokenData = Depends(get_current_claims_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtiene una venta específica"""
+    venta = await crud_venta.get_venta(db, venta_id)
+    if not venta:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Venta no encontrada")
+    if not is_negocio_member(claims, venta.negocio):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos para ver esta venta")
+    return venta
+
+@router.get("/ventas/negocio/{negocio_id}", response_model=List[VentaResponse], tags=["Async"])
+async def obtener_ventas_negocio(
+    negocio_id: UUID,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    claims: TokenData = Depends(get_current_claims_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtiene todas las ventas de un negocio"""
+    await authorize_negocio_async(db, claims, negocio_id)
+    ventas, next_cursor = await crud_venta.get_ventas_page(db, negocio_id, limit, decode_datetime_id_cursor(cursor))
+    set_next_cursor(response, next_cursor)
+    return ventas
+
+@router.post("/ventas/carrito/", response_model=CarritoCompraResponse, tags=["Async"])
+async def crear_carrito(
+    carrito_data: CarritoCompraCreate,
+    claims: TokenData = Depends(get_current_claims_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Crea un nuevo carrito de compras"""
+    await authorize_negocio_async(db, claims, carrito_data.negocio_id)
+    return await crud_venta.create_carrito(db, carrito_data)
+
+@router.post("/ventas/carrito/{carrito_id}/items/", response_model=ItemCarritoResponse, tags=["Async"])
+async def agregar_item_carrito(
+    carrito_id: UUID,
+    item_data: ItemCarritoCreate,
+    claims: TokenData = Depends(get_current_claims_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Añade un item al carrito"""
+    carrito = await crud_venta.get_carrito(db, carrito_id)
+    if not carrito:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Carrito no encontrado")
+    if not is_negocio_member(claims, carrito.negocio):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos para modificar este carrito")
+    try:
+        return await crud_venta.add_item_to_carrito(db, carrito_id, item_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/ventas/carrito/{carrito_id}/finalizar", response_model=VentaResponse, tags=["Async"])
+async def finalizar_compra(
+    carrito_id: UUID,
+    metodo_pago: str = Query(..., description="Método de pago"),
+    descuento: float = Query(0.0, ge=0.0, description="Descuento total"),
+    impuestos: float = Query(0.0, ge=0.0, description="Impuestos totales"),
+    notas: Optional[str] = Query(None, description="Notas adicionales"),
+    claims: TokenData = Depends(get_current_claims_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Convierte un carrito en una venta"""
+    carrito = await crud_venta.get_carrito(db, carrito_id)
+    if not carrito:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Carrito no encontrado")
+    if not is_negocio_member(claims, carrito.negocio):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos para finalizar este carrito")
+    if not carrito.items:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El carrito está vacío")
+
+    subtotal = sum(item.precio_unitario * item.cantidad for item in carrito.items)
+    venta_data = VentaCreate(
+        negocio_id=carrito.negocio_id,
+        cliente_id=carrito.cliente_id,
+        subtotal=subtotal,
+        descuento=descuento,
+        impuestos=impuestos,
+        total=subtotal - descuento + impuestos,
+        metodo_pago=metodo_pago,
+        notas=notas,
+        detalles=[
+            DetalleVentaCreate(
+                producto_id=item.producto_id,
+                cantidad=item.cantidad,
+                precio_unitario=item.precio_unitario,
+                descuento_unitario=0.0  # Los descuentos se aplican al total
+            )
+            for item in carrito.items
+        ]
+    )
+
+    # El carrito se desactiva en la misma transacción que crea la venta
+    carrito.activo = False
+    try:
+        return await crud_venta.create_venta(db, venta_data, claims.user_uuid)
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error al finalizar la compra: {str(e)}"
+        )
+
+# --- Listados públicos ---
+
+@router.get("/public/businesses", response_model=List[NegocioResponse], tags=["Async"])
+async def get_all_public_businesses(db: AsyncSession = Depends(get_async_db)):
+    return await crud_business.get_all_businesses(db)
+
+@router.get("/public/products", response_model=List[ProductoResponse], tags=["Async"])
+async def get_all_public_products(
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=100),
+    negocio_id: Optional[UUID] = None,
+    tipo_producto: Optional[ProductType] = None,
+    categoria: Optional[str] = None,
+    precio_min: Optional[float] = Query(None, ge=0),
+    precio_max: Optional[float] = Query(None, ge=0),
+    sort: Literal["recientes", "precio_asc", "precio_desc", "nombre", "rating"] = "recientes",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Same page, filters and X-Total-Count as the sync GET /public/products."""
+    if precio_min is not None and precio_max is not None and precio_min > precio_max:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="precio_min cannot be greater than precio_max."
+        )
+    stmt = crud_product.select_public_products(
+        negocio_id=negocio_id,
+        tipo_producto=tipo_producto,
+        categoria=categoria,
+        precio_min=precio_min,
+        precio_max=precio_max,
+    )
+    filtered = any(value is not None for value in (negocio_id, tipo_producto, categoria, precio_min, precio_max))
+    total, approximate = await approximate_count_async(db, stmt, "productos", filtered=filtered)
+    set_total_count(response, total, approximate)
+    return await crud_product.get_public_products_page(db, stmt, sort=sort, offset=(page - 1) * page_size, limit=page_size)
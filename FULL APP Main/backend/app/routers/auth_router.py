@@ -1,17 +1,27 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm # For form-data login
 
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas import UsuarioCreate, Token, UsuarioResponse # Import UsuarioResponse for registration
 from app.crud import user as crud_user # Alias to avoid name conflict with 'user' variable
-from app.auth import verify_password, create_access_token
+from app.crud.business import get_business_ids_by_user_id
+from app.auth import verify_and_update_password_async, create_access_token, build_user_claims
 from app.core.config import settings
 
 # Create an API router specifically for authentication related endpoints
 router = APIRouter()
 
+def _login_claims(db: Session, user, new_hash) -> dict:
+    """Sync DB work after a successful login: optional rehash and the token claims."""
+    # Transparent rehash when BCRYPT_ROUNDS changed since the hash was created
+    if new_hash:
+        crud_user.update_password_hash(db, user, new_hash)
+    # Versioned claims (role, tenant and owned businesses) so role/ownership checks need no DB access
+    return build_user_claims(user, get_business_ids_by_user_id(db, user.id))
+
 @router.post("/register", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
 def register_user(user: UsuarioCreate, db: Session = Depends(get_db)):
     """
@@ -49,8 +59,9 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     Raises:
         HTTPException 401: If authentication fails (invalid credentials).
     """
-    # Retrieve the user from the database by their email (username)
-    user = crud_user.get_user_by_email(db, email=form_data.username)
+    # Retrieve the user from the database by their email (username).
+    # The sync Session runs in the threadpool so the event loop is not blocked.
+    user = await run_in_threadpool(crud_user.get_user_by_email, db, email=form_data.username)
     if not user:
         # If user not found, raise 401 Unauthorized exception
         raise HTTPException(
@@ -59,8 +70,10 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Verify the provided password against the hashed password stored in the database
-    if not verify_password(form_data.password, user.hashed_password):
+    # Verify the provided password against the hashed password stored in the database.
+    # bcrypt runs in the dedicated hashing executor so the event loop is not blocked.
+    password_ok, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not password_ok:
         # If passwords do not match, raise 401 Unauthorized exception
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -69,10 +82,8 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         )
 
     # If authentication is successful, create an access token
+    claims = await run_in_threadpool(_login_claims, db, user, new_hash)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"user_id": str(user.id), "email": user.email, "tipo_tier": user.tipo_tier.value}, # Include user_id and email in token
-        expires_delta=access_token_expires
-    )
+    access_token = create_access_token(data=claims, expires_delta=access_token_expires)
     # Return the access token and token type
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1,6 +1,7 @@
 # backend/app/routers/business_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List
 import uuid
@@ -8,11 +9,14 @@ import uuid
 from app.database import get_db
 from app.schemas import NegocioCreate, NegocioUpdate, NegocioResponse, UsuarioResponse # Importa los esquemas
 from app.crud import business as crud_business
+from app.core.serialization import serialized_response
 from app.dependencies import get_current_user
 
 # Create an API router specifically for business-related endpoints
 router = APIRouter()
 
+_negocios_adapter = TypeAdapter(List[NegocioResponse])
+
 @router.post("/", response_model=NegocioResponse, status_code=status.HTTP_201_CREATED)
 def create_business(
     business: NegocioCreate,
@@ -32,6 +36,7 @@ def create_business(
 
 @router.get("/me", response_model=List[NegocioResponse])
 def get_my_businesses(
+    request: Request,
     current_user: UsuarioResponse = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -43,7 +48,8 @@ def get_my_businesses(
     Returns:
         A list of businesses owned by the current user.
     """
-    return crud_business.get_businesses_by_user_id(db, user_id=current_user.id)
+    businesses = crud_business.get_businesses_by_user_id(db, user_id=current_user.id)
+    return serialized_response(request, _negocios_adapter, businesses)
 
 @router.get("/{business_id}", response_model=NegocioResponse)
 def get_business(
@@ -0,0 +1,82 @@
+# backend/app/routers/internal_router.py
+#
+# Endpoints internos de operación (métricas). No forman parte de la API pública:
+# requieren el header X-Internal-Token == settings.INTERNAL_METRICS_TOKEN, o DEBUG=True
+# si no se configuró un token.
+
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.core.config import settings
+from app.core.pool_metrics import pool_metrics, replica_pool_metrics
+from app.core.principal_cache import principal_cache, token_version_cache
+from app.core.business_binding import niam_business_cache
+from app.core.response_cache import response_cache
+from app.ai import catalog_index, gemini_client, recommendation_cache
+from app.database import engine, replica_engine
+
+def verify_internal_access(x_internal_token: Optional[str] = Header(None)) -> None:
+    """Dependencia que restringe el acceso a los endpoints internos."""
+    if settings.INTERNAL_METRICS_TOKEN:
+        if x_internal_token and secrets.compare_digest(x_internal_token, settings.INTERNAL_METRICS_TOKEN):
+            return
+    elif settings.DEBUG:
+        return
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+router = APIRouter(prefix="/internal", dependencies=[Depends(verify_internal_access)])
+
+@router.get("/pool")
+def get_pool_metrics():
+    """Estado y contadores del pool de conexiones de la base de datos principal."""
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            "null_pool": settings.DB_USE_NULLPOOL,
+        },
+        "primary": pool_metrics.snapshot(engine.pool),
+        "replica": replica_pool_metrics.snapshot(replica_engine.pool) if replica_engine is not None else None,
+    }
+
+@router.post("/pool/reset", status_code=status.HTTP_204_NO_CONTENT)
+def reset_pool_metrics():
+    """Reinicia los contadores acumulados (útil antes de una prueba de carga)."""
+    pool_metrics.reset()
+    replica_pool_metrics.reset()
+
+@router.get("/caches")
+def get_cache_metrics():
+    """Aciertos/fallos de los caches en memoria de este proceso."""
+    return {
+        "principal": principal_cache.stats(),
+        "token_version": token_version_cache.stats(),
+        "niam_business": niam_business_cache.stats(),
+        "public_responses": response_cache.stats(),
+        "ai_catalog": catalog_index.stats(),
+        "ai_recommendations": recommendation_cache.stats(),
+    }
+
+@router.post("/caches/reset", status_code=status.HTTP_204_NO_CONTENT)
+def reset_cache_metrics():
+    """Reinicia los contadores de los caches (no vacía su contenido)."""
+    principal_cache.reset_stats()
+    token_version_cache.reset_stats()
+    niam_business_cache.reset_stats()
+    response_cache.reset_stats()
+    recommendation_cache.reset_stats()
+
+@router.get("/ai/provider")
+def get_ai_provider_metrics():
+    """Estado del circuit breaker y contadores del cliente del proveedor del modelo."""
+    return gemini_client.stats()
+
+@router.post("/ai/provider/reset", status_code=status.HTTP_204_NO_CONTENT)
+def reset_ai_provider_metrics():
+    """Reinicia los contadores del cliente (no cambia el estado del circuito)."""
+    gemini_client.reset_stats()
@@ -7,25 +7,26 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import date, datetime, timedelta
 
-from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Usuario, Negocio, Producto, Venta, DetalleVenta, Receta, Produccion, HorarioPico, UserRole
+from app.database import get_db, get_read_db
+from app.dependencies import get_current_claims
+from app.models import Usuario, Negocio, Producto, Insumo, Venta, DetalleVenta, Receta, Produccion, HorarioPico, UserRole
 from app.crud.venta import get_analisis_ventas, get_alertas_stock, get_productos_por_vencer
-from app.schemas import VentaResponse
+from app.schemas import VentaResponse, TokenData
+from app.core.business_binding import get_bound_business_id, bind_business, invalidate_business_binding
 
 router = APIRouter(prefix="/niam", tags=["Panadería Ñiam"])
 
 # FUNCIONES DE VERIFICACIÓN DE ROLES
-def verify_role(current_user: Usuario, required_roles: List[UserRole]) -> bool:
-    """Verifica si el usuario tiene uno de los roles requeridos"""
-    return current_user.rol in required_roles
+def verify_role(claims: TokenData, required_roles: List[UserRole]) -> bool:
+    """Verifica si el usuario tiene uno de los roles requeridos (solo con los claims del token)"""
+    return claims.rol is not None and claims.rol in {role.value for role in required_roles}
 
-def get_niam_business(db: Session, current_user: Usuario) -> Negocio:
-    """Obtiene el negocio Panadería Ñiam del usuario"""
+def _find_niam_business_by_name(db: Session, user_id: UUID) -> Optional[Negocio]:
+    """Busca el negocio del propietario por nombre (sin índice: solo en un fallo del cache)"""
     # Buscar negocio con nombre que contenga "Ñiam" o "Niam"
-    negocio = db.query(Negocio).filter(
+    return db.query(Negocio).filter(
         and_(
-            Negocio.propietario_id == current_user.id,
+            Negocio.propietario_id == user_id,
             or_(
                 func.lower(Negocio.nombre).contains("ñiam"),
                 func.lower(Negocio.nombre).contains("niam"),
@@ -33,6 +34,27 @@ def get_niam_business(db: Session, current_user: Usuario) -> Negocio:
             )
         )
     ).first()
+
+def get_niam_business(db: Session, claims: TokenData) -> Negocio:
+    """
+    Obtiene el negocio Panadería Ñiam del usuario con una búsqueda por clave primaria:
+    los empleados usan negocio_asignado_id (del token) y los propietarios el vínculo
+    cacheado, que se resuelve por nombre solo la primera vez.
+    """
+    negocio = None
+    if claims.negocio_asignado_id:
+        negocio = db.get(Negocio, UUID(claims.negocio_asignado_id))
+    else:
+        negocio_id = get_bound_business_id(claims.user_id)
+        if negocio_id is not None:
+            negocio = db.get(Negocio, negocio_id)
+            if negocio is None or negocio.propietario_id != claims.user_uuid:
+                invalidate_business_binding(claims.user_id)
+                negocio = None
+        if negocio is None:
+            negocio = _find_niam_business_by_name(db, claims.user_uuid)
+            if negocio is not None:
+                bind_business(claims.user_id, negocio.id)
     
     if not negocio:
         raise HTTPException(
@@ -45,19 +67,19 @@ def get_niam_business(db: Session, current_user: Usuario) -> Negocio:
 # DASHBOARD ESPECIALIZADO PARA PANADERÍA ÑIAM
 @router.get("/dashboard")
 def get_niam_dashboard(
-    current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    claims: TokenData = Depends(get_current_claims),
+    db: Session = Depends(get_read_db)
 ):
     """Dashboard especializado para Panadería Ñiam"""
     
     # Verificar roles permitidos
-    if not verify_role(current_user, [UserRole.TRABAJADOR_ATENCION, UserRole.COCINERO, UserRole.MANAGER, UserRole.ADMIN]):
+    if not verify_role(claims, [UserRole.TRABAJADOR_ATENCION, UserRole.COCINERO, UserRole.MANAGER, UserRole.ADMIN]):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos para acceder al dashboard"
         )
     
-    negocio = get_niam_business(db, current_user)
+    negocio = get_niam_business(db, claims)
     
     # Obtener fecha actual
     hoy = date.today()
@@ -149,19 +171,19 @@ def get_niam_dashboard(
 # GESTIÓN DE RECETAS ESPECÍFICAS PARA CHIPÁ
 @router.get("/recetas")
 def get_recetas_chipa(
-    current_user: Usuario = Depends(get_current_user),
+    claims: TokenData = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     """Obtiene las recetas de Chipá y otros productos"""
     
     # Verificar roles permitidos
-    if not verify_role(current_user, [UserRole.COCINERO, UserRole.MANAGER, UserRole.ADMIN]):
+    if not verify_role(claims, [UserRole.COCINERO, UserRole.MANAGER, UserRole.ADMIN]):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos para ver recetas"
         )
     
-    negocio = get_niam_business(db, current_user)
+    negocio = get_niam_business(db, claims)
     
     recetas = db.query(Receta).filter(
         and_(
@@ -195,13 +217,13 @@ def get_recetas_chipa(
 @router.get("/recetas/{receta_id}")
 def get_receta_detalle(
     receta_id: UUID,
-    current_user: Usuario = Depends(get_current_user),
+    claims: TokenData = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     """Obtiene el detalle completo de una receta"""
     
     # Verificar roles permitidos
-    if not verify_role(current_user, [UserRole.COCINERO, UserRole.MANAGER, UserRole.ADMIN]):
+    if not verify_role(claims, [UserRole.COCINERO, UserRole.MANAGER, UserRole.ADMIN]):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos para ver recetas"
@@ -215,7 +237,7 @@ def get_receta_detalle(
         )
     
     # Verificar que pertenece al negocio del usuario
-    negocio = get_niam_business(db, current_user)
+    negocio = get_niam_business(db, claims)
     if receta.negocio_id != negocio.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -259,19 +281,19 @@ def get_receta_detalle(
 # GESTIÓN DE PRODUCCIÓN
 @router.get("/produccion")
 def get_producciones(
-    current_user: Usuario = Depends(get_current_user),
+    claims: TokenData = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     """Obtiene las producciones recientes"""
     
     # Verificar roles permitidos
-    if not verify_role(current_user, [UserRole.COCINERO, UserRole.MANAGER, UserRole.ADMIN]):
+    if not verify_role(claims, [UserRole.COCINERO, UserRole.MANAGER, UserRole.ADMIN]):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos para ver producciones"
         )
     
-    negocio = get_niam_business(db, current_user)
+    negocio = get_niam_business(db, claims)
     
     producciones = db.query(Produccion).filter(
         and_(
@@ -303,19 +325,19 @@ def get_producciones(
 def get_analisis_chipa(
     fecha_inicio: date = Query(..., description="Fecha de inicio (YYYY-MM-DD)"),
     fecha_fin: date = Query(..., description="Fecha de fin (YYYY-MM-DD)"),
-    current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    claims: TokenData = Depends(get_current_claims),
+    db: Session = Depends(get_read_db)
 ):
     """Análisis específico de ventas de Chipá"""
     
     # Verificar roles permitidos
-    if not verify_role(current_user, [UserRole.MANAGER, UserRole.ADMIN]):
+    if not verify_role(claims, [UserRole.MANAGER, UserRole.ADMIN]):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos para ver análisis"
         )
     
-    negocio = get_niam_business(db, current_user)
+    negocio = get_niam_business(db, claims)
     
     # Ventas de Chipá en el período
     ventas_chipa = db.query(
@@ -386,18 +408,18 @@ def get_analisis_chipa(
 # ALERTAS ESPECÍFICAS PARA PANADERÍA ÑIAM
 @router.get("/alertas")
 def get_alertas_niam(
-    current_user: Usuario = Depends(get_current_user),
+    claims: TokenData = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     """Obtiene alertas específicas para Panadería Ñiam"""
     
-    negocio = get_niam_business(db, current_user)
+    negocio = get_niam_business(db, claims)
     
     # Alertas de stock de insumos críticos para Chipá
     insumos_criticos = ["almidón", "mandioca", "queso", "huevo", "leche"]
     alertas_insumos = db.query(Insumo).filter(
         and_(
-            Insumo.usuario_id == current_user.id,
+            Insumo.usuario_id == claims.user_uuid,
             or_(
                 *[func.lower(Insumo.nombre).contains(insumo) for insumo in insumos_criticos]
             ),
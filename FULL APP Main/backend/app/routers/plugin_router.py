@@ -1,5 +1,6 @@
 # backend/app/routers/plugin_router.py
 
+from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
@@ -9,10 +10,18 @@ from app.database import get_db
 from app.dependencies import get_current_user
 from app.models import Usuario
 from app.crud.user import activate_plugin, deactivate_plugin, get_user_plugins
+from app.crud.business import get_business_ids_by_user_id
+from app.auth import create_access_token, build_user_claims
+from app.core.config import settings
 from app.schemas import UsuarioResponse
 
 router = APIRouter(prefix="/plugins", tags=["plugins"])
 
+def _reissue_token(db: Session, user: Usuario) -> str:
+    """Token con los plugins_activos actuales (desactivar revoca los anteriores; activar no)"""
+    claims = build_user_claims(user, get_business_ids_by_user_id(db, user.id))
+    return create_access_token(data=claims, expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+
 # Lista de plugins disponibles
 AVAILABLE_PLUGINS = {
     "panaderia": {
@@ -88,7 +97,9 @@ def activate_user_plugin(
     
     return {
         "message": f"Plugin '{plugin_name}' activado exitosamente",
-        "user": UsuarioResponse.from_orm(updated_user)
+        "user": UsuarioResponse.from_orm(updated_user),
+        "access_token": _reissue_token(db, updated_user),
+        "token_type": "bearer"
     }
 
 @router.post("/deactivate/{plugin_name}")
@@ -107,7 +118,9 @@ def deactivate_user_plugin(
     
     return {
         "message": f"Plugin '{plugin_name}' desactivado exitosamente",
-        "user": UsuarioResponse.from_orm(updated_user)
+        "user": UsuarioResponse.from_orm(updated_user),
+        "access_token": _reissue_token(db, updated_user),
+        "token_type": "bearer"
     }
 
 @router.get("/status")
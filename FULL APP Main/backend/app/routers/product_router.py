@@ -2,7 +2,8 @@
 
 from ..schemas import VentaCreate
 from fastapi import Query
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
@@ -10,6 +11,7 @@ from uuid import UUID
 from app.database import get_db
 from app.schemas import ProductoCreate, ProductoUpdate, ProductoResponse
 from app.crud import product as crud_product
+from app.core.serialization import serialized_response, validate
 from app.dependencies import get_current_user
 from app.models import Usuario, UserTier, Negocio
 
@@ -17,11 +19,29 @@ router = APIRouter(
     tags=["Products & Services"]
 )
 
+_productos_adapter = TypeAdapter(List[ProductoResponse])
+
 def _calculate_margen_ganancia_real(db_product) -> Optional[float]:
     if db_product.cogs is not None and db_product.precio_venta is not None and db_product.cogs > 0:
         return ((db_product.precio_venta - db_product.cogs) / db_product.cogs) * 100
     return None
 
+def _to_response(db_product) -> ProductoResponse:
+    """
+    DTO de respuesta a partir de un producto ya cargado. Las relaciones que serializa
+    ProductoResponse deben venir precargadas desde crud (ver crud.product.PRODUCT_LIST_OPTIONS).
+    """
+    response_data = ProductoResponse.model_validate(db_product)
+    response_data.margen_ganancia_real = _calculate_margen_ganancia_real(db_product)
+    return response_data
+
+def _list_response(request: Request, db_products) -> Response:
+    """Listado de productos validado y serializado en bloque, en el formato negociado."""
+    dtos = validate(_productos_adapter, db_products)
+    for dto, db_product in zip(dtos, db_products):
+        dto.margen_ganancia_real = _calculate_margen_ganancia_real(db_product)
+    return serialized_response(request, _productos_adapter, dtos, validated=True)
+
 @router.post(
     "/",
     response_model=ProductoResponse,
@@ -48,9 +68,7 @@ def create_product_endpoint(
         )
     try:
         db_product = crud_product.create_product(db, propietario_id=current_user.id, product=product)
-        response_data = ProductoResponse.model_validate(db_product)
-        response_data.margen_ganancia_real = _calculate_margen_ganancia_real(db_product)
-        return response_data
+        return _to_response(db_product)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -61,16 +79,12 @@ def create_product_endpoint(
     description="Retrieves a list of all products or services owned by the current authenticated user."
 )
 def get_all_my_products_endpoint(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     products = crud_product.get_all_products_by_user_id(db, propietario_id=current_user.id)
-    response_products = []
-    for p in products:
-        response_data = ProductoResponse.model_validate(p)
-        response_data.margen_ganancia_real = _calculate_margen_ganancia_real(p)
-        response_products.append(response_data)
-    return response_products
+    return _list_response(request, products)
 
 @router.get(
     "/{product_id}",
@@ -94,9 +108,7 @@ def get_product_endpoint(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this product/service."
         )
-    response_data = ProductoResponse.model_validate(db_product)
-    response_data.margen_ganancia_real = _calculate_margen_ganancia_real(db_product)
-    return response_data
+    return _to_response(db_product)
 
 @router.put(
     "/{product_id}",
@@ -130,9 +142,7 @@ def update_product_endpoint(
             )
     try:
         updated_product = crud_product.update_product(db, product_id=product_id, product_update=product_update)
-        response_data = ProductoResponse.model_validate(updated_product)
-        response_data.margen_ganancia_real = _calculate_margen_ganancia_real(updated_product)
-        return response_data
+        return _to_response(updated_product)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -253,6 +263,7 @@ def update_product_stock(
 
 @router.get("/low_stock", response_model=List[ProductoResponse])
 def get_products_low_stock(
+    request: Request,
     threshold: float = Query(5.0, description="Umbral de stock bajo"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
@@ -274,13 +285,14 @@ def get_products_low_stock(
             user_id=current_user.id,
             threshold=threshold
         )
-        return productos
+        return _list_response(request, productos)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 @router.get("/out_of_stock", response_model=List[ProductoResponse])
 def get_products_out_of_stock(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
@@ -299,7 +311,7 @@ def get_products_out_of_stock(
             db=db,
             user_id=current_user.id
         )
-        return productos
+        return _list_response(request, productos)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
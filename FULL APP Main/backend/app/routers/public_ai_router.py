@@ -1,24 +1,24 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional, Union
 from app.schemas import ProductoResponse, NegocioResponse
 from app.models import Producto, Negocio
-from app.database import SessionLocal
+from app.database import get_db
+from app.crud import product as crud_product
+from app.ai import LLMError, catalog_index, gemini_client, recommendation_cache
+from app.core.config import settings
 from sqlalchemy.orm import Session
-import requests
-import os
+import json
+import logging
 import uuid
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# Dependencia para obtener la sesión de base de datos
+router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Recomendaciones que devuelve el motor local (preferencial + otras)
+_LOCAL_RECOMMENDATIONS = 5
 
 # Esquema de entrada para la consulta AI
 class AIRecommendRequest(BaseModel):
@@ -29,14 +29,11 @@ class AIRecommendResponse(BaseModel):
     productos: Optional[List[ProductoResponse]] = None
     negocios: Optional[List[NegocioResponse]] = None
 
-# Utilidad para llamar a Gemini API (gemini-2.0-flash)
-def call_gemini_api(query: str, productos_info: list) -> dict:
-    import json
-    apiKey = os.environ.get("GEMINI_API_KEY", "")
-    url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
-    headers = {"Content-Type": "application/json"}
+# Utilidad para llamar a Gemini API (gemini-2.0-flash) con el cliente asíncrono compartido
+# (app/ai/llm_client.py: pool de conexiones, reintentos y circuit breaker)
+def _build_prompt(query: str, productos_info: list) -> str:
     productos_json = json.dumps(productos_info, ensure_ascii=False)
-    prompt = (
+    return (
         "Eres un asistente de recomendaciones para una app de productos y negocios. "
         "Solo puedes recomendar productos de la siguiente lista (usa exactamente los IDs y nombres que aparecen):\n"
         f"{productos_json}\n"
@@ -46,93 +43,112 @@ def call_gemini_api(query: str, productos_info: list) -> dict:
         "No incluyas explicaciones ni texto fuera del JSON. "
         "La consulta del usuario es: " + query
     )
-    payload = {
-        "contents": [{"parts": [{"text": prompt}]}]
-    }
-    print("Payload enviado a Gemini:", payload)
-    params = {"key": apiKey}
+
+async def call_gemini_api(query: str, productos_info: list) -> dict:
+    text = (await gemini_client.generate(_build_prompt(query, productos_info))).strip()
+    # Limpiar bloque Markdown si existe
+    if text.startswith("```"):
+        lines = text.splitlines()
+        if lines[0].strip().startswith("```"):
+            lines = lines[1:]
+        if lines and lines[-1].strip().startswith("```"):
+            lines = lines[:-1]
+        text = "\n".join(lines).strip()
     try:
-        response = requests.post(url, headers=headers, params=params, json=payload, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        if "candidates" in data and data["candidates"]:
-            text = data["candidates"][0]["content"]["parts"][0]["text"]
-            # Limpiar bloque Markdown si existe
-            text = text.strip()
-            if text.startswith("```"):
-                lines = text.splitlines()
-                if lines[0].strip().startswith("```"):
-                    lines = lines[1:]
-                if lines and lines[-1].strip().startswith("```"):
-                    lines = lines[:-1]
-                text = "\n".join(lines).strip()
-            import json as _json
-            try:
-                return _json.loads(text)
-            except Exception as e:
-                print("ERROR AL PARSEAR JSON DE GEMINI:", text)
-                raise HTTPException(status_code=500, detail="La IA no devolvió un JSON válido.")
-        else:
-            raise ValueError("Respuesta inesperada de Gemini")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error al consultar Gemini: {str(e)}")
+        return json.loads(text)
+    except ValueError:
+        logger.warning("La IA no devolvió un JSON válido: %r", text[:200])
+        raise LLMError("La IA no devolvió un JSON válido.")
+
+def _local_recommendation(query: str, candidatos: list) -> dict:
+    """
+    Recomendación sin modelo: los productos más parecidos a la consulta en el índice
+    vectorial del catálogo. Si ninguno se parece, la preselección BM25 (o los mejor
+    calificados).
+    """
+    similares = catalog_index.similar(query, _LOCAL_RECOMMENDATIONS)
+    if not similares:
+        similares = (candidatos or catalog_index.search(query, _LOCAL_RECOMMENDATIONS))[:_LOCAL_RECOMMENDATIONS]
+    recomendados = [{"id": str(c.id), "nombre": c.nombre} for c in similares]
+    if not recomendados:
+        return {}
+    return {"producto_preferencial": recomendados[0], "otras_recomendaciones": recomendados[1:]}
+
+def _shortlist(db: Session, query: str) -> list:
+    # Candidatos: búsqueda léxica (BM25) sobre la instantánea del catálogo en memoria.
+    # El prompt lleva solo los AI_SHORTLIST_SIZE más relevantes, no el catálogo entero.
+    catalog_index.refresh(db)
+    if not gemini_client.configured:  # Sin API key no hay prompt: solo el motor local
+        return []
+    return catalog_index.search(query, settings.AI_SHORTLIST_SIZE)
 
 @router.post("/public/ai/recommend", response_model=dict)
-def recommend_ai(
+async def recommend_ai(
     req: AIRecommendRequest,
     db: Session = Depends(get_db)
 ):
-    # Extraer productos públicos de la base de datos
-    productos = db.query(Producto).all()
+    # El trabajo con la base (sesión síncrona) va al threadpool; la espera al modelo no
+    # ocupa ningún hilo.
+    candidatos = await run_in_threadpool(_shortlist, db, req.query)
     productos_info = [
         {
-            "id": str(p.id),
-            "nombre": p.nombre,
-            "tipo": p.tipo_producto,
-            "precio": p.precio,
-            "negocio_id": str(p.negocio_id),
-            "negocio_nombre": p.negocio.nombre if p.negocio else ""
+            "id": str(c.id),
+            "nombre": c.nombre,
+            "tipo": c.tipo,
+            "precio": c.precio,
+            "negocio_id": str(c.negocio_id),
+            "negocio_nombre": catalog_index.negocio_nombre(c.negocio_id)
         }
-        for p in productos
+        for c in candidatos
     ]
+    # Misma consulta (normalizada) con el mismo catálogo -> misma respuesta del modelo.
+    # Si el proveedor no está disponible (sin API key, caído o circuito abierto) responde
+    # el motor vectorial local en lugar de un 500; eso no se cachea.
+    params = None
+    if gemini_client.configured:
+        try:
+            params = await recommendation_cache.get_or_compute(
+                req.query, catalog_index.version, lambda: call_gemini_api(req.query, productos_info)
+            )
+        except LLMError as e:
+            logger.warning("Recomendación local para %r: %s", req.query, e)
+    if params is None:
+        params = await run_in_threadpool(_local_recommendation, req.query, candidatos)
+    return await run_in_threadpool(_resolve_recommendations, db, params, candidatos)
+
+def _resolve_id(rec, candidato_ids: List[uuid.UUID]) -> Optional[uuid.UUID]:
+    """
+    Id de una recomendación del modelo. Si no es un UUID o no está en el catálogo, se
+    resuelve por nombre con el mapa en memoria de la instantánea (sin consultar la base),
+    prefiriendo los candidatos enviados al modelo.
+    """
+    if not isinstance(rec, dict):
+        return None
     try:
-        params = call_gemini_api(req.query, productos_info)
-    except Exception as e:
-        print("ERROR EN LLAMADA A GEMINI:", repr(e))
-        raise HTTPException(status_code=500, detail=f"Error inesperado: {str(e)}")
+        prod_id = uuid.UUID(str(rec.get("id")))
+    except (ValueError, TypeError):
+        prod_id = None
+    if prod_id is None or prod_id not in catalog_index:
+        prod_id = catalog_index.resolve_name(rec.get("nombre"), prefer=candidato_ids) or prod_id
+    return prod_id
+
+def _resolve_recommendations(db: Session, params: dict, candidatos: list) -> dict:
+    if not isinstance(params, dict):
+        params = {}
+    candidato_ids = [c.id for c in candidatos]
+    pref_id = _resolve_id(params.get("producto_preferencial"), candidato_ids)
+    otras_ids = []
+    for rec in params.get("otras_recomendaciones") or []:
+        prod_id = _resolve_id(rec, candidato_ids)
+        if prod_id is not None and prod_id != pref_id and prod_id not in otras_ids:
+            otras_ids.append(prod_id)
 
-    # Buscar producto preferencial y otras recomendaciones en la BD
-    producto_pref = None
-    otras_recs = []
-    if "producto_preferencial" in params:
-        prod_id = params["producto_preferencial"].get("id")
-        producto_pref = None
-        if prod_id:
-            try:
-                prod_uuid = uuid.UUID(str(prod_id))
-                producto_pref = db.query(Producto).filter_by(id=prod_uuid).first()
-            except (ValueError, TypeError):
-                nombre = params["producto_preferencial"].get("nombre")
-                if nombre:
-                    producto_pref = db.query(Producto).filter_by(nombre=nombre).first()
-    if "otras_recomendaciones" in params:
-        for rec in params["otras_recomendaciones"]:
-            prod_id = rec.get("id")
-            prod = None
-            if prod_id:
-                try:
-                    prod_uuid = uuid.UUID(str(prod_id))
-                    prod = db.query(Producto).filter_by(id=prod_uuid).first()
-                except (ValueError, TypeError):
-                    nombre = rec.get("nombre")
-                    if nombre:
-                        prod = db.query(Producto).filter_by(nombre=nombre).first()
-            if prod:
-                otras_recs.append(prod)
-    # Serializar
-    from app.schemas import ProductoResponse
-    resp = {
+    # Todas las recomendaciones en una sola consulta IN, respetando el orden del modelo
+    productos = {p.id: p for p in crud_product.get_products_by_ids(db, ([pref_id] if pref_id else []) + otras_ids)}
+    producto_pref = productos.get(pref_id)
+    return {
         "producto_preferencial": ProductoResponse.model_validate(producto_pref, from_attributes=True) if producto_pref else None,
-        "otras_recomendaciones": [ProductoResponse.model_validate(p, from_attributes=True) for p in otras_recs]
+        "otras_recomendaciones": [
+            ProductoResponse.model_validate(productos[prod_id], from_attributes=True) for prod_id in otras_ids if prod_id in productos
+        ]
     }
-    return resp 
\ No newline at end of file
@@ -1,19 +1,82 @@
 # backend/app/routers/public_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from email.utils import parsedate_to_datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from app.database import get_db
-from app.schemas import NegocioResponse, ProductoResponse, UsuarioPublicResponse # Import public schemas
+from app.database import get_read_db # Listados públicos: réplica de lectura si está configurada
+from app.core.pagination import approximate_count, set_total_count
+from app.core.http_cache import body_etag, conditional_response, make_etag, resource_version
+from app.core.serialization import encode, response_media_type, serialized_response, validate
+from app.core.response_cache import (
+    CachedResponse, SCOPE_BUSINESSES, business_scope, cached_lookup, product_scope, products_scope, response_cache,
+    storefront_scope
+)
+from app.models import Negocio, Producto, ProductType, Usuario
+from app.schemas import NegocioResponse, NegocioNearResponse, ProductoResponse, UsuarioPublicResponse, SearchResult, StorefrontResponse # Import public schemas
 from app.crud import business as crud_business
 from app.crud import product as crud_product
 from app.crud import user as crud_user # Import user CRUD for public profile
+from app.crud import search as crud_search
 
 # Create a new FastAPI router for public access
 router = APIRouter()
 
+_negocios_adapter = TypeAdapter(List[NegocioResponse])
+_negocio_adapter = TypeAdapter(NegocioResponse)
+_productos_adapter = TypeAdapter(List[ProductoResponse])
+_producto_adapter = TypeAdapter(ProductoResponse)
+_negocios_near_adapter = TypeAdapter(List[NegocioNearResponse])
+_search_adapter = TypeAdapter(List[SearchResult])
+_storefront_adapter = TypeAdapter(StorefrontResponse)
+
+def _query_variant(request: Request) -> str:
+    """
+    Formato negociado (Accept) + query params normalizados: cada combinación de formato,
+    filtros y página tiene su propio ETag y su propia entrada en el cache de respuestas.
+    """
+    params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return f"{response_media_type(request)}?{params}"
+
+def _conditional_detail(request: Request, response: Response, db: Session, model, resource_id: UUID, not_found_detail: str) -> Optional[Response]:
+    """GET condicional de un recurso individual; 404 si no existe, 304 si el cliente ya lo tiene."""
+    max_updated, count = resource_version(db.query(model).filter(model.id == resource_id), model.fecha_actualizacion)
+    if count == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found_detail)
+    etag = make_etag(model.__tablename__, max_updated, count, f"{resource_id}|{_query_variant(request)}")
+    return conditional_response(request, response, etag, last_modified=max_updated)
+
+def _serve_cached(request: Request, cached: CachedResponse) -> Response:
+    """Respuesta desde el cache de respuestas (sin tocar la base); 304 si el cliente ya la tiene."""
+    last_modified = cached.headers.get("last-modified")
+    not_modified = conditional_response(
+        request, Response(), cached.headers["etag"],
+        last_modified=parsedate_to_datetime(last_modified) if last_modified else None
+    )
+    if not_modified:
+        return not_modified
+    # La clave del cache incluye el formato: el cuerpo está en el que pide este request
+    return Response(content=cached.body, media_type=response_media_type(request), headers=cached.headers)
+
+def _serialized_response(adapter: TypeAdapter, data, request: Request, response: Response, cache_key: Optional[str]) -> Response:
+    """
+    Serializa `data` con el schema público en el formato negociado, la guarda en el
+    cache (si hay clave) y la devuelve.
+    """
+    body = encode(adapter, validate(adapter, data), response_media_type(request))
+    return _cache_and_respond(body, request, response, cache_key)
+
+def _cache_and_respond(body: bytes, request: Request, response: Response, cache_key: Optional[str]) -> Response:
+    # ETag, Last-Modified, Cache-Control, X-Total-Count... ya puestos en `response`
+    headers = {key: value for key, value in response.headers.items() if key not in ("content-length", "content-type")}
+    headers["vary"] = "Accept"
+    if cache_key:
+        response_cache.set(cache_key, CachedResponse(body=body, headers=headers))
+    return Response(content=body, media_type=response_media_type(request), headers=headers)
+
 # --- Public Business Endpoints ---
 
 @router.get(
@@ -22,13 +85,50 @@ router = APIRouter()
     summary="Get all public businesses",
     description="Retrieves a list of all publicly available businesses."
 )
-def get_all_public_businesses(db: Session = Depends(get_db)):
+def get_all_public_businesses(request: Request, response: Response, db: Session = Depends(get_read_db)):
     """
     Returns a list of all businesses.
     (Currently, all businesses are considered public for simplicity in this phase).
+    Supports If-None-Match: answers 304 when the list has not changed.
     """
+    variant = _query_variant(request)
+    cache_key, cached = cached_lookup(SCOPE_BUSINESSES, variant)
+    if cached:
+        return _serve_cached(request, cached)
+    max_updated, count = resource_version(db.query(Negocio), Negocio.fecha_actualizacion)
+    not_modified = conditional_response(request, response, make_etag("negocios", max_updated, count, variant))
+    if not_modified:
+        return not_modified
     businesses = crud_business.get_all_businesses(db) # Assuming a get_all_businesses in crud/business.py
-    return businesses
+    return _serialized_response(_negocios_adapter, businesses, request, response, cache_key)
+
+@router.get(
+    "/businesses/near",
+    response_model=List[NegocioNearResponse],
+    summary="Find public businesses near a point",
+    description=(
+        "Businesses within `radio_km` of (lat, lon), closest first. Only businesses with "
+        "coordinates are considered (explicit, or geocoded from their location text)."
+    )
+)
+def get_public_businesses_near(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radio_km: float = Query(5.0, gt=0, le=50),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Returns nearby businesses with their distance in kilometres.
+    """
+    results = crud_business.get_businesses_near(db, lat, lon, radius_km=radio_km, limit=limit)
+    negocios = validate(_negocios_adapter, [negocio for negocio, _ in results])
+    data = [
+        NegocioNearResponse(**negocio.model_dump(), distancia_km=round(distancia_km, 3))
+        for negocio, (_, distancia_km) in zip(negocios, results)
+    ]
+    return serialized_response(request, _negocios_near_adapter, data, validated=True)
 
 @router.get(
     "/businesses/{business_id}",
@@ -36,33 +136,111 @@ def get_all_public_businesses(db: Session = Depends(get_db)):
     summary="Get public business details by ID",
     description="Retrieves the details of a specific publicly available business by its ID."
 )
-def get_public_business_detail(business_id: UUID, db: Session = Depends(get_db)):
+def get_public_business_detail(business_id: UUID, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """
     Returns the details of a specific business by its ID.
+    Supports If-None-Match / If-Modified-Since (304).
     """
+    cache_key, cached = cached_lookup(business_scope(business_id), _query_variant(request))
+    if cached:
+        return _serve_cached(request, cached)
+    not_modified = _conditional_detail(request, response, db, Negocio, business_id, "Business not found.")
+    if not_modified:
+        return not_modified
     db_business = crud_business.get_business_by_id(db, business_id=business_id)
     if not db_business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Business not found."
         )
-    return db_business
+    return _serialized_response(_negocio_adapter, db_business, request, response, cache_key)
+
+@router.get(
+    "/businesses/{business_id}/storefront",
+    response_model=StorefrontResponse,
+    summary="Get a business storefront",
+    description=(
+        "Everything a business landing page needs in one response: the business, its "
+        "products with stock status, rating aggregates and its active advertising."
+    )
+)
+def get_public_business_storefront(business_id: UUID, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """
+    Returns the storefront of a business. Cached as a unit (invalidated by any write to
+    the business or its products); the ETag is derived from the response body.
+    Advertising that starts or ends shows up once the cached entry expires (TTL).
+    """
+    cache_key, cached = cached_lookup(storefront_scope(business_id), _query_variant(request))
+    if cached:
+        return _serve_cached(request, cached)
+    storefront = crud_business.get_storefront(db, business_id=business_id)
+    if storefront is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found."
+        )
+    body = encode(_storefront_adapter, validate(_storefront_adapter, storefront), response_media_type(request))
+    not_modified = conditional_response(request, response, body_etag(body))
+    cached_response = _cache_and_respond(body, request, response, cache_key)
+    return not_modified or cached_response
 
 # --- Public Product Endpoints ---
 
 @router.get(
     "/products",
     response_model=List[ProductoResponse],
-    summary="Get all public products/services",
-    description="Retrieves a list of all publicly available products or services."
+    summary="List public products/services",
+    description=(
+        "Paginated public catalog with optional filters. The total count is returned in the "
+        "X-Total-Count header (X-Total-Count-Approximate: true when it is an estimate)."
+    )
 )
-def get_all_public_products(db: Session = Depends(get_db)):
+def get_all_public_products(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=100),
+    negocio_id: Optional[UUID] = None,
+    tipo_producto: Optional[ProductType] = None,
+    categoria: Optional[str] = None,
+    precio_min: Optional[float] = Query(None, ge=0),
+    precio_max: Optional[float] = Query(None, ge=0),
+    sort: Literal["recientes", "precio_asc", "precio_desc", "nombre", "rating"] = "recientes",
+    db: Session = Depends(get_read_db)
+):
     """
-    Returns a list of all products/services.
+    Returns one page of products/services.
     (Currently, all products are considered public for simplicity in this phase).
     """
-    products = crud_product.get_all_products(db) # Assuming a get_all_products in crud/product.py
-    return products
+    if precio_min is not None and precio_max is not None and precio_min > precio_max:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="precio_min cannot be greater than precio_max."
+        )
+    variant = _query_variant(request)
+    cache_key, cached = cached_lookup(products_scope(negocio_id), variant)
+    if cached:
+        return _serve_cached(request, cached)
+    query = crud_product.query_public_products(
+        db,
+        negocio_id=negocio_id,
+        tipo_producto=tipo_producto,
+        categoria=categoria,
+        precio_min=precio_min,
+        precio_max=precio_max,
+    )
+    # El ETag usa el conteo exacto: con el acotado (o la estimación del planificador) una
+    # baja, o una edición que saca la fila del filtro, no cambiaría la versión y el
+    # cliente seguiría recibiendo 304. El conteo acotado queda solo para X-Total-Count.
+    max_updated, count = resource_version(query, Producto.fecha_actualizacion)
+    not_modified = conditional_response(request, response, make_etag("productos", max_updated, count, variant))
+    if not_modified:
+        return not_modified
+    filtered = any(value is not None for value in (negocio_id, tipo_producto, categoria, precio_min, precio_max))
+    total, approximate = approximate_count(db, query, "productos", filtered=filtered)
+    set_total_count(response, total, approximate)
+    products = crud_product.get_public_products_page(db, query, sort=sort, offset=(page - 1) * page_size, limit=page_size)
+    return _serialized_response(_productos_adapter, products, request, response, cache_key)
 
 @router.get(
     "/products/{product_id}",
@@ -70,17 +248,24 @@ def get_all_public_products(db: Session = Depends(get_db)):
     summary="Get public product/service details by ID",
     description="Retrieves the details of a specific publicly available product or service by its ID."
 )
-def get_public_product_detail(product_id: UUID, db: Session = Depends(get_db)):
+def get_public_product_detail(product_id: UUID, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """
     Returns the details of a specific product/service by its ID.
+    Supports If-None-Match / If-Modified-Since (304).
     """
+    cache_key, cached = cached_lookup(product_scope(product_id), _query_variant(request))
+    if cached:
+        return _serve_cached(request, cached)
+    not_modified = _conditional_detail(request, response, db, Producto, product_id, "Product or service not found.")
+    if not_modified:
+        return not_modified
     db_product = crud_product.get_product_by_id(db, product_id=product_id)
     if not db_product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product or service not found."
         )
-    return db_product
+    return _serialized_response(_producto_adapter, db_product, request, response, cache_key)
 
 # --- Public User Profile Endpoints ---
 
@@ -90,11 +275,15 @@ def get_public_product_detail(product_id: UUID, db: Session = Depends(get_db)):
     summary="Get public user profile by ID",
     description="Retrieves the public profile details of a specific user by their ID."
 )
-def get_public_user_profile(user_id: UUID, db: Session = Depends(get_db)):
+def get_public_user_profile(user_id: UUID, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """
     Returns the public profile details of a specific user.
+    Supports If-None-Match / If-Modified-Since (304).
     """
-    db_user = crud_user.get_user_by_id(db, user_id=user_id) # Assuming get_user_by_id in crud/user.py
+    not_modified = _conditional_detail(request, response, db, Usuario, user_id, "User not found.")
+    if not_modified:
+        return not_modified
+    db_user = crud_user.get_user(db, user_id=user_id)
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -102,7 +291,29 @@ def get_public_user_profile(user_id: UUID, db: Session = Depends(get_db)):
         )
     return db_user
 
-# --- Public Search Endpoint (Future Expansion) ---
-# @router.get("/search", ...)
-# def public_search(...):
-#    ...
+# --- Public Search Endpoint ---
+
+@router.get(
+    "/search",
+    response_model=List[SearchResult],
+    summary="Full-text search over public products and businesses",
+    description=(
+        "Accent-insensitive Spanish full-text search, ranked by relevance, with highlighted "
+        "snippets. The total number of matches is returned in the X-Total-Count header."
+    )
+)
+def public_search(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description="Texto a buscar"),
+    tipo: Literal["todos", "productos", "negocios"] = "todos",
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Returns one page of search results, most relevant first.
+    """
+    results, total = crud_search.search_public(db, q, scope=tipo, offset=(page - 1) * page_size, limit=page_size)
+    set_total_count(response, total, approximate=False)
+    return serialized_response(request, _search_adapter, results, headers=response.headers)
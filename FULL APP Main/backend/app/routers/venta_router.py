@@ -1,54 +1,50 @@
 # backend/app/routers/venta_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime, timedelta
 
-from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Usuario, Negocio
+from app.database import get_db, get_read_db
+from app.dependencies import (
+    get_current_claims, authorize_negocio,
+    get_authorized_negocio, get_authorized_carrito, get_authorized_venta
+)
+from app.models import Negocio, CarritoCompra, Venta
+from app.core.pagination import decode_datetime_id_cursor, set_next_cursor
+from app.core.serialization import serialized_response
 from app.crud.venta import (
-    create_venta, get_venta, get_ventas_by_negocio, get_analisis_ventas,
+    create_venta, get_ventas_by_negocio, get_ventas_page, get_analisis_ventas,
     get_alertas_stock, get_productos_por_vencer,
-    create_carrito, add_item_to_carrito, get_carrito, get_carrito_by_cliente,
+    create_carrito, add_item_to_carrito, get_carrito_by_cliente,
     remove_item_from_carrito, clear_carrito
 )
 from app.schemas import (
     VentaCreate, VentaResponse, DetalleVentaCreate,
     CarritoCompraCreate, CarritoCompraResponse,
     ItemCarritoCreate, ItemCarritoResponse,
-    AnalisisVentas, AlertaStock, ProductoVencimiento
+    AnalisisVentas, AlertaStock, ProductoVencimiento, TokenData
 )
 
 router = APIRouter(prefix="/ventas", tags=["ventas"])
 
+_ventas_adapter = TypeAdapter(List[VentaResponse])
+
 @router.post("/", response_model=VentaResponse)
 def crear_venta(
     venta_data: VentaCreate,
-    current_user: Usuario = Depends(get_current_user),
+    claims: TokenData = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     """Crea una nueva venta (POS)"""
     
     # Verificar que el usuario tenga acceso al negocio
-    negocio = db.query(Negocio).filter(
-        and_(
-            Negocio.id == venta_data.negocio_id,
-            Negocio.propietario_id == current_user.id
-        )
-    ).first()
-    
-    if not negocio:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para crear ventas en este negocio"
-        )
+    authorize_negocio(db, claims, venta_data.negocio_id)
     
     try:
-        venta = create_venta(db, venta_data, current_user.id)
+        venta = create_venta(db, venta_data, claims.user_uuid)
         return venta
     except Exception as e:
         raise HTTPException(
@@ -58,77 +54,48 @@ def crear_venta(
 
 @router.get("/{venta_id}", response_model=VentaResponse)
 def obtener_venta(
-    venta_id: UUID,
-    current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    venta: Venta = Depends(get_authorized_venta)
 ):
     """Obtiene una venta específica"""
-    venta = get_venta(db, venta_id)
-    if not venta:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Venta no encontrada"
-        )
-    
-    # Verificar permisos
-    if venta.negocio.propietario_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para ver esta venta"
-        )
-    
+    # Venta cargada y autorizada por get_authorized_venta (404/403)
     return venta
 
 @router.get("/negocio/{negocio_id}", response_model=List[VentaResponse])
 def obtener_ventas_negocio(
     negocio_id: UUID,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
-    current_user: Usuario = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor)"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Paginación por offset; usar cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    negocio: Negocio = Depends(get_authorized_negocio),
     db: Session = Depends(get_db)
 ):
-    """Obtiene todas las ventas de un negocio"""
-    
-    # Verificar permisos
-    negocio = db.query(Negocio).filter(
-        and_(
-            Negocio.id == negocio_id,
-            Negocio.propietario_id == current_user.id
-        )
-    ).first()
-    
-    if not negocio:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para ver las ventas de este negocio"
-        )
-    
-    ventas = get_ventas_by_negocio(db, negocio_id, skip, limit)
-    return ventas
+    """
+    Obtiene las ventas de un negocio, de la más reciente a la más antigua.
+    Si hay más resultados, el cursor de la página siguiente va en el header X-Next-Cursor.
+    Con Accept: application/msgpack la respuesta va en MessagePack (terminales POS).
+    """
+    
+    # Permisos verificados por get_authorized_negocio (propietario o empleado asignado)
+    if skip and not cursor:
+        return serialized_response(request, _ventas_adapter, get_ventas_by_negocio(db, negocio_id, skip, limit))
+    
+    ventas, next_cursor = get_ventas_page(db, negocio_id, limit, decode_datetime_id_cursor(cursor))
+    set_next_cursor(response, next_cursor)
+    return serialized_response(request, _ventas_adapter, ventas, headers=response.headers)
 
 @router.get("/analisis/{negocio_id}")
 def obtener_analisis_ventas(
     negocio_id: UUID,
     fecha_inicio: date = Query(..., description="Fecha de inicio (YYYY-MM-DD)"),
     fecha_fin: date = Query(..., description="Fecha de fin (YYYY-MM-DD)"),
-    current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    negocio: Negocio = Depends(get_authorized_negocio),
+    db: Session = Depends(get_read_db)
 ):
     """Obtiene análisis de ventas para un período"""
     
-    # Verificar permisos
-    negocio = db.query(Negocio).filter(
-        and_(
-            Negocio.id == negocio_id,
-            Negocio.propietario_id == current_user.id
-        )
-    ).first()
-    
-    if not negocio:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para ver el análisis de este negocio"
-        )
+    # Permisos verificados por get_authorized_negocio (propietario o empleado asignado)
     
     # Validar fechas
     if fecha_inicio > fecha_fin:
@@ -143,25 +110,12 @@ def obtener_analisis_ventas(
 @router.get("/alertas/stock/{negocio_id}")
 def obtener_alertas_stock(
     negocio_id: UUID,
-    current_user: Usuario = Depends(get_current_user),
+    negocio: Negocio = Depends(get_authorized_negocio),
     db: Session = Depends(get_db)
 ):
     """Obtiene alertas de stock bajo"""
     
-    # Verificar permisos
-    negocio = db.query(Negocio).filter(
-        and_(
-            Negocio.id == negocio_id,
-            Negocio.propietario_id == current_user.id
-        )
-    ).first()
-    
-    if not negocio:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para ver las alertas de este negocio"
-        )
-    
+    # Permisos verificados por get_authorized_negocio (propietario o empleado asignado)
     alertas = get_alertas_stock(db, negocio_id)
     return {"alertas": alertas, "total": len(alertas)}
 
@@ -169,25 +123,12 @@ def obtener_alertas_stock(
 def obtener_productos_por_vencer(
     negocio_id: UUID,
     dias_limite: int = Query(7, ge=1, le=30, description="Días límite para alerta de vencimiento"),
-    current_user: Usuario = Depends(get_current_user),
+    negocio: Negocio = Depends(get_authorized_negocio),
     db: Session = Depends(get_db)
 ):
     """Obtiene productos próximos a vencer"""
     
-    # Verificar permisos
-    negocio = db.query(Negocio).filter(
-        and_(
-            Negocio.id == negocio_id,
-            Negocio.propietario_id == current_user.id
-        )
-    ).first()
-    
-    if not negocio:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para ver las alertas de este negocio"
-        )
-    
+    # Permisos verificados por get_authorized_negocio (propietario o empleado asignado)
     productos = get_productos_por_vencer(db, negocio_id, dias_limite)
     return {"productos": productos, "total": len(productos)}
 
@@ -195,74 +136,35 @@ def obtener_productos_por_vencer(
 @router.post("/carrito/", response_model=CarritoCompraResponse)
 def crear_carrito(
     carrito_data: CarritoCompraCreate,
-    current_user: Usuario = Depends(get_current_user),
+    claims: TokenData = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     """Crea un nuevo carrito de compras"""
     
     # Verificar permisos del negocio
-    negocio = db.query(Negocio).filter(
-        and_(
-            Negocio.id == carrito_data.negocio_id,
-            Negocio.propietario_id == current_user.id
-        )
-    ).first()
-    
-    if not negocio:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para crear carritos en este negocio"
-        )
+    authorize_negocio(db, claims, carrito_data.negocio_id)
     
     carrito = create_carrito(db, carrito_data)
     return carrito
 
 @router.get("/carrito/{carrito_id}", response_model=CarritoCompraResponse)
 def obtener_carrito(
-    carrito_id: UUID,
-    current_user: Usuario = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    carrito: CarritoCompra = Depends(get_authorized_carrito)
 ):
     """Obtiene un carrito específico"""
-    carrito = get_carrito(db, carrito_id)
-    if not carrito:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carrito no encontrado"
-        )
-    
-    # Verificar permisos
-    if carrito.negocio.propietario_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para ver este carrito"
-        )
-    
+    # Carrito y negocio cargados en una sola consulta por get_authorized_carrito (404/403)
     return carrito
 
 @router.post("/carrito/{carrito_id}/items/", response_model=ItemCarritoResponse)
 def agregar_item_carrito(
     carrito_id: UUID,
     item_data: ItemCarritoCreate,
-    current_user: Usuario = Depends(get_current_user),
+    carrito: CarritoCompra = Depends(get_authorized_carrito),
     db: Session = Depends(get_db)
 ):
     """Añade un item al carrito"""
     
-    # Verificar permisos del carrito
-    carrito = get_carrito(db, carrito_id)
-    if not carrito:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carrito no encontrado"
-        )
-    
-    if carrito.negocio.propietario_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para modificar este carrito"
-        )
-    
+    # Carrito y negocio cargados en una sola consulta por get_authorized_carrito (404/403)
     try:
         item = add_item_to_carrito(db, carrito_id, item_data)
         return item
@@ -276,25 +178,12 @@ def agregar_item_carrito(
 def eliminar_item_carrito(
     carrito_id: UUID,
     item_id: UUID,
-    current_user: Usuario = Depends(get_current_user),
+    carrito: CarritoCompra = Depends(get_authorized_carrito),
     db: Session = Depends(get_db)
 ):
     """Elimina un item del carrito"""
     
-    # Verificar permisos del carrito
-    carrito = get_carrito(db, carrito_id)
-    if not carrito:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carrito no encontrado"
-        )
-    
-    if carrito.negocio.propietario_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para modificar este carrito"
-        )
-    
+    # Carrito y negocio cargados en una sola consulta por get_authorized_carrito (404/403)
     success = remove_item_from_carrito(db, carrito_id, item_id)
     if not success:
         raise HTTPException(
@@ -307,25 +196,12 @@ def eliminar_item_carrito(
 @router.delete("/carrito/{carrito_id}/limpiar")
 def limpiar_carrito(
     carrito_id: UUID,
-    current_user: Usuario = Depends(get_current_user),
+    carrito: CarritoCompra = Depends(get_authorized_carrito),
     db: Session = Depends(get_db)
 ):
     """Limpia todos los items del carrito"""
     
-    # Verificar permisos del carrito
-    carrito = get_carrito(db, carrito_id)
-    if not carrito:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carrito no encontrado"
-        )
-    
-    if carrito.negocio.propietario_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para modificar este carrito"
-        )
-    
+    # Carrito y negocio cargados en una sola consulta por get_authorized_carrito (404/403)
     clear_carrito(db, carrito_id)
     return {"message": "Carrito limpiado exitosamente"}
 
@@ -337,25 +213,13 @@ def finalizar_compra(
     descuento: float = Query(0.0, ge=0.0, description="Descuento total"),
     impuestos: float = Query(0.0, ge=0.0, description="Impuestos totales"),
     notas: Optional[str] = Query(None, description="Notas adicionales"),
-    current_user: Usuario = Depends(get_current_user),
+    carrito: CarritoCompra = Depends(get_authorized_carrito),
+    claims: TokenData = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     """Convierte un carrito en una venta"""
     
-    # Verificar permisos del carrito
-    carrito = get_carrito(db, carrito_id)
-    if not carrito:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carrito no encontrado"
-        )
-    
-    if carrito.negocio.propietario_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para finalizar este carrito"
-        )
-    
+    # Carrito y negocio cargados en una sola consulta por get_authorized_carrito (404/403)
     if not carrito.items:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -391,7 +255,7 @@ def finalizar_compra(
     )
     
     try:
-        venta = create_venta(db, venta_data, current_user.id)
+        venta = create_venta(db, venta_data, claims.user_uuid)
         
         # Marcar carrito como inactivo
         carrito.activo = False
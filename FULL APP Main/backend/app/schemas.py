@@ -1,7 +1,7 @@
 # backend/app/schemas.py
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict, AliasChoices
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, date
 from uuid import UUID
 from enum import Enum
@@ -77,6 +77,8 @@ class NegocioBase(BaseModel):
     tipo_negocio: BusinessType
     rubro: Optional[str] = None
     localizacion_geografica: Optional[str] = None
+    latitud: Optional[float] = Field(None, ge=-90, le=90, description="Si se omite, se estima desde localizacion_geografica")
+    longitud: Optional[float] = Field(None, ge=-180, le=180)
     fotos_urls: Optional[List[str]] = None
 
 class NegocioCreate(NegocioBase):
@@ -88,6 +90,8 @@ class NegocioUpdate(BaseModel):
     tipo_negocio: Optional[BusinessType] = None
     rubro: Optional[str] = None
     localizacion_geografica: Optional[str] = None
+    latitud: Optional[float] = Field(None, ge=-90, le=90)
+    longitud: Optional[float] = Field(None, ge=-180, le=180)
     fotos_urls: Optional[List[str]] = None
 
 class NegocioResponse(NegocioBase):
@@ -103,6 +107,9 @@ class NegocioResponse(NegocioBase):
     ventas_completadas: Optional[int] = Field(None, description="Número de ventas/transacciones completadas.")
     model_config = ConfigDict(from_attributes=True)
 
+class NegocioNearResponse(NegocioResponse):
+    distancia_km: float = Field(..., description="Distancia al punto de búsqueda en kilómetros")
+
 # Schemas para Producto
 class ProductoBase(BaseModel):
     nombre: str
@@ -147,6 +154,17 @@ class ProductoResponse(ProductoBase):
     ventas_completadas: Optional[int] = Field(None, description="Número de ventas/transacciones completadas.")
     model_config = ConfigDict(from_attributes=True)
 
+# Schema para la búsqueda pública (/public/search)
+class SearchResult(BaseModel):
+    tipo: str = Field(..., description="'producto' o 'negocio'")
+    id: UUID
+    nombre: str
+    negocio_id: Optional[UUID] = Field(None, description="Negocio al que pertenece (solo productos)")
+    precio: Optional[float] = None
+    rank: float = Field(..., description="Relevancia (ts_rank); mayor es más relevante")
+    snippet: str = Field(..., description="Fragmento con las coincidencias marcadas con <mark>...</mark>")
+    model_config = ConfigDict(from_attributes=True)
+
 # Schemas para Insumo
 class InsumoBase(BaseModel):
     nombre: str
@@ -220,6 +238,49 @@ class PublicidadResponse(PublicidadBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Schemas para la vitrina pública de un negocio (/public/businesses/{id}/storefront)
+class StorefrontProducto(BaseModel):
+    id: UUID
+    nombre: str
+    descripcion: Optional[str] = None
+    precio: float
+    precio_venta: Optional[float] = None
+    tipo_producto: ProductType
+    categoria: Optional[str] = None
+    unidad_venta: Optional[str] = None
+    stock_terminado: Optional[float] = None
+    estado_stock: Literal["disponible", "stock_bajo", "agotado"] = Field(
+        ..., description="Los servicios y productos digitales siempre están 'disponible'"
+    )
+    rating_promedio: float = 0.0
+    reviews_count: int = 0
+    alergenos: Optional[List[str]] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class StorefrontPublicidad(BaseModel):
+    # Sin el costo: la vitrina es pública
+    id: UUID
+    nombre: str
+    descripcion: Optional[str] = None
+    tipo_publicidad: PublicidadTipo
+    fecha_inicio: datetime
+    fecha_fin: datetime
+    item_publicitado_id: UUID
+    item_publicitado_tipo: str
+    model_config = ConfigDict(from_attributes=True)
+
+class StorefrontResumen(BaseModel):
+    total_productos: int
+    productos_disponibles: int = Field(..., description="Productos que no están agotados")
+    rating_promedio: Optional[float] = Field(None, description="Promedio de los productos ponderado por cantidad de reseñas")
+    total_reviews: int
+
+class StorefrontResponse(BaseModel):
+    negocio: NegocioResponse
+    productos: List[StorefrontProducto]
+    publicidades: List[StorefrontPublicidad] = Field(..., description="Publicidades vigentes del negocio y de sus productos")
+    resumen: StorefrontResumen
+
 # Schemas para autenticación
 class Token(BaseModel):
     access_token: str
@@ -229,6 +290,17 @@ class TokenData(BaseModel):
     user_id: Optional[str] = None
     email: Optional[str] = None
     tipo_tier: Optional[str] = None
+    # Claims versionados (cv >= 2): permiten autorizar por rol/negocio sin consultar la base
+    cv: Optional[int] = None  # Versión del formato de claims
+    tv: Optional[int] = None  # Usuario.token_version al emitir el token
+    rol: Optional[str] = None
+    negocio_asignado_id: Optional[str] = None
+    negocios: List[str] = []  # IDs de los negocios de los que es propietario
+    plugins_activos: List[str] = []
+
+    @property
+    def user_uuid(self) -> UUID:
+        return UUID(self.user_id)
 
 # Schema para registro de ventas (Capítulo Ñiam)
 class VentaCreate(BaseModel):
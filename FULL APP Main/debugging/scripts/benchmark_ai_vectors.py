@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark del motor de recomendación local (sin base de datos ni servidor).
+
+Arma un catálogo sintético de N productos con nombres, categorías y descripciones
+combinando un vocabulario de panadería/almacén, lo carga en un CatalogIndex (índice BM25
++ índice vectorial, como en /public/ai/recommend) y mide:
+
+  build      carga inicial de la instantánea (una vez)
+  upsert     modificación incremental de un producto (alta/edición vía crud/product)
+  similar    búsqueda vectorial top-K (coseno sobre la matriz), la recomendación sin modelo
+  bm25       preselección BM25 de candidatos para el prompt (comparación)
+
+Uso:
+    python benchmark_ai_vectors.py --products 100000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+# Agregar el directorio backend al path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+os.chdir(backend_path)
+
+from app.ai.catalog import CatalogIndex
+from app.models import ProductType
+
+PRODUCTOS = ["pan", "medialuna", "alfajor", "torta", "budín", "galletita", "chipá", "empanada", "tarta",
+             "pizza", "factura", "bizcochuelo", "brownie", "scon", "churro", "sándwich", "café", "licuado"]
+SABORES = ["chocolate", "dulce de leche", "limón", "vainilla", "frutilla", "queso", "jamón", "manzana",
+           "naranja", "coco", "maicena", "membrillo", "batata", "nuez", "avena", "integral", "sin tacc"]
+CATEGORIAS = ["panadería", "pastelería", "rotisería", "cafetería", "almacén", "vegano"]
+CONSULTAS = ["algo dulce para el desayuno", "torta de chocolate", "empanadas de jamon y queso", "alfajores",
+             "algo sin tacc", "merienda con cafe", "chocolat", "pan integral", "postre con frutilla", "regalo"]
+
+
+def build_rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    negocios = [(uuid4(), f"Negocio {i}") for i in range(max(1, count // 50))]
+    rows = []
+    for i in range(count):
+        negocio_id, negocio_nombre = rng.choice(negocios)
+        nombre = f"{rng.choice(PRODUCTOS).capitalize()} de {rng.choice(SABORES)}"
+        rows.append(SimpleNamespace(
+            id=uuid4(), nombre=nombre, descripcion=f"{nombre} casero con {rng.choice(SABORES)} y {rng.choice(SABORES)}",
+            categoria=rng.choice(CATEGORIAS), ingredientes=None, tipo_producto=ProductType.PHYSICAL_GOOD,
+            precio=float(rng.randint(100, 5000)), negocio_id=negocio_id, rating_promedio=rng.uniform(1, 5),
+            negocio_nombre=negocio_nombre,
+        ))
+    return rows
+
+
+def measure(label: str, fn, repeat: int):
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{label:<10} {statistics.median(timings):>11.2f} {p95:>9.2f} {timings[-1]:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del motor de recomendación local")
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=256)
+    args = parser.parse_args()
+
+    rows = build_rows(args.products)
+    catalog = CatalogIndex(sync_seconds=60, vector_dim=args.dim)
+    start = time.perf_counter()
+    for row in rows:
+        catalog._upsert(row)
+    build_seconds = time.perf_counter() - start
+    stats = catalog.stats()
+    print(f"Catálogo: {args.products} productos, vectores de {args.dim} posiciones "
+          f"({stats['vector_bytes'] / 2**20:.1f} MB); carga inicial {build_seconds:.1f} s\n")
+    print(f"{'operación':<10} {'mediana ms':>11} {'p95 ms':>9} {'máx ms':>9}")
+
+    rng = random.Random(11)
+    measure("upsert", lambda i: catalog._upsert(rng.choice(rows)), args.queries)
+    measure("similar", lambda i: catalog.similar(CONSULTAS[i % len(CONSULTAS)], args.k), args.queries)
+    measure("bm25", lambda i: catalog.search(CONSULTAS[i % len(CONSULTAS)], 30), args.queries)
+
+    print("\nEjemplos (similar):")
+    for consulta in CONSULTAS[:4]:
+        print(f"  {consulta!r}: {[entry.nombre for entry in catalog.similar(consulta, 3)]}")
+
+
+if __name__ == "__main__":
+    main()
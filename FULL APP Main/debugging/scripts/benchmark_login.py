@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark de login concurrente (bcrypt fuera del event loop).
+
+Lanza N logins simultáneos contra /users/login y, en paralelo, pings a "/" para medir
+cuánto se demoran las demás requests mientras se verifican contraseñas. Con el hashing
+en el event loop el p99 del ping crece junto con el de los logins; con el pool de
+hashing debe mantenerse en pocos milisegundos.
+
+Uso:
+    python benchmark_login.py --email user@example.com --password secreto --concurrency 50 --rounds 4
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+API_BASE_URL = "http://localhost:8000"
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+def timed_login(email: str, password: str):
+    start = time.perf_counter()
+    response = requests.post(
+        f"{API_BASE_URL}/users/login",
+        data={"username": email, "password": password},
+        timeout=120
+    )
+    return (time.perf_counter() - start) * 1000, response.status_code
+
+def ping_loop(stop: threading.Event, latencies: list):
+    session = requests.Session()
+    while not stop.is_set():
+        start = time.perf_counter()
+        session.get(f"{API_BASE_URL}/", timeout=30)
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de login concurrente")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=4, help="Tandas de logins concurrentes")
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    ping_latencies = []
+    pinger = threading.Thread(target=ping_loop, args=(stop, ping_latencies), daemon=True)
+    pinger.start()
+
+    login_latencies = []
+    errors = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.rounds):
+            results = list(pool.map(lambda _: timed_login(args.email, args.password), range(args.concurrency)))
+            login_latencies.extend(r[0] for r in results)
+            errors += sum(1 for r in results if r[1] != 200)
+    wall = time.perf_counter() - started
+    stop.set()
+    pinger.join()
+
+    total = args.concurrency * args.rounds
+    print(f"🏁 {total} logins ({args.concurrency} concurrentes) en {wall:.1f}s — {total / wall:.1f} logins/s, errores: {errors}")
+    print(f"{'':<10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, values in (("login", login_latencies), ("ping /", ping_latencies)):
+        print(f"{name:<10}{statistics.median(values):>10.1f}{percentile(values, 99):>10.1f}{max(values):>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de listados (sin base de datos ni servidor).
+
+Arma un catálogo sintético de N productos (objetos con atributos, como los que devuelve
+el ORM, cada uno con sus insumos asociados) y mide cuánto tarda cada camino en
+convertirlo en el cuerpo de la respuesta:
+
+  fastapi-default   model_validate por fila + jsonable_encoder + json.dumps
+                    (lo que hacía FastAPI con response_model=List[ProductoResponse])
+  orjson-response   lo mismo pero con ORJSONResponse (clase por defecto en main.py)
+  adapter-json      TypeAdapter(List[ProductoResponse]) en bloque -> JSON (core/serialization.py)
+  adapter-msgpack   TypeAdapter en bloque -> MessagePack (Accept: application/msgpack)
+
+Uso:
+    python benchmark_serialization.py --products 10000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+# Agregar el directorio backend al path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+os.chdir(backend_path)
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.core.serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, encode, validate
+from app.models import ProductType
+from app.schemas import ProductoResponse
+
+def build_catalog(count: int, insumos_per_product: int):
+    now = datetime.now(timezone.utc)
+    negocio_id, propietario_id = uuid4(), uuid4()
+    insumos = [
+        SimpleNamespace(
+            id=uuid4(), nombre=f"Insumo {i}", cantidad_disponible=100.0, unidad_medida_compra="kg",
+            costo_unitario_compra=1.5, usuario_id=propietario_id, fecha_creacion=now, fecha_actualizacion=now,
+        )
+        for i in range(insumos_per_product)
+    ]
+    products = []
+    for i in range(count):
+        producto_id = uuid4()
+        products.append(SimpleNamespace(
+            id=producto_id, nombre=f"Producto {i}", descripcion="Descripción de prueba " * 4,
+            precio=100.0 + i, tipo_producto=ProductType.PHYSICAL_GOOD, negocio_id=negocio_id,
+            propietario_id=propietario_id, precio_venta=150.0 + i, margen_ganancia_sugerido=30.0,
+            precio_sugerido=140.0, categoria="panaderia", stock_terminado=10.0, cogs=50.0,
+            margen_ganancia_real=None, fecha_creacion=now, fecha_actualizacion=now,
+            calificacion_promedio=4.5, ventas_completadas=i,
+            insumos_asociados=[
+                SimpleNamespace(insumo_id=insumo.id, cantidad_necesaria=0.5, producto_id=producto_id,
+                                fecha_asociacion=now, insumo=insumo)
+                for insumo in insumos
+            ],
+        ))
+    return products
+
+def fastapi_default(products) -> bytes:
+    dtos = [ProductoResponse.model_validate(p) for p in products]
+    return json.dumps(jsonable_encoder(dtos), ensure_ascii=False, separators=(",", ":")).encode()
+
+def orjson_response(products) -> bytes:
+    dtos = [ProductoResponse.model_validate(p) for p in products]
+    return ORJSONResponse(content=None).render(jsonable_encoder(dtos))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados")
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--insumos", type=int, default=2, help="Insumos asociados por producto")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    products = build_catalog(args.products, args.insumos)
+    adapter = TypeAdapter(list[ProductoResponse])
+    strategies = {
+        "fastapi-default": fastapi_default,
+        "orjson-response": orjson_response,
+        "adapter-json": lambda data: encode(adapter, validate(adapter, data), JSON_MEDIA_TYPE),
+        "adapter-msgpack": lambda data: encode(adapter, validate(adapter, data), MSGPACK_MEDIA_TYPE),
+    }
+
+    print(f"Catálogo: {args.products} productos x {args.insumos} insumos, {args.repeat} repeticiones\n")
+    print(f"{'camino':<18} {'mediana ms':>11} {'mín ms':>9} {'KB':>9} {'vs default':>11}")
+    baseline = None
+    for name, serialize in strategies.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            body = serialize(products)
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{name:<18} {median:>11.1f} {min(timings):>9.1f} {len(body) / 1024:>9.1f} {baseline / median:>10.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la capa de datos síncrona vs asíncrona.
+
+Requiere el backend corriendo con DB_ASYNC_ENABLED=True, de modo que los endpoints
+síncronos (/products/me) y asíncronos (/async/products/me) conviven en el mismo proceso.
+
+Uso:
+    python benchmark_sync_vs_async.py --email user@example.com --password secreto --concurrency 50 --requests 500
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+API_BASE_URL = "http://localhost:8000"
+
+ENDPOINTS = [
+    "/products/me",
+    "/businesses/me",
+    "/insumos/me",
+    "/public/products",
+]
+
+def login(email: str, password: str) -> str:
+    response = requests.post(
+        f"{API_BASE_URL}/users/login",
+        data={"username": email, "password": password},
+        timeout=30
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+def run_load(url: str, headers: dict, total: int, concurrency: int):
+    """Lanza `total` requests GET con `concurrency` hilos y devuelve las latencias en ms."""
+    session = requests.Session()
+
+    def one_request(_):
+        start = time.perf_counter()
+        response = session.get(url, headers=headers, timeout=60)
+        elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one_request, range(total)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    errors = sum(1 for r in results if r[1] >= 400)
+    return latencies, errors, wall
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async endpoints")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--async-prefix", default="/async")
+    args = parser.parse_args()
+
+    token = login(args.email, args.password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"🏁 Benchmark: {args.requests} requests, concurrencia {args.concurrency}\n")
+    print(f"{'endpoint':<28}{'modo':<7}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errores':>9}")
+    for endpoint in ENDPOINTS:
+        for mode, prefix in (("sync", ""), ("async", args.async_prefix)):
+            latencies, errors, wall = run_load(
+                f"{API_BASE_URL}{prefix}{endpoint}", headers, args.requests, args.concurrency
+            )
+            print(
+                f"{endpoint:<28}{mode:<7}{args.requests / wall:>9.1f}"
+                f"{statistics.median(latencies):>9.1f}{percentile(latencies, 99):>9.1f}{errors:>9}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# debugging/tests/test_ai_retrieval.py
+#
+# Preselección local de candidatos para /public/ai/recommend: tokenización, índice BM25
+# incremental, índice vectorial de la recomendación sin modelo y la instantánea del
+# catálogo (app/ai). No requiere base de datos.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_ai_retrieval.py
+
+import uuid
+from types import SimpleNamespace
+
+from app.ai.bm25 import BM25Index
+from app.ai.catalog import CatalogIndex
+from app.ai.text import tokenize
+from app.ai.vectors import VectorIndex
+from app.core.response_cache import invalidate_catalog
+from app.models import ProductType
+
+
+def test_tokenize_folds_accents_plurals_and_gender():
+    assert tokenize("Quiero algo DULCE para el desayuno") == tokenize("dulces desayunos")
+    assert tokenize("Alfajores de maicena") == tokenize("alfajor maicena")
+    assert tokenize("Café") == tokenize("cafe")
+    assert tokenize("rica") == tokenize("rico")
+
+
+def test_bm25_ranks_term_matches_and_prefers_rarer_terms():
+    index = BM25Index()
+    index.add("medialuna", tokenize("medialuna dulce de manteca"))
+    index.add("pan", tokenize("pan de campo"))
+    index.add("alfajor", tokenize("alfajor dulce de leche"))
+    index.add("torta", tokenize("torta de chocolate dulce"))
+
+    assert index.search(tokenize("pan"), k=5)[0][0] == "pan"
+    top = [doc_id for doc_id, _ in index.search(tokenize("dulce de leche"), k=5)]
+    assert top[0] == "alfajor"
+    assert set(top) == {"medialuna", "alfajor", "torta"}  # "de" es palabra vacía: pan no coincide
+    assert index.search(tokenize("empanada"), k=5) == []
+
+
+def test_bm25_incremental_update_and_remove():
+    index = BM25Index()
+    index.add("a", tokenize("pan de campo"))
+    index.add("b", tokenize("budin de limon"))
+
+    index.add("a", tokenize("torta de limon"))  # modificación: reemplaza el documento
+    assert index.search(tokenize("campo"), k=5) == []
+    assert {doc_id for doc_id, _ in index.search(tokenize("limon"), k=5)} == {"a", "b"}
+
+    assert index.remove("b")
+    assert not index.remove("b")
+    assert [doc_id for doc_id, _ in index.search(tokenize("limon"), k=5)] == ["a"]
+    assert len(index) == 1
+
+
+def test_vectors_match_partial_words_and_update_incrementally():
+    # Dimensión alta: sin colisiones del hashing entre estos pocos documentos
+    index = VectorIndex(dim=4096, capacity=2)
+    index.add("torta", tokenize("torta de chocolate amargo"))
+    index.add("pan", tokenize("pan de campo"))
+    index.add("budin", tokenize("budin de limon"))  # supera la capacidad inicial: la matriz crece
+
+    assert index.search(tokenize("chocolatada"), k=3)[0][0] == "torta"
+    assert index.search(tokenize("panes"), k=1)[0][0] == "pan"
+    assert index.search(tokenize("xyzw"), k=3) == []
+
+    index.add("pan", tokenize("pan dulce de leche"))  # modificación: reemplaza el vector
+    assert "pan" not in [doc_id for doc_id, _ in index.search(tokenize("campo"), k=3)]
+    assert index.remove("budin")
+    assert index.search(tokenize("limon"), k=3) == []
+    index.add("alfajor", tokenize("alfajor de maicena"))  # reutiliza la fila liberada
+    assert len(index) == 3 and index.nbytes == 4 * 4096 * 4
+
+
+def _row(nombre, descripcion="", rating=0.0):
+    return SimpleNamespace(
+        id=uuid.uuid4(), nombre=nombre, descripcion=descripcion, categoria=None, ingredientes=None,
+        tipo_producto=ProductType.PHYSICAL_GOOD, precio=100.0, negocio_id=uuid.uuid4(),
+        rating_promedio=rating, negocio_nombre="Panadería",
+    )
+
+
+def test_catalog_shortlists_by_relevance_and_falls_back_to_best_rated():
+    catalog = CatalogIndex(sync_seconds=60)
+    rows = [_row("Medialunas", "dulces de manteca", rating=4.0), _row("Pan de campo", rating=3.0), _row("Chipá", rating=5.0)]
+    for row in rows:
+        catalog._upsert(row)
+
+    assert [entry.nombre for entry in catalog.search("algo dulce para el desayuno", k=2)] == ["Medialunas"]
+    assert [entry.nombre for entry in catalog.search("un regalo", k=2)] == ["Chipá", "Medialunas"]
+    assert catalog.negocio_nombre(rows[0].negocio_id) == "Panadería"
+    assert [entry.nombre for entry in catalog.similar("medialuna", k=2)] == ["Medialunas"]
+
+
+def test_only_prompt_relevant_changes_mark_the_catalog_changed():
+    catalog = CatalogIndex(sync_seconds=60)
+    row = _row("Medialunas", "dulces de manteca", rating=4.0)
+    catalog._upsert(row)
+
+    catalog._changed = False
+    catalog._upsert(SimpleNamespace(**{**vars(row), "rating_promedio": 4.5}))  # venta / calificación
+    assert not catalog._changed
+    assert catalog.search("medialuna", k=1)[0].rating == 4.5
+
+    for change in ({"precio": 120.0}, {"descripcion": "saladas"}, {"negocio_nombre": "Otra panadería"}):
+        catalog._changed = False
+        catalog._upsert(SimpleNamespace(**{**vars(row), **change}))
+        assert catalog._changed, change
+
+
+def test_catalog_resolves_names_without_the_database():
+    catalog = CatalogIndex(sync_seconds=60)
+    mejor, candidata = _row("Alfajor de maicena", rating=5.0), _row("ALFAJOR DE MAICENA", rating=1.0)
+    for row in (mejor, candidata):
+        catalog._upsert(row)
+
+    assert catalog.resolve_name("alfajor de maicena") == mejor.id
+    assert catalog.resolve_name("Alfajor de maicena", prefer=[candidata.id]) == candidata.id
+    assert catalog.resolve_name("Budín") is None
+
+    catalog._upsert(SimpleNamespace(**{**vars(mejor), "nombre": "Budín"}))  # renombrado
+    catalog._remove(candidata.id)
+    assert catalog.resolve_name("alfajor de maicena") is None
+    assert catalog.resolve_name("budin") == mejor.id
+
+
+def test_catalog_writes_are_queued_for_the_next_refresh():
+    from app.ai import catalog_index
+
+    producto_id, negocio_id = uuid.uuid4(), uuid.uuid4()
+    invalidate_catalog(negocio_id, [producto_id])
+    invalidate_catalog(negocio_id, business_changed=True)
+    try:
+        assert producto_id in catalog_index._pending_productos
+        assert negocio_id in catalog_index._pending_negocios
+    finally:
+        catalog_index._pending_productos.discard(producto_id)
+        catalog_index._pending_negocios.discard(negocio_id)
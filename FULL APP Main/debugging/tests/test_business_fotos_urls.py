@@ -0,0 +1,98 @@
+# debugging/tests/test_business_fotos_urls.py
+#
+# negocios.fotos_urls es VARCHAR[] (migración v0010): las lecturas devuelven la lista tal
+# cual llega del driver, sin modificar las instancias ni ensuciar la sesión.
+# Los tests con base de datos se omiten si no está disponible.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_business_fotos_urls.py
+
+import uuid
+
+import pytest
+from sqlalchemy import ARRAY, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.auth import get_password_hash
+from app.crud import business as crud_business
+from app.database import engine, SessionLocal
+from app.migrations import load_migrations
+from app.models import BusinessType, Negocio, UserTier, Usuario
+from app.schemas import NegocioCreate
+
+
+def test_fotos_urls_is_an_array_column():
+    column = Negocio.__table__.c.fotos_urls
+    assert isinstance(column.type, ARRAY)
+    assert not column.nullable
+
+
+def test_conversion_migration_runs_outside_a_single_transaction():
+    migration = next(m for m in load_migrations() if m.version == 10)
+    assert not migration.transactional
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT 1"))
+    except OperationalError:
+        session.close()
+        pytest.skip("Base de datos no disponible")
+    suffix = uuid.uuid4().hex[:8]
+    user = Usuario(
+        email=f"fotos-test-{suffix}@example.com",
+        nombre="Fotos Test",
+        hashed_password=get_password_hash("test1234"),
+        tipo_tier=UserTier.MICROEMPRENDIMIENTO,
+        plugins_activos=[]
+    )
+    session.add(user)
+    session.commit()
+    try:
+        yield session, user
+    finally:
+        session.rollback()
+        for negocio in session.query(Negocio).filter(Negocio.propietario_id == user.id).all():
+            session.delete(negocio)
+        session.delete(user)
+        session.commit()
+        session.close()
+
+
+def test_create_stores_list_and_defaults_to_empty(db):
+    session, user = db
+    con_fotos = crud_business.create_business(session, user.id, NegocioCreate(
+        nombre="Con fotos", tipo_negocio=BusinessType.PRODUCTOS, fotos_urls=["https://a/1.png", "https://a/2.png"]
+    ))
+    sin_fotos = crud_business.create_business(session, user.id, NegocioCreate(
+        nombre="Sin fotos", tipo_negocio=BusinessType.PRODUCTOS
+    ))
+    session.expire_all()
+
+    assert crud_business.get_business_by_id(session, con_fotos.id).fotos_urls == ["https://a/1.png", "https://a/2.png"]
+    assert crud_business.get_business_by_id(session, sin_fotos.id).fotos_urls == []
+
+
+def test_reads_do_not_dirty_the_session(db):
+    session, user = db
+    crud_business.create_business(session, user.id, NegocioCreate(
+        nombre="Lectura", tipo_negocio=BusinessType.PRODUCTOS, fotos_urls=["https://a/1.png"]
+    ))
+    session.expire_all()
+
+    negocios = crud_business.get_businesses_by_user_id(session, user.id)
+    crud_business.get_all_businesses(session)
+    assert [n.fotos_urls for n in negocios] == [["https://a/1.png"]]
+    assert not session.dirty
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert not any(statement.lstrip().upper().startswith("UPDATE") for statement in statements)
@@ -0,0 +1,56 @@
+# debugging/tests/test_geo.py
+#
+# Geohash y gazetteer offline (app/geo) usados por /public/businesses/near.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_geo.py
+
+import random
+
+import pytest
+
+from app.geo.gazetteer import geocode
+from app.geo.geohash import cells_covering, encode, haversine_km
+from app.geo.locate import locate_business
+from app.models import Negocio
+
+OBELISCO = (-34.6037, -58.3816)
+
+
+def test_encode_matches_reference_value():
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+@pytest.mark.parametrize("radius_km", [0.5, 2, 5, 20, 50])
+def test_covering_cells_contain_every_point_within_the_radius(radius_km):
+    lat, lon = OBELISCO
+    cells = cells_covering(lat, lon, radius_km)
+    rng = random.Random(radius_km)
+    for _ in range(500):
+        point = (lat + rng.uniform(-1, 1) * radius_km / 111.0, lon + rng.uniform(-1, 1) * radius_km / 90.0)
+        if haversine_km(lat, lon, *point) <= radius_km:
+            assert any(encode(*point).startswith(cell) for cell in cells)
+
+
+def test_haversine_buenos_aires_to_cordoba():
+    assert haversine_km(*OBELISCO, -31.4201, -64.1888) == pytest.approx(647, abs=5)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("CABA, Argentina", "Ciudad Autónoma de Buenos Aires"),
+    ("Córdoba, Argentina", "Córdoba"),
+    ("Av. Corrientes 1234, Balvanera, CABA", "Balvanera"),
+    ("nunez", "Núñez"),
+])
+def test_gazetteer_resolves_most_specific_known_place(text, expected):
+    assert geocode(text).nombre == expected
+
+
+def test_unknown_location_is_not_geocoded():
+    assert geocode("Atlántida perdida") is None
+    assert geocode(None) is None
+
+
+def test_explicit_coordinates_win_over_location_text():
+    negocio = Negocio(localizacion_geografica="Córdoba, Argentina", latitud=OBELISCO[0], longitud=OBELISCO[1])
+    assert locate_business(negocio, coordinates_given=True, location_changed=True)
+    assert negocio.latitud == OBELISCO[0]
+    assert negocio.geohash == encode(*OBELISCO)
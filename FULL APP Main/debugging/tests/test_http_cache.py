@@ -0,0 +1,54 @@
+# debugging/tests/test_http_cache.py
+#
+# GET condicional de los endpoints públicos (app/core/http_cache.py).
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_http_cache.py
+
+from datetime import datetime, timezone
+
+from fastapi import Request, Response
+
+from app.core.http_cache import conditional_response, make_etag
+
+UPDATED = datetime(2025, 7, 9, 18, 30, 12, 345678, tzinfo=timezone.utc)
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw, "query_string": b""})
+
+
+def test_etag_changes_with_version_and_variant():
+    etag = make_etag("productos", UPDATED, 10)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert make_etag("productos", UPDATED, 10) == etag
+    assert make_etag("productos", UPDATED, 9) != etag  # una fila borrada
+    assert make_etag("productos", UPDATED, 10, "page=2") != etag
+
+
+def test_matching_if_none_match_returns_304_with_validators():
+    etag = make_etag("negocios", UPDATED, 3)
+    response = Response()
+    not_modified = conditional_response(_request(if_none_match=f'W/{etag}, "otro"'), response, etag)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert response.headers["etag"] == etag
+
+
+def test_stale_etag_gets_full_response():
+    response = Response()
+    assert conditional_response(_request(if_none_match='"viejo"'), response, make_etag("negocios", UPDATED, 3)) is None
+    assert "etag" in response.headers
+
+
+def test_if_modified_since_uses_second_resolution():
+    response = Response()
+    etag = make_etag("negocios", UPDATED, 1, "id")
+    request = _request(if_modified_since="Wed, 09 Jul 2025 18:30:12 GMT")
+    assert conditional_response(request, response, etag, last_modified=UPDATED).status_code == 304
+    assert response.headers["last-modified"] == "Wed, 09 Jul 2025 18:30:12 GMT"
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    etag = make_etag("negocios", UPDATED, 1, "id")
+    request = _request(if_none_match='"viejo"', if_modified_since="Wed, 09 Jul 2025 18:30:12 GMT")
+    assert conditional_response(request, Response(), etag, last_modified=UPDATED) is None
@@ -0,0 +1,118 @@
+# debugging/tests/test_llm_client.py
+#
+# Cliente asíncrono del proveedor del modelo (app/ai/llm_client.py) contra un servidor
+# HTTP local que imita generateContent: reintentos ante 429/5xx, errores que no se
+# reintentan y circuit breaker. No requiere base de datos ni API key real.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_llm_client.py
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from app.ai.llm_client import CircuitBreaker, GeminiClient, LLMError, LLMUnavailable
+
+
+class _StubGemini(BaseHTTPRequestHandler):
+    # Códigos a devolver en orden; al agotarse, 200
+    script = []
+    paths = []
+
+    def do_POST(self):
+        type(self).paths.append(self.path)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        code = type(self).script.pop(0) if type(self).script else 200
+        body = {"candidates": [{"content": {"parts": [{"text": '{"ok": true}'}]}}]} if code == 200 else {"error": code}
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGemini)
+    _StubGemini.script, _StubGemini.paths = [], []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1beta"
+    server.shutdown()
+    server.server_close()
+
+
+def _client(base_url, api_key="test", failures=2):
+    return GeminiClient(
+        base_url=base_url, api_key=api_key, model="gemini-2.0-flash", timeout_seconds=2,
+        max_connections=2, max_concurrency=2, max_retries=2, backoff_seconds=0.001,
+        breaker=CircuitBreaker(failure_threshold=failures, reset_seconds=60),
+    )
+
+
+def _generate(client, times=1):
+    async def scenario():
+        try:
+            return [await client.generate("hola") for _ in range(times)]
+        finally:
+            await client.aclose()
+    return asyncio.run(scenario())
+
+
+def test_retries_429_and_5xx_then_succeeds(stub_server):
+    _StubGemini.script = [429, 503]
+    client = _client(stub_server)
+    assert _generate(client) == ['{"ok": true}']
+    assert _StubGemini.paths[0] == "/v1beta/models/gemini-2.0-flash:generateContent?key=test"
+    stats = client.stats()
+    assert (stats["requests"], stats["retries"], stats["circuit"]) == (3, 2, "closed")
+
+
+def test_client_errors_are_not_retried(stub_server):
+    _StubGemini.script = [400]
+    client = _client(stub_server)
+    with pytest.raises(LLMError) as exc:
+        _generate(client)
+    assert not isinstance(exc.value, LLMUnavailable)
+    assert client.stats()["requests"] == 1
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast(stub_server):
+    _StubGemini.script = [500] * 6
+    client = _client(stub_server, failures=2)
+    for _ in range(2):
+        with pytest.raises(LLMUnavailable):
+            _generate(client)
+    assert client.stats()["circuit"] == "open"
+
+    with pytest.raises(LLMUnavailable):
+        _generate(client)
+    stats = client.stats()
+    assert (stats["requests"], stats["short_circuits"]) == (6, 1)
+
+
+def test_breaker_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    breaker.reset_seconds = 60
+    breaker._opened_at -= 60
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_without_api_key_or_server_the_provider_is_unavailable():
+    with pytest.raises(LLMUnavailable):
+        _generate(_client("http://127.0.0.1:9", api_key=None))
+    with pytest.raises(LLMUnavailable):
+        _generate(_client("http://127.0.0.1:9"))  # conexión rechazada en cada intento
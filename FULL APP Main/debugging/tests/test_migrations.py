@@ -0,0 +1,25 @@
+# debugging/tests/test_migrations.py
+#
+# Verifica la consistencia de las migraciones versionadas (app/migrations/versions).
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_migrations.py
+
+from app.migrations import head_version, load_migrations
+
+
+def test_versions_are_contiguous_and_match_module_names():
+    migrations = load_migrations()
+    assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+    for migration in migrations:
+        assert migration.module.startswith(f"v{migration.version:04d}_")
+        assert migration.description
+
+
+def test_head_version_is_last_migration():
+    assert head_version() == load_migrations()[-1].version
+
+
+def test_index_migrations_on_live_tables_do_not_block_writes():
+    # Índices sobre productos/negocios/ventas: CONCURRENTLY, que no corre dentro de una transacción
+    migrations = {m.version: m for m in load_migrations()}
+    for version in (5, 6, 8, 9):
+        assert not migrations[version].transactional, migrations[version].module
@@ -0,0 +1,52 @@
+# debugging/tests/test_ownership_dependencies.py
+#
+# Las rutas de /ventas con {negocio_id}, {carrito_id} o {venta_id} deben autorizar con las
+# dependencias compartidas de app.dependencies (una consulta, 404/403 consistentes).
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_ownership_dependencies.py
+
+import uuid
+
+from app.main import app
+from app.dependencies import (
+    get_authorized_carrito, get_authorized_negocio, get_authorized_venta, is_negocio_member,
+    get_current_claims_async, get_current_user_async
+)
+from app.models import Negocio
+from app.routers.async_router import router as async_router
+from app.schemas import TokenData
+
+EXPECTED = {
+    "{carrito_id}": get_authorized_carrito,
+    "{negocio_id}": get_authorized_negocio,
+    "{venta_id}": get_authorized_venta,
+}
+
+
+def test_venta_routes_use_shared_ownership_dependencies():
+    for route in app.routes:
+        path = getattr(route, "path", "")
+        if not path.startswith("/ventas/"):
+            continue
+        calls = {sub.call for sub in route.dependant.dependencies}
+        for placeholder, dependency in EXPECTED.items():
+            if placeholder in path:
+                assert dependency in calls, f"{path} no usa {dependency.__name__}"
+
+
+def test_async_venta_routes_authorize_members_like_the_sync_stack():
+    # Sin el chequeo solo-propietario: los empleados asignados también operan el POS
+    for route in async_router.routes:
+        if not route.path.startswith("/ventas/"):
+            continue
+        calls = {sub.call for sub in route.dependant.dependencies}
+        assert get_current_claims_async in calls, f"{route.path} no usa get_current_claims_async"
+        assert get_current_user_async not in calls
+
+
+def test_owner_and_assigned_employee_are_members():
+    owner_id, employee_id = uuid.uuid4(), uuid.uuid4()
+    negocio = Negocio(id=uuid.uuid4(), propietario_id=owner_id)
+
+    assert is_negocio_member(TokenData(user_id=str(owner_id)), negocio)
+    assert is_negocio_member(TokenData(user_id=str(employee_id), negocio_asignado_id=str(negocio.id)), negocio)
+    assert not is_negocio_member(TokenData(user_id=str(employee_id), negocio_asignado_id=str(uuid.uuid4())), negocio)
@@ -0,0 +1,62 @@
+# debugging/tests/test_pagination.py
+#
+# Cursores de paginación keyset (app/core/pagination.py).
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_pagination.py
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.core.pagination import (
+    TOTAL_COUNT_APPROXIMATE_HEADER,
+    TOTAL_COUNT_HEADER,
+    decode_datetime_id_cursor,
+    encode_cursor,
+    set_total_count,
+)
+from app.crud.product import PUBLIC_PRODUCT_SORTS
+from app.models import Producto
+
+
+def test_datetime_id_cursor_round_trip():
+    fecha = datetime(2025, 7, 9, 18, 30, 12, 345678, tzinfo=timezone.utc)
+    venta_id = uuid.uuid4()
+    assert decode_datetime_id_cursor(encode_cursor(fecha, venta_id)) == (fecha, venta_id)
+
+
+def test_missing_cursor_means_first_page():
+    assert decode_datetime_id_cursor(None) is None
+    assert decode_datetime_id_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!", encode_cursor("x"), encode_cursor("2025-01-01", "no-uuid")])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_datetime_id_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_total_count_headers():
+    response = Response()
+    set_total_count(response, 1234, approximate=True)
+    assert response.headers[TOTAL_COUNT_HEADER] == "1234"
+    assert response.headers[TOTAL_COUNT_APPROXIMATE_HEADER] == "true"
+
+
+@pytest.mark.parametrize("sort", sorted(PUBLIC_PRODUCT_SORTS))
+def test_public_product_sorts_end_with_id_tiebreaker(sort):
+    # Sin desempate único, offset/limit puede repetir u omitir filas entre páginas
+    assert PUBLIC_PRODUCT_SORTS[sort][-1].element.compare(Producto.__table__.c.id)
+
+
+def test_async_public_products_mirror_the_sync_paging_and_filters():
+    from app.routers import async_router, public_router
+
+    def query_params(router):
+        route = next(r for r in router.routes if getattr(r, "path", "").endswith("/products") and "GET" in r.methods)
+        return {param.name for param in route.dependant.query_params}
+
+    assert "page_size" in query_params(public_router.router)
+    assert query_params(async_router.router) == query_params(public_router.router)
@@ -0,0 +1,53 @@
+# debugging/tests/test_principal_cache.py
+#
+# Cache del usuario autenticado (app/core/principal_cache.py) y TTLCache.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_principal_cache.py
+
+import time
+import uuid
+
+from app.core.cache import TTLCache
+from app.core.principal_cache import (
+    cache_principal, get_cached_principal, invalidate_principal, principal_cache
+)
+from app.models import Usuario, UserTier
+
+
+def test_ttl_cache_lru_eviction_and_expiry():
+    cache = TTLCache(max_entries=2, ttl_seconds=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1      # "a" pasa a ser la más reciente
+    cache.set("c", 3)               # se descarta "b"
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] >= 1
+
+
+def _user():
+    return Usuario(
+        id=uuid.uuid4(),
+        email="principal@example.com",
+        nombre="Principal",
+        hashed_password="x",
+        tipo_tier=UserTier.MICROEMPRENDIMIENTO,
+        plugins_activos=["niam"],
+    )
+
+
+def test_hit_returns_independent_copy_and_invalidation_drops_all_tokens():
+    principal_cache.clear()
+    user = _user()
+    cache_principal(user.id, "token-1", user)
+    cache_principal(user.id, "token-2", user)
+
+    cached = get_cached_principal(user.id, "token-1")
+    assert cached is not user
+    assert cached.email == user.email
+    cached.plugins_activos.append("otro")
+    assert get_cached_principal(user.id, "token-1").plugins_activos == ["niam"]
+
+    assert invalidate_principal(user.id) == 2
+    assert get_cached_principal(user.id, "token-2") is None
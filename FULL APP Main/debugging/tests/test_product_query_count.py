@@ -0,0 +1,145 @@
+# debugging/tests/test_product_query_count.py
+#
+# Regresión N+1: la cantidad de consultas SQL de los listados de productos no debe
+# depender del tamaño del catálogo (insumos_asociados -> insumo se cargan con selectinload;
+# la vitrina del negocio se arma con dos consultas; las recomendaciones de la IA se
+# resuelven con una sola consulta IN).
+# Requiere la base de datos de desarrollo; si no está disponible se omite.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_product_query_count.py
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.main import app
+from app.database import engine, SessionLocal
+from app.auth import create_access_token, get_password_hash
+from app.ai import catalog_index, gemini_client
+from app.core.response_cache import response_cache
+from app.models import BusinessType, Insumo, Negocio, Producto, ProductoInsumo, ProductType, UserTier, Usuario
+
+
+@pytest.fixture
+def catalog():
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    except OperationalError:
+        db.close()
+        pytest.skip("Base de datos no disponible")
+    suffix = uuid.uuid4().hex[:8]
+    user = Usuario(
+        email=f"n1-test-{suffix}@example.com",
+        nombre="N+1 Test",
+        hashed_password=get_password_hash("test1234"),
+        tipo_tier=UserTier.MICROEMPRENDIMIENTO,
+        plugins_activos=[]
+    )
+    db.add(user)
+    db.flush()
+    negocio = Negocio(nombre=f"N+1 {suffix}", tipo_negocio=BusinessType.PRODUCTOS, propietario_id=user.id)
+    insumo = Insumo(nombre="Harina", cantidad_disponible=100, unidad_medida_compra="kg", costo_unitario_compra=1.5, usuario_id=user.id)
+    db.add_all([negocio, insumo])
+    db.commit()
+
+    def add_products(count):
+        for i in range(count):
+            producto = Producto(
+                nombre=f"Pan {i}", precio=10.0, tipo_producto=ProductType.PHYSICAL_GOOD,
+                negocio_id=negocio.id, propietario_id=user.id
+            )
+            producto.insumos_asociados.append(ProductoInsumo(insumo_id=insumo.id, cantidad_necesaria=0.5))
+            db.add(producto)
+        db.commit()
+
+    try:
+        yield user, negocio, add_products
+    finally:
+        db.rollback()
+        for producto in db.query(Producto).filter(Producto.negocio_id == negocio.id).all():
+            db.delete(producto)
+        db.delete(insumo)
+        db.delete(negocio)
+        db.delete(user)
+        db.commit()
+        db.close()
+
+
+def _count_queries(client, url, headers=None, json=None):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        if json is None:
+            response = client.get(url, headers=headers or {})
+        else:
+            response = client.post(url, headers=headers or {}, json=json)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+def test_my_products_query_count_is_independent_of_catalog_size(catalog):
+    user, _, add_products = catalog
+    token = create_access_token(data={"user_id": str(user.id), "email": user.email, "tipo_tier": user.tipo_tier.value})
+    headers = {"Authorization": f"Bearer {token}"}
+    with TestClient(app) as client:
+        add_products(2)
+        _count_queries(client, "/products/me", headers)  # calienta el cache del principal
+        small = _count_queries(client, "/products/me", headers)
+        add_products(8)
+        large = _count_queries(client, "/products/me", headers)
+    assert small == large
+
+
+def test_public_products_query_count_is_independent_of_catalog_size(catalog, monkeypatch):
+    _, negocio, add_products = catalog
+    monkeypatch.setattr(response_cache, "backend", None)  # medir la base, no el cache de respuestas
+    url = f"/public/products?negocio_id={negocio.id}"
+    with TestClient(app) as client:
+        add_products(2)
+        small = _count_queries(client, url)
+        add_products(8)
+        large = _count_queries(client, url)
+    assert small == large
+
+
+def test_storefront_query_count_is_independent_of_catalog_size(catalog, monkeypatch):
+    _, negocio, add_products = catalog
+    monkeypatch.setattr(response_cache, "backend", None)
+    url = f"/public/businesses/{negocio.id}/storefront"
+    with TestClient(app) as client:
+        add_products(2)
+        small = _count_queries(client, url)
+        add_products(8)
+        large = _count_queries(client, url)
+        body = client.get(url).json()
+    assert small == large
+    assert body["resumen"]["total_productos"] == 10
+    assert {producto["estado_stock"] for producto in body["productos"]} == {"agotado"}  # stock_terminado por defecto: 0
+
+
+def test_ai_recommendations_resolve_in_one_query(catalog, monkeypatch):
+    _, _, add_products = catalog
+    monkeypatch.setattr(gemini_client, "api_key", None)  # alternativa local: sin llamar al proveedor
+    monkeypatch.setattr(catalog_index, "sync_seconds", 0)  # el fixture escribe sin pasar por crud
+    url, body = "/public/ai/recommend", {"query": "Pan"}
+    with TestClient(app) as client:
+        add_products(1)
+        _count_queries(client, url, json=body)  # construye la instantánea del catálogo
+        add_products(1)
+        small = _count_queries(client, url, json=body)
+        add_products(8)
+        large = _count_queries(client, url, json=body)
+        result = client.post(url, json=body).json()
+    assert small == large
+    recomendados = [result["producto_preferencial"]] + result["otras_recomendaciones"]
+    assert len(recomendados) == 5
+    assert len({producto["id"] for producto in recomendados}) == 5
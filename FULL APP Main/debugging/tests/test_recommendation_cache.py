@@ -0,0 +1,111 @@
+# debugging/tests/test_recommendation_cache.py
+#
+# Cache de respuestas del modelo para /public/ai/recommend (app/ai/recommendation_cache.py):
+# clave por consulta normalizada, frescura por versión del catálogo y TTL,
+# stale-while-revalidate, un solo cálculo por clave y métricas. No requiere base de datos.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_recommendation_cache.py
+
+import asyncio
+
+from app.ai.recommendation_cache import RecommendationCache, normalize_query
+
+
+class _Model:
+    """Reemplazo de call_gemini_api que cuenta las llamadas."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay)
+        return {"llamada": call}
+
+
+async def _settle(cache):
+    while cache._inflight:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+def test_equivalent_queries_share_an_entry():
+    assert normalize_query("Quiero algo DULCE para el desayuno") == normalize_query("desayunos dulces")
+    assert normalize_query("pan de campo") != normalize_query("pan")
+
+    async def scenario():
+        cache, model = RecommendationCache(max_entries=10, ttl_seconds=60, stale_seconds=60), _Model()
+        assert await cache.get_or_compute("algo dulce para el desayuno", 1, model) == {"llamada": 1}
+        assert await cache.get_or_compute("Desayuno dulce", 1, model) == {"llamada": 1}
+        return cache, model
+
+    cache, model = asyncio.run(scenario())
+    assert model.calls == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+
+def test_concurrent_misses_make_a_single_call():
+    async def scenario():
+        cache, model = RecommendationCache(max_entries=10, ttl_seconds=60, stale_seconds=60), _Model(delay=0.01)
+        results = await asyncio.gather(*(cache.get_or_compute("pan", 1, model) for _ in range(5)))
+        return results, model
+
+    results, model = asyncio.run(scenario())
+    assert model.calls == 1
+    assert results == [{"llamada": 1}] * 5
+
+
+def test_new_catalog_version_serves_stale_and_revalidates_once():
+    async def scenario():
+        cache, model = RecommendationCache(max_entries=10, ttl_seconds=60, stale_seconds=60), _Model(delay=0.01)
+        await cache.get_or_compute("pan", 1, model)
+        assert await cache.get_or_compute("pan", 2, model) == {"llamada": 1}
+        assert await cache.get_or_compute("pan", 2, model) == {"llamada": 1}
+        assert cache.stats()["in_flight"] == 1
+        await _settle(cache)
+        assert await cache.get_or_compute("pan", 2, model) == {"llamada": 2}
+        return cache, model
+
+    cache, model = asyncio.run(scenario())
+    assert model.calls == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"], stats["revalidations"]) == (1, 2, 1, 1)
+
+
+def test_failed_revalidation_keeps_the_stale_entry():
+    async def ok():
+        return {"ok": True}
+
+    async def failing():
+        raise RuntimeError("proveedor caído")
+
+    async def scenario():
+        cache = RecommendationCache(max_entries=10, ttl_seconds=60, stale_seconds=60)
+        await cache.get_or_compute("pan", 1, ok)
+        assert await cache.get_or_compute("pan", 2, failing) == {"ok": True}
+        await _settle(cache)
+        assert await cache.get_or_compute("pan", 2, failing) == {"ok": True}
+        await _settle(cache)
+        return cache
+
+    assert asyncio.run(scenario()).stats()["revalidation_errors"] == 2
+
+
+def test_lru_eviction_and_disabled_cache():
+    async def scenario():
+        cache, model = RecommendationCache(max_entries=2, ttl_seconds=60, stale_seconds=0), _Model()
+        for query in ("pan", "torta", "pan", "alfajor"):
+            await cache.get_or_compute(query, 1, model)
+        assert model.calls == 3
+        assert cache.stats()["evictions"] == 1
+        await cache.get_or_compute("pan", 1, model)  # usada hace poco: sigue en cache
+        assert model.calls == 3
+
+        disabled, model = RecommendationCache(max_entries=10, ttl_seconds=0, stale_seconds=60), _Model()
+        await disabled.get_or_compute("pan", 1, model)
+        await disabled.get_or_compute("pan", 1, model)
+        assert model.calls == 2
+
+    asyncio.run(scenario())
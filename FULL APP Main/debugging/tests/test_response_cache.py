@@ -0,0 +1,116 @@
+# debugging/tests/test_response_cache.py
+#
+# Cache de respuestas públicas (app/core/response_cache.py) con ambos backends.
+# El backend Redis se prueba con un cliente en memoria que habla el mismo subconjunto
+# del protocolo (get / set con ex / incr).
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_response_cache.py
+
+import uuid
+
+import pytest
+
+from app.core import response_cache as response_cache_module
+from app.core.response_cache import (
+    CachedResponse,
+    MemoryBackend,
+    RedisBackend,
+    ResponseCache,
+    business_scope,
+    product_scope,
+    products_scope,
+    storefront_scope,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b"0")) + 1).encode()
+        return int(self.data[key])
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    backend = MemoryBackend(max_entries=100, ttl_seconds=60) if request.param == "memory" else RedisBackend(FakeRedis())
+    return ResponseCache(backend, ttl_seconds=60)
+
+
+def _response(body: bytes) -> CachedResponse:
+    return CachedResponse(body=body, headers={"etag": '"abc"', "x-total-count": "1"})
+
+
+def test_round_trip_keeps_body_and_headers(cache):
+    key = cache.key_for("productos", "page=1")
+    cache.set(key, _response(b'[{"nombre": "Pan"}]'))
+    cached = cache.get(key)
+    assert cached.body == b'[{"nombre": "Pan"}]'
+    assert cached.headers["x-total-count"] == "1"
+
+
+def test_invalidating_a_tenant_scope_leaves_other_tenants_cached(cache):
+    negocio_a, negocio_b = uuid.uuid4(), uuid.uuid4()
+    key_a = cache.key_for(products_scope(negocio_a))
+    key_b = cache.key_for(products_scope(negocio_b))
+    cache.set(key_a, _response(b"a"))
+    cache.set(key_b, _response(b"b"))
+
+    cache.invalidate([products_scope(negocio_a)])
+
+    assert cache.get(cache.key_for(products_scope(negocio_a))) is None
+    assert cache.get(cache.key_for(products_scope(negocio_b))).body == b"b"
+
+
+def test_response_built_before_invalidation_is_never_served(cache):
+    scope = product_scope(uuid.uuid4())
+    key = cache.key_for(scope)  # se lee la generación antes de consultar la base
+    cache.invalidate([scope])   # una escritura confirma mientras tanto
+    cache.set(key, _response(b"viejo"))
+    assert cache.get(cache.key_for(scope)) is None
+
+
+def test_stats_report_hit_ratio(cache):
+    key = cache.key_for(business_scope(uuid.uuid4()))
+    cache.get(key)
+    cache.set(key, _response(b"x"))
+    cache.get(key)
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_memory_backend_reports_stored_bytes():
+    cache = ResponseCache(MemoryBackend(max_entries=10, ttl_seconds=60), ttl_seconds=60)
+    cache.set(cache.key_for("negocios"), _response(b"0123456789"))
+    assert cache.stats()["memory_bytes"] > 10
+
+
+def test_disabled_cache_ignores_invalidations():
+    cache = ResponseCache(None, ttl_seconds=60)
+    assert not cache.enabled
+    cache.invalidate(["negocios"])
+    assert cache.stats() == {"name": "public_responses", "enabled": False}
+
+
+@pytest.mark.parametrize("write", [
+    lambda negocio_id: response_cache_module.invalidate_catalog(negocio_id, [uuid.uuid4()]),
+    lambda negocio_id: response_cache_module.invalidate_catalog(negocio_id, business_changed=True),
+])
+def test_any_write_to_the_business_or_its_products_invalidates_its_storefront(monkeypatch, write):
+    cache = ResponseCache(MemoryBackend(max_entries=100, ttl_seconds=60), ttl_seconds=60)
+    monkeypatch.setattr(response_cache_module, "response_cache", cache)
+    negocio, otro = uuid.uuid4(), uuid.uuid4()
+    cache.set(cache.key_for(storefront_scope(negocio)), _response(b"vitrina"))
+    cache.set(cache.key_for(storefront_scope(otro)), _response(b"otra"))
+
+    write(negocio)
+
+    assert cache.get(cache.key_for(storefront_scope(negocio))) is None
+    assert cache.get(cache.key_for(storefront_scope(otro))).body == b"otra"
@@ -0,0 +1,30 @@
+# debugging/tests/test_search.py
+#
+# SQL de la búsqueda de texto completo del marketplace (app/crud/search.py).
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_search.py
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.crud import search as crud_search
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_product_search_uses_spanish_unaccent_config_and_index_operator():
+    sql = _sql(crud_search._product_select(crud_search._ts_query("azucar")))
+    assert "websearch_to_tsquery" in sql
+    assert "productos.search_vector @@" in sql
+    assert "ts_rank(productos.search_vector" in sql
+
+
+def test_business_search_matches_on_business_vector():
+    sql = _sql(crud_search._business_select(crud_search._ts_query("panaderia")))
+    assert "negocios.search_vector @@" in sql
+
+
+def test_unknown_scope_is_rejected_before_querying():
+    with pytest.raises(ValueError):
+        crud_search.search_public(None, "pan", scope="usuarios")
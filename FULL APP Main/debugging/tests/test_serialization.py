@@ -0,0 +1,70 @@
+# debugging/tests/test_serialization.py
+#
+# Negociación JSON / MessagePack por Accept y serialización en bloque con TypeAdapter
+# (app/core/serialization.py).
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_serialization.py
+
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+from uuid import uuid4
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.core import serialization
+from app.core.serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, encode, negotiate, validate
+from app.schemas import SearchResult
+
+msgpack = pytest.importorskip("msgpack")
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON_MEDIA_TYPE),
+    ("", JSON_MEDIA_TYPE),
+    ("*/*", JSON_MEDIA_TYPE),
+    ("application/json", JSON_MEDIA_TYPE),
+    ("text/html", JSON_MEDIA_TYPE),
+    ("application/msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/msgpack, */*;q=0.5", MSGPACK_MEDIA_TYPE),
+    ("application/msgpack, */*", MSGPACK_MEDIA_TYPE),
+    ("application/json, application/msgpack", JSON_MEDIA_TYPE),
+    ("application/json;q=0.5, application/msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/msgpack;q=0, */*", JSON_MEDIA_TYPE),
+    ("application/msgpack;q=abc", JSON_MEDIA_TYPE),
+])
+def test_negotiate(accept, expected):
+    assert negotiate(accept) == expected
+
+
+def test_without_msgpack_only_json_is_offered(monkeypatch):
+    monkeypatch.setattr(serialization, "msgpack", None)
+    assert negotiate("application/msgpack") == JSON_MEDIA_TYPE
+
+
+def _rows(count):
+    return [
+        SimpleNamespace(tipo="producto", id=uuid4(), nombre=f"Pan {i}", negocio_id=uuid4(), precio=10.0 + i,
+                        rank=0.5, snippet="<mark>Pan</mark>")
+        for i in range(count)
+    ]
+
+
+def test_json_and_msgpack_carry_the_same_data():
+    adapter = TypeAdapter(List[SearchResult])
+    rows = _rows(3)
+    validated = validate(adapter, rows)
+
+    as_json = json.loads(encode(adapter, validated, JSON_MEDIA_TYPE))
+    as_msgpack = msgpack.unpackb(encode(adapter, validated, MSGPACK_MEDIA_TYPE), raw=False)
+    assert as_msgpack == as_json
+    assert as_json[0]["id"] == str(rows[0].id)
+    assert [item["nombre"] for item in as_json] == ["Pan 0", "Pan 1", "Pan 2"]
+
+
+def test_msgpack_uses_json_representation_for_datetimes():
+    adapter = TypeAdapter(datetime)
+    value = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert msgpack.unpackb(encode(adapter, value, MSGPACK_MEDIA_TYPE)) == json.loads(encode(adapter, value, JSON_MEDIA_TYPE))
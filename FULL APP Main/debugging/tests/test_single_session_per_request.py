@@ -0,0 +1,79 @@
+# debugging/tests/test_single_session_per_request.py
+#
+# Verifica que cada request use una única sesión de base de datos (una sola
+# conexión tomada del pool), aunque el endpoint y get_current_user dependan de get_db.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_single_session_per_request.py
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.main import app
+from app.database import engine, get_db, SessionLocal
+from app.auth import create_access_token, get_password_hash
+from app.models import Usuario, UserTier
+
+
+def _iter_dependencies(dependant):
+    for sub in dependant.dependencies:
+        yield sub
+        yield from _iter_dependencies(sub)
+
+
+def test_all_routes_share_the_same_session_provider():
+    """Ningún router debe declarar su propio get_db: todos usan app.database.get_db."""
+    for route in app.routes:
+        dependant = getattr(route, "dependant", None)
+        if dependant is None:
+            continue
+        for sub in _iter_dependencies(dependant):
+            if getattr(sub.call, "__name__", "") == "get_db":
+                assert sub.call is get_db, f"{route.path} usa un get_db distinto de app.database.get_db"
+
+
+@pytest.fixture
+def test_user():
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    except OperationalError:
+        db.close()
+        pytest.skip("Base de datos no disponible")
+    user = Usuario(
+        email=f"session-test-{uuid.uuid4().hex[:8]}@example.com",
+        nombre="Session Test",
+        hashed_password=get_password_hash("test1234"),
+        tipo_tier=UserTier.MICROEMPRENDIMIENTO,
+        plugins_activos=[]
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    try:
+        yield user
+    finally:
+        db.delete(user)
+        db.commit()
+        db.close()
+
+
+def test_authenticated_request_checks_out_one_connection(test_user):
+    token = create_access_token(data={"user_id": str(test_user.id), "email": test_user.email, "tipo_tier": test_user.tipo_tier.value})
+    checkouts = []
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(connection_record)
+
+    event.listen(engine, "checkout", on_checkout)
+    try:
+        with TestClient(app) as client:
+            checkouts.clear()  # Ignorar conexiones del evento de startup
+            response = client.get("/products/me", headers={"Authorization": f"Bearer {token}"})
+    finally:
+        event.remove(engine, "checkout", on_checkout)
+
+    assert response.status_code == 200
+    assert len(checkouts) == 1
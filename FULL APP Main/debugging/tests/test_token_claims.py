@@ -0,0 +1,58 @@
+# debugging/tests/test_token_claims.py
+#
+# Claims versionados del JWT: rol, negocio asignado, negocios propios y plugins viajan
+# en el token para autorizar sin consultar la base.
+# Ejecutar desde backend/:  pytest ../debugging/tests/test_token_claims.py
+
+import uuid
+
+from app.auth import CLAIMS_VERSION, build_user_claims, create_access_token, decode_access_token
+from app.crud.user import revokes_tokens
+from app.models import Usuario, UserTier, UserRole
+from app.routers.niam_router import verify_role
+
+
+def _user(**kwargs):
+    return Usuario(
+        id=uuid.uuid4(),
+        email="claims@example.com",
+        nombre="Claims",
+        hashed_password="x",
+        tipo_tier=UserTier.MICROEMPRENDIMIENTO,
+        plugins_activos=["niam"],
+        token_version=3,
+        **kwargs
+    )
+
+
+def test_claims_round_trip():
+    negocio_id = uuid.uuid4()
+    user = _user(rol=UserRole.MANAGER, negocio_asignado_id=negocio_id)
+    claims = decode_access_token(create_access_token(build_user_claims(user, [negocio_id])))
+
+    assert claims.cv == CLAIMS_VERSION
+    assert claims.user_uuid == user.id
+    assert claims.tv == 3
+    assert claims.rol == "manager"
+    assert claims.negocio_asignado_id == str(negocio_id)
+    assert claims.negocios == [str(negocio_id)]
+    assert claims.plugins_activos == ["niam"]
+
+
+def test_verify_role_uses_claims_only():
+    claims = decode_access_token(create_access_token(build_user_claims(_user(rol=UserRole.COCINERO), [])))
+    assert verify_role(claims, [UserRole.COCINERO, UserRole.MANAGER])
+    assert not verify_role(claims, [UserRole.MANAGER, UserRole.ADMIN])
+
+    sin_rol = decode_access_token(create_access_token(build_user_claims(_user(), [])))
+    assert not verify_role(sin_rol, [UserRole.MANAGER])
+
+
+def test_only_claim_fields_revoke_the_token():
+    user = _user()
+    assert revokes_tokens(user, {"plugins_activos": []})
+    assert revokes_tokens(user, {"tipo_tier": UserTier.FREELANCER})
+    # Agregar un plugin no revoca: el token vigente sigue sirviendo sin el permiso nuevo
+    assert not revokes_tokens(user, {"plugins_activos": ["niam", "panaderia"]})
+    assert not revokes_tokens(user, {"plugins_activos": ["niam"], "nombre": "Otro"})
+    assert not revokes_tokens(user, {"localizacion": "Córdoba"})
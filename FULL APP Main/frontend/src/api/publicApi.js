@@ -44,11 +44,31 @@ export const getPublicBusinessById = async (businessId) => {
 };
 
 /**
- * Fetches all publicly available products or services.
- * @returns {Promise<Array<Object>>} A list of all public products/services.
+ * Fetches everything a business landing page needs in a single request.
+ * @param {string} businessId - The UUID of the business.
+ * @returns {Promise<Object>} { negocio, productos (with estado_stock), publicidades, resumen }.
+ */
+export const getPublicStorefront = async (businessId) => {
+  const response = await fetch(`${API_BASE_URL}/public/businesses/${businessId}/storefront`, {
+    method: 'GET',
+    headers: {
+      'Accept': 'application/json',
+    },
+  });
+  return handleResponse(response);
+};
+
+/**
+ * Fetches one page of publicly available products or services.
+ * @param {Object} [params] - Optional filters: page, page_size, negocio_id, tipo_producto,
+ *   categoria, precio_min, precio_max, sort.
+ * @returns {Promise<Array<Object>>} A page of public products/services.
  */
-export const getPublicProducts = async () => {
-  const response = await fetch(`${API_BASE_URL}/public/products`, {
+export const getPublicProducts = async (params = {}) => {
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+  ).toString();
+  const response = await fetch(`${API_BASE_URL}/public/products${query ? `?${query}` : ''}`, {
     method: 'GET',
     headers: {
       'Accept': 'application/json',
@@ -87,12 +107,31 @@ export const getPublicUser = async (userId) => {
   return handleResponse(response);
 };
 
+/**
+ * Full-text search over public products and businesses (accent-insensitive, ranked).
+ * @param {string} q - Text to search for (at least 2 characters).
+ * @param {Object} [params] - Optional: tipo ('todos' | 'productos' | 'negocios'), page, page_size.
+ * @returns {Promise<Array<Object>>} Results with tipo, id, nombre, negocio_id, precio, rank and snippet.
+ */
+export const searchPublic = async (q, params = {}) => {
+  const query = new URLSearchParams({ q, ...params }).toString();
+  const response = await fetch(`${API_BASE_URL}/public/search?${query}`, {
+    method: 'GET',
+    headers: {
+      'Accept': 'application/json',
+    },
+  });
+  return handleResponse(response);
+};
+
 // Exportar todas las funciones como un objeto por defecto para compatibilidad
 const publicApi = {
   getPublicBusinesses,
   getPublicBusinessById,
+  getPublicStorefront,
   getPublicProducts,
   getPublicProductById,
+  searchPublic,
   getPublicUser,
 };
 
@@ -1,11 +1,19 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { getPublicBusinessById, getPublicProducts } from '../api/publicApi';
+import { getPublicStorefront } from '../api/publicApi';
+
+const STOCK_LABELS = {
+  disponible: 'Disponible',
+  stock_bajo: 'Últimas unidades',
+  agotado: 'Agotado',
+};
 
 const BusinessLandingScreen = () => {
   const { businessId } = useParams();
   const [business, setBusiness] = useState(null);
   const [products, setProducts] = useState([]);
+  const [publicidades, setPublicidades] = useState([]);
+  const [resumen, setResumen] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState(null);
   const navigate = useNavigate();
@@ -16,19 +24,19 @@ const BusinessLandingScreen = () => {
         setIsLoading(true);
         setError(null);
 
-        const businessData = await getPublicBusinessById(businessId);
-        const allProducts = await getPublicProducts();
-        const productsData = allProducts.filter(
-          (product) => String(product.negocio_id) === String(businessId)
-        );
+        const storefront = await getPublicStorefront(businessId);
 
-        setBusiness(businessData);
-        setProducts(productsData);
+        setBusiness(storefront.negocio);
+        setProducts(storefront.productos);
+        setPublicidades(storefront.publicidades);
+        setResumen(storefront.resumen);
       } catch (err) {
         console.error('Error al cargar datos del negocio:', err);
         setError('No se pudieron cargar los datos del negocio. Inténtalo de nuevo más tarde.');
         setBusiness(null);
         setProducts([]);
+        setPublicidades([]);
+        setResumen(null);
       } finally {
         setIsLoading(false);
       }
@@ -103,7 +111,7 @@ const BusinessLandingScreen = () => {
           <div className="flex flex-col lg:flex-row gap-8">
             <div className="lg:w-1/3">
               <img
-                src={business.fotos_urls[0]}
+                src={business.fotos_urls?.[0]}
                 alt={business.nombre}
                 className="w-full h-64 object-cover rounded-lg"
                 onError={(e) => {
@@ -115,9 +123,15 @@ const BusinessLandingScreen = () => {
               <div className="flex items-center gap-4 mb-4">
                 <h1 className="text-4xl font-bold text-gray-900">{business.nombre}</h1>
                 <span className="bg-yellow-400 text-yellow-900 px-3 py-1 rounded-full text-sm font-semibold">
-                  ⭐ {business.rating}
+                  ⭐ {business.rating ?? resumen?.rating_promedio ?? '-'}
                 </span>
               </div>
+              {resumen && (
+                <p className="text-sm text-gray-500 mb-4">
+                  {resumen.productos_disponibles} de {resumen.total_productos} productos disponibles
+                  {resumen.total_reviews > 0 && ` · ${resumen.total_reviews} reseñas`}
+                </p>
+              )}
               <p className="text-gray-600 text-lg mb-4">{business.descripcion}</p>
               <div className="grid grid-cols-1 md:grid-cols-2 gap-4 text-sm text-gray-600">
                 <div>
@@ -137,6 +151,18 @@ const BusinessLandingScreen = () => {
           </div>
         </div>
 
+        {/* Publicidades vigentes */}
+        {publicidades.length > 0 && (
+          <div className="mb-8 space-y-4">
+            {publicidades.map(publicidad => (
+              <div key={publicidad.id} className="bg-blue-600 text-white rounded-xl shadow-sm p-6">
+                <h2 className="text-2xl font-bold">{publicidad.nombre}</h2>
+                {publicidad.descripcion && <p className="mt-2 text-blue-100">{publicidad.descripcion}</p>}
+              </div>
+            ))}
+          </div>
+        )}
+
         {/* Catálogo de productos */}
         <div className="bg-white rounded-xl shadow-sm p-8">
           <h2 className="text-3xl font-bold text-gray-900 mb-6">Catálogo de Productos</h2>
@@ -155,17 +181,17 @@ const BusinessLandingScreen = () => {
                   <p className="text-gray-600 mb-4">{product.descripcion}</p>
                   <div className="flex justify-between items-center">
                     <span className="text-2xl font-bold text-blue-600">
-                      ${product.precio_venta.toFixed(2)}
+                      ${(product.precio_venta ?? product.precio).toFixed(2)}
                     </span>
                     <span className="text-sm text-gray-500">
-                      {product.stock_terminado > 0 ? `${product.stock_terminado} disponibles` : 'Agotado'}
+                      {STOCK_LABELS[product.estado_stock]}
                     </span>
                   </div>
                   <button 
                     className="w-full mt-4 bg-blue-600 text-white py-2 px-4 rounded-lg hover:bg-blue-700 transition-colors disabled:bg-gray-400 disabled:cursor-not-allowed"
-                    disabled={product.stock_terminado <= 0}
+                    disabled={product.estado_stock === 'agotado'}
                   >
-                    {product.stock_terminado > 0 ? 'Agregar al Carrito' : 'Agotado'}
+                    {product.estado_stock === 'agotado' ? 'Agotado' : 'Agregar al Carrito'}
                   </button>
                 </div>
               ))}
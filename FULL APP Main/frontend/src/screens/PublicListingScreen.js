@@ -3,7 +3,17 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
-import { getPublicBusinesses, getPublicProducts } from '../api/publicApi';
+import { getPublicBusinesses, getPublicProducts, searchPublic } from '../api/publicApi';
+
+const MIN_SEARCH_LENGTH = 2;
+const SEARCH_DEBOUNCE_MS = 300;
+
+// Convierte el snippet de /public/search ("...<mark>pan</mark>...") en elementos React,
+// sin interpretar el resto como HTML.
+const renderSnippet = (snippet) =>
+  snippet.split(/(<mark>.*?<\/mark>)/g).map((part, index) =>
+    part.startsWith('<mark>') ? <mark key={index}>{part.slice(6, -7)}</mark> : part
+  );
 
 const PublicListingScreen = () => {
   const [businesses, setBusinesses] = useState([]);
@@ -12,6 +22,7 @@ const PublicListingScreen = () => {
   const [error, setError] = useState(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedCategory, setSelectedCategory] = useState('all');
+  const [searchResults, setSearchResults] = useState(null);
   const { isAuthenticated } = useAuth();
   const navigate = useNavigate();
 
@@ -36,6 +47,33 @@ const PublicListingScreen = () => {
     loadData();
   }, []);
 
+  // La búsqueda la resuelve el backend (texto completo); aquí solo se espera a que el usuario deje de escribir
+  useEffect(() => {
+    const term = searchTerm.trim();
+    if (term.length < MIN_SEARCH_LENGTH) {
+      setSearchResults(null);
+      return undefined;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const results = await searchPublic(term, { tipo: 'productos' });
+        if (!cancelled) {
+          setSearchResults(results);
+        }
+      } catch (err) {
+        console.error('Error en la búsqueda:', err);
+        if (!cancelled) {
+          setSearchResults([]);
+        }
+      }
+    }, SEARCH_DEBOUNCE_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm]);
+
   if (isLoading) {
     return (
       <div className="min-h-screen bg-gray-50 flex justify-center items-center">
@@ -58,11 +96,15 @@ const PublicListingScreen = () => {
   }
 
   // Filtrado de productos
-  const filteredProducts = products.filter(p => {
-    const matchesSearch = searchTerm === '' || p.nombre.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesCategory = selectedCategory === 'all' || p.categoria === selectedCategory;
-    return matchesSearch && matchesCategory;
-  });
+  const filteredProducts = searchResults
+    ? searchResults.map((result) => ({
+        id: result.id,
+        nombre: result.nombre,
+        descripcion: renderSnippet(result.snippet),
+        precio_venta: result.precio,
+        negocio_id: result.negocio_id,
+      }))
+    : products.filter(p => selectedCategory === 'all' || p.categoria === selectedCategory);
 
   return (
     <div className="min-h-screen flex flex-col bg-gray-50">